@@ -3,6 +3,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import current_user, LoginManager
 from config import config, DevelopmentConfig
+from application.scheduling_log import init_logging
 import sys
 import os 
 
@@ -28,12 +29,20 @@ def create_app(config_name='default'):
         template_folder=template_folder,
     )
     app.config.from_object(config.get(config_name, DevelopmentConfig))
+    
+    # Scheduler and data processor logs go through a background writer thread
+    init_logging()
 
     db.init_app(app)
     bcrypt.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = '/'
 
+    from application.result_cache import init_result_cache
+    init_result_cache(app)
+    from application.data_snapshot import init_data_snapshot
+    init_data_snapshot(app)
+
     with app.app_context():
         from .models import User, Branch, Level, Coach, Enrollment, PopularTimeslot, CoachBranch, CoachOffday, CoachPreference, Timetable, TimetableEntry
         db.create_all()
@@ -0,0 +1,47 @@
+class Assignment:
+    """
+    One feasible (coach, branch, level, timeslot) candidate for the scheduler
+
+    The candidate pool holds one of these per coach x timeslot x requirement, so it is by far
+    the largest object in a generate request. Slots keep each record to a fixed handful of
+    references: branch, level, day and time strings point at the single object shared by every
+    candidate of that requirement or timeslot, and the coach's name and status are looked up
+    through coach_id instead of being stored.
+
+    Fields are attributes, and can also be read by key like the dicts this replaces
+    (assignment['day'], assignment.get('is_popular')); a key that is not a field raises KeyError.
+    """
+    __slots__ = ('id', 'coach_id', 'branch', 'level', 'day', 'start_time', 'end_time',
+                 'start_minute', 'end_minute', 'duration', 'period', 'is_popular', 'capacity')
+
+    def __init__(self, id, coach_id, branch, level, day, start_time, end_time,
+                 start_minute, end_minute, duration, period, is_popular, capacity):
+        self.id = id
+        self.coach_id = coach_id
+        self.branch = branch
+        self.level = level
+        self.day = day
+        self.start_time = start_time
+        self.end_time = end_time
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.duration = duration
+        self.period = period
+        self.is_popular = is_popular
+        self.capacity = capacity
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self):
+        """All fields as a new dict, e.g. to start a mutable scheduled-class record"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return (f"Assignment(id={self.id}, coach_id={self.coach_id}, branch={self.branch!r}, level={self.level!r}, "
+                f"day={self.day!r}, start_time={self.start_time!r})")
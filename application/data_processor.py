@@ -1,45 +1,105 @@
+import hashlib
+import logging
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from itertools import accumulate
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from collections import defaultdict
 from typing import Dict, List, Tuple, Set, Optional
+from sqlalchemy import event
 from application import db
 from application.models import DayOfWeek, User, Coach, Level, Branch, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot
+from application.scheduling_log import RunLogger
+from application.assignment import Assignment
+
+logger = logging.getLogger(__name__)
+
+# Operating days by kind; the scheduler applies the weekend limits to WEEKENDS
+WEEKDAYS = ['TUE', 'WED', 'THU', 'FRI']
+WEEKENDS = ['SAT', 'SUN']
+
+
+@contextmanager
+def count_queries(engine):
+    """Count the SQL statements an engine executes inside the block; yields a one-item list holding the count"""
+    count = [0]
+
+    def increment(*args):
+        count[0] += 1
+
+    event.listen(engine, 'before_cursor_execute', increment)
+    try:
+        yield count
+    finally:
+        event.remove(engine, 'before_cursor_execute', increment)
+
 
 class DataDrivenProcessor:
     """
     Completely data-driven processor - reads ALL business rules from database
     """
     
-    def __init__(self):
-        print(f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        current_user = User.query.first()
-        print(f"Current User's Login: {current_user.username if current_user else 'unknown'}")
-        print("DATA-DRIVEN PROCESSOR - DB DRIVEN")
-        print("=" * 70)
+    def __init__(self, log_level=None, include_raw_data=False):
+        self.log = RunLogger(logger, log_level)
+        # Keep each coach's and requirement's source row as 'raw_data' (only needed for debugging)
+        self.include_raw_data = include_raw_data
+        
+        # Skip the user lookup entirely unless it is going to be logged
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            current_user = User.query.first()
+            self.log.debug("Current User's Login: %s", current_user.username if current_user else 'unknown')
+        self.log.debug("DATA-DRIVEN PROCESSOR - DB DRIVEN")
         
     def load_and_process_data(self):
         """Main data loading - everything from database"""
-        print("Loading ALL data from database...")
+        self.log.debug("Loading ALL data from database...")
+        
+        # Wall time and work counts of the expensive steps, returned as data['profile']
+        self.profile = {}
         
         # Load ALL database models
-        self._load_all_from_db()
+        start = time.perf_counter()
+        with count_queries(db.engine) as queries:
+            self._load_all_from_db()
+        self.profile['load_all_from_db'] = {
+            'seconds': round(time.perf_counter() - start, 4),
+            'queries': queries[0],
+            'rows_loaded': len(self.enrollment_df) + len(self.coaches_df) + len(self.availability_df) +
+                           len(self.popular_df) + len(self.branch_config_df)
+        }
+        self.source_digest = self._source_digest()
         
         # Extract business rules from actual data
         self._extract_business_rules_from_data()
         
         # Process all components
+        start = time.perf_counter()
         self.coaches_data = self._process_coaches_from_data()
+        self.profile['process_coaches'] = {
+            'seconds': round(time.perf_counter() - start, 4),
+            'coaches': len(self.coaches_data)
+        }
         self.requirements_data = self._process_requirements_from_data()
         self.popular_timeslots_set = self._process_popular_timeslots_from_data()
+        self.popular_intervals = self._compile_popular_intervals()
+        
+        start = time.perf_counter()
         self.timeslots_data = self._generate_timeslots_from_operating_hours()
+        self.profile['generate_timeslots'].update(seconds=round(time.perf_counter() - start, 4))
+        
+        start = time.perf_counter()
         self.feasible_assignments = self._generate_feasible_assignments_from_data()
+        self.profile['generate_feasible_assignments'].update(seconds=round(time.perf_counter() - start, 4))
         
-        print(f"✓ Processed {len(self.coaches_data)} coaches from data")
-        print(f"✓ Processed {len(self.requirements_data)} requirements from data")
-        print(f"✓ Loaded {len(self.popular_timeslots_set)} popular timeslot definitions from data")
-        print(f"✓ Generated {len(self.timeslots_data)} valid timeslots from operating hours")
-        print(f"✓ Created {len(self.feasible_assignments)} feasible assignments")
+        self.log.info("✓ Processed %s coaches from data", len(self.coaches_data))
+        self.log.info("✓ Processed %s requirements from data", len(self.requirements_data))
+        self.log.info("✓ Loaded %s popular timeslot definitions from data", len(self.popular_timeslots_set))
+        self.log.info("✓ Generated %s valid timeslots from operating hours", len(self.timeslots_data))
+        self.log.info("✓ Created %s feasible assignments", len(self.feasible_assignments))
         
         return self._package_comprehensive_data()
     
@@ -53,25 +113,31 @@ class DataDrivenProcessor:
             'Level Category Base': enrollment.level_category_base,
             'Count': enrollment.count
         } for enrollment in enrollments])
-        print(f"  ✓ Loaded enrollments from DB: {len(self.enrollment_df)} records")
+        self.log.debug("  ✓ Loaded enrollments from DB: %s records", len(self.enrollment_df))
+        
+        # Levels and branches are loaded once and reused by the later steps
+        self.levels = Level.query.order_by(Level.id).all()
+        self.branches = Branch.query.all()
+        level_names = {level.id: level.name for level in self.levels}
+        branch_abbrvs = {branch.id: branch.abbrv for branch in self.branches}
+        
+        # Branch assignments and level preferences of every coach, one query each instead of one per coach
+        assigned_branches = defaultdict(list)
+        for coach_id, branch_id in (db.session.query(CoachBranch.coach_id, CoachBranch.branch_id)
+                                    .order_by(CoachBranch.coach_id, CoachBranch.branch_id)):
+            if branch_id in branch_abbrvs:
+                assigned_branches[coach_id].append(branch_abbrvs[branch_id])
+        
+        preferred_levels = defaultdict(set)
+        for coach_id, level_id in db.session.query(CoachPreference.coach_id, CoachPreference.level_id):
+            if level_id in level_names:
+                preferred_levels[coach_id].add(level_names[level_id])
         
         # Coaches data - now with qualification columns directly
-        coaches = Coach.query.all()
+        coaches = db.session.query(Coach.id, Coach.name, Coach.residential_area, Coach.position, Coach.status).all()
         coach_records = []
-
-        levels = db.session.query(Level.name).order_by(Level.id).all()
         
         for coach in coaches:
-            # Get branch assignments as a string
-            assigned_branches = [cb.branch.abbrv for cb in coach.assigned_branches]
-            assigned_branch_str = ",".join(assigned_branches)
-
-            preference = {level: False for (level,) in levels}
-
-            level_preference = db.session.query(CoachPreference).filter(CoachPreference.coach_id == coach.id).all()
-            for cl in level_preference:
-                preference[cl.level.name] = True
-            
             # Create record with all qualification columns directly from the model
             record = {
                 'coach_id': coach.id,
@@ -79,40 +145,42 @@ class DataDrivenProcessor:
                 'residential_area': coach.residential_area,
                 'position': coach.position,
                 'status': coach.status,
-                'assigned_branch': assigned_branch_str
+                'assigned_branch': ",".join(assigned_branches[coach.id])
             }
-
-            coach_records.append(record | preference)
+            preferences = preferred_levels[coach.id]
+            
+            coach_records.append(record | {name: name in preferences for name in level_names.values()})
         
         self.coaches_df = pd.DataFrame(coach_records)
-        print(f"  ✓ Loaded coaches from DB: {len(self.coaches_df)} records")
+        self.log.debug("  ✓ Loaded coaches from DB: %s records", len(self.coaches_df))
         
         # Availability data
-        offdays = CoachOffday.query.all()
+        offdays = db.session.query(CoachOffday.coach_id, CoachOffday.day, CoachOffday.am, CoachOffday.reason)
 
-        offday_dict = {}
-        for offday in offdays:
-            day = DayOfWeek(offday.day).name
-            period = 'am' if offday.am else 'pm'
-            offday_dict[(offday.coach_id, day, period)] = offday
-        
-        availability_data = []
-        for coach in coaches:
-            for day in DayOfWeek:
-                for period in ['am', 'pm']:
-                    key = (coach.id, day.name, period)
-                    available = key not in offday_dict
-                    availability_data.append({
-                        'coach_id': coach.id,
-                        'day': day.name,
-                        'period': period,
-                        'available': available,
-                        'restriction_reason': None if available else offday_dict[key].reason
-                    })
-        
-        self.availability_df = pd.DataFrame(availability_data)
+        # One row per coach, day and period (in that order); offdays are marked at their flat row position
+        days = [day.name for day in DayOfWeek]
+        coach_row = {coach.id: i for i, coach in enumerate(coaches)}
+        available = np.ones(len(coaches) * len(days) * 2, dtype=bool)
+        restriction_reasons = np.full(len(available), None, dtype=object)
+        for coach_id, day, am, reason in offdays:
+            if not isinstance(day, int) or not 0 <= day < len(days):
+                # An out-of-range day would mark another coach's row
+                self.log.warning("  Skipping offday of coach %s with invalid day %r", coach_id, day)
+                continue
+            if coach_id in coach_row:
+                row = (coach_row[coach_id] * len(days) + day) * 2 + (0 if am else 1)
+                available[row] = False
+                restriction_reasons[row] = reason
+        
+        self.availability_df = pd.DataFrame({
+            'coach_id': np.repeat([coach.id for coach in coaches], len(days) * 2),
+            'day': np.tile(np.repeat(days, 2), len(coaches)),
+            'period': np.tile(['am', 'pm'], len(coaches) * len(days)),
+            'available': available,
+            'restriction_reason': restriction_reasons
+        })
 
-        print(f"  ✓ Loaded availability from DB: {len(self.availability_df)} records")
+        self.log.debug("  ✓ Loaded availability from DB: %s records", len(self.availability_df))
         
         # Popular timeslots data
         popular_slots = PopularTimeslot.query.all()
@@ -121,32 +189,41 @@ class DataDrivenProcessor:
             'day': slot.day,
             'level': slot.level
         } for slot in popular_slots])
-        print(f"  ✓ Loaded popular timeslots from DB: {len(self.popular_df)} records")
+        self.log.debug("  ✓ Loaded popular timeslots from DB: %s records", len(self.popular_df))
         
         # Branch config data
-        branches = Branch.query.all()
-        if branches:
+        if self.branches:
             self.branch_config_df = pd.DataFrame([{
                 'branch': branch.abbrv,
                 'max_classes_per_slot': branch.max_classes
-            } for branch in branches])
-            print(f"  ✓ Loaded branch configs from DB: {len(self.branch_config_df)} records")
+            } for branch in self.branches])
+            self.log.debug("  ✓ Loaded branch configs from DB: %s records", len(self.branch_config_df))
         else:
             # Create from description if no data
             self.branch_config_df = pd.DataFrame({
                 'branch': ['BB', 'CCK', 'CH', 'HG', 'KT', 'PR'],
                 'max_classes_per_slot': [4, 4, 5, 4, 4, 6]
             })
-            print(f"  ℹ Created branch_config from business rules: {len(self.branch_config_df)} records")
+            self.log.debug("  ℹ Created branch_config from business rules: %s records", len(self.branch_config_df))
+    
+    def _source_digest(self):
+        """Hash of the loaded source rows; everything else in the package is derived from them"""
+        digest = hashlib.sha256()
+        for frame in (self.enrollment_df, self.coaches_df, self.availability_df, self.popular_df, self.branch_config_df):
+            digest.update(repr(list(frame.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+        digest.update(repr([(level.id, level.name, level.alias, level.max_students, level.duration)
+                            for level in self.levels]).encode())
+        return digest.hexdigest()
     
     def _extract_business_rules_from_data(self):
         """Extract ALL business rules from the actual data"""
-        print("  Extracting business rules from database data...")
+        self.log.debug("  Extracting business rules from database data...")
         
         # Extract levels from enrollment data or Level model
         self.all_levels = sorted(self.enrollment_df['Level Category Base'].unique()) if not self.enrollment_df.empty else []
         if not self.all_levels:
-            self.all_levels = sorted([level.name for level in Level.query.all()])
+            self.all_levels = sorted([level.name for level in self.levels])
             
         # Map DB level names to expected format
         level_mapping = {
@@ -158,13 +235,13 @@ class DataDrivenProcessor:
         }
         
         self.all_levels = [level_mapping.get(level, level) for level in self.all_levels]
-        print(f"    Levels found in data: {self.all_levels}")
+        self.log.debug("    Levels found in data: %s", self.all_levels)
         
         # Extract branches from enrollment data or Branch model
         self.all_branches = sorted(self.enrollment_df['Branch'].unique()) if not self.enrollment_df.empty else []
         if not self.all_branches:
-            self.all_branches = sorted([branch.abbrv for branch in Branch.query.all()])
-        print(f"    Branches found in data: {self.all_branches}")
+            self.all_branches = sorted([branch.abbrv for branch in self.branches])
+        self.log.debug("    Branches found in data: %s", self.all_branches)
         
         # Extract days from availability data or use standard days
         available_days = sorted(self.availability_df['day'].unique()) if not self.availability_df.empty else []
@@ -173,12 +250,12 @@ class DataDrivenProcessor:
         
         # Filter to operating days (exclude MON based on business rule)
         self.all_days = [day for day in available_days if day != 'MON']
-        print(f"    Operating days found in data: {self.all_days}")
+        self.log.debug("    Operating days found in data: %s", self.all_days)
         
         # Categorize days
-        self.weekdays = [day for day in self.all_days if day in ['TUE', 'WED', 'THU', 'FRI']]
-        self.weekends = [day for day in self.all_days if day in ['SAT', 'SUN']]
-        print(f"    Weekdays: {self.weekdays}, Weekends: {self.weekends}")
+        self.weekdays = [day for day in self.all_days if day in WEEKDAYS]
+        self.weekends = [day for day in self.all_days if day in WEEKENDS]
+        self.log.debug("    Weekdays: %s, Weekends: %s", self.weekdays, self.weekends)
         
         # Extract coach statuses from coaches data
         coach_statuses = set()
@@ -189,11 +266,11 @@ class DataDrivenProcessor:
                 coach_statuses.update(self.coaches_df['position'].dropna().unique())
         
         self.coach_statuses = list(coach_statuses) if coach_statuses else ['Full Time', 'Part Time', 'Branch Manager']
-        print(f"    Coach statuses found: {self.coach_statuses}")
+        self.log.debug("    Coach statuses found: %s", self.coach_statuses)
         
         # Extract level qualification columns
-        self.qualification_columns = db.session.query(Level.name).order_by(Level.id).all()
-        print(f"    Qualification columns defined: {self.qualification_columns}")
+        self.qualification_columns = [level.name for level in self.levels]
+        self.log.debug("    Qualification columns defined: %s", self.qualification_columns)
         
         # Set business constants from description and data
         self._derive_business_constants()
@@ -203,7 +280,7 @@ class DataDrivenProcessor:
         
         # Class capacities from database or business rules
         self.class_capacities = {}
-        levels = Level.query.all()
+        levels = self.levels
         for level_obj in levels:
             level_name = level_obj.name
             # Map level names from DB to expected format if needed
@@ -291,97 +368,108 @@ class DataDrivenProcessor:
         # Level hierarchy from business rules
         self.level_hierarchy = ['Tots', 'Jolly', 'Bubbly', 'Lively', 'Flexi', 'L1', 'L2', 'L3', 'L4', 'Advance', 'Free']
         
-        print(f"    Class capacities derived: {self.class_capacities}")
-        print(f"    Class durations derived: {self.class_durations}")
-        print(f"    Branch limits from DB: {self.branch_limits}")
-        print(f"    Operating hours defined: {list(self.operating_hours.keys())}")
+        self.log.debug("    Class capacities derived: %s", self.class_capacities)
+        self.log.debug("    Class durations derived: %s", self.class_durations)
+        self.log.debug("    Branch limits from DB: %s", self.branch_limits)
+        self.log.debug("    Operating hours defined: %s", list(self.operating_hours.keys()))
     
     def _process_coaches_from_data(self):
-        """Process coaches completely from database data"""
+        """
+        Process coaches completely from database data
+        
+        Availability and qualifications are computed for all coaches at once and kept as arrays whose
+        rows follow self.coach_ids:
+        
+            self.coach_availability     coach x day x period booleans (days as self.all_days, periods am, pm)
+            self.coach_qualifications   coach x level booleans (levels as self.qualification_levels)
+        
+        The per-coach records the scheduler reads are then taken from those rows.
+        """
         coaches = {}
+        df = self.coaches_df
         
-        # Build availability lookup from availability_df
-        availability_lookup = defaultdict(lambda: defaultdict(bool))
-        for _, row in self.availability_df.iterrows():
-            coach_id = int(row['coach_id'])
-            day = str(row['day']).upper()
-            period = str(row['period']).lower()
-            available = bool(row['available'])
-            availability_lookup[coach_id][f"{day}_{period}"] = available
-        
-        # Process each coach from coaches_df
-        for _, coach_row in self.coaches_df.iterrows():
-            coach_id = int(coach_row['coach_id'])
-            
-            # Basic information from data
-            name = str(coach_row.get('coach_name', f'Coach {coach_id}'))
-            status = str(coach_row.get('status', 'Part Time')).strip()
-            position = str(coach_row.get('position', '')).strip()
-            residential_area = str(coach_row.get('residential_area', ''))
-            
-            # Determine final status from data
-            if 'Manager' in position:
-                final_status = 'Branch Manager'
-            elif 'Full time' in status:
-                final_status = 'Full Time'
-            elif 'Part time' in status:
-                final_status = 'Part Time'
-            else:
-                final_status = 'Part Time'  # Default
-            
-            # Extract qualifications from direct qualification columns
-            qualifications = []
-            qualification_mapping = {
-                'BearyTots': 'Tots',
-                'Jolly': 'Jolly',
-                'Bubbly': 'Bubbly', 
-                'Lively': 'Lively',
-                'Flexi': 'Flexi',
-                'Level_1': 'L1',
-                'Level_2': 'L2',
-                'Level_3': 'L3',
-                'Level_4': 'L4',
-                'Advance': 'Advance',
-                'Free': 'Free'
-            }
-            
-            for col, level in qualification_mapping.items():
-                if col in coach_row and coach_row[col]:
-                    qualifications.append(level)
-            
-            # Auto-add Free if has Advance (business rule)
-            if 'Advance' in qualifications and 'Free' not in qualifications:
-                qualifications.append('Free')
-            
-            # Extract branch assignments from data
-            branches = []
-            if 'assigned_branch' in coach_row and pd.notna(coach_row['assigned_branch']):
-                branch_str = str(coach_row['assigned_branch'])
-                for branch in branch_str.replace(',', ' ').split():
-                    branch = branch.strip().upper()
-                    if branch in self.all_branches:
-                        branches.append(branch)
-            
-            # Build availability dictionary from data
-            availability = {}
-            for day in self.all_days:
-                availability[day] = {
-                    'am': availability_lookup[coach_id].get(f"{day}_am", False),
-                    'pm': availability_lookup[coach_id].get(f"{day}_pm", False)
-                }
-            
+        qualification_mapping = {
+            'BearyTots': 'Tots',
+            'Jolly': 'Jolly',
+            'Bubbly': 'Bubbly', 
+            'Lively': 'Lively',
+            'Flexi': 'Flexi',
+            'Level_1': 'L1',
+            'Level_2': 'L2',
+            'Level_3': 'L3',
+            'Level_4': 'L4',
+            'Advance': 'Advance',
+            'Free': 'Free'
+        }
+        self.qualification_levels = list(qualification_mapping.values())
+        
+        if df.empty:
+            self.coach_ids = np.empty(0, dtype=np.int64)
+            self.coach_availability = np.zeros((0, len(self.all_days), 2), dtype=bool)
+            self.coach_qualifications = np.zeros((0, len(self.qualification_levels)), dtype=bool)
+            return coaches
+        
+        self.coach_ids = df['coach_id'].to_numpy(dtype=np.int64)
+        
+        def text(column, default):
+            return df[column].astype(str) if column in df.columns else pd.Series(default, index=df.index)
+        
+        # Basic information from data
+        names = df['coach_name'].astype(str) if 'coach_name' in df.columns else 'Coach ' + df['coach_id'].astype(str)
+        statuses = text('status', 'Part Time').str.strip()
+        positions = text('position', '').str.strip()
+        residential_areas = text('residential_area', '')
+        
+        # Determine final status from data
+        final_statuses = np.select(
+            [positions.str.contains('Manager', regex=False), statuses.str.contains('Full time', regex=False)],
+            ['Branch Manager', 'Full Time'],
+            default='Part Time'
+        )
+        
+        # Qualifications from the direct qualification columns; Free comes with Advance (business rule)
+        self.coach_qualifications = df.reindex(columns=list(qualification_mapping), fill_value=False).to_numpy(dtype=bool)
+        self.coach_qualifications[:, self.qualification_levels.index('Free')] |= \
+            self.coach_qualifications[:, self.qualification_levels.index('Advance')]
+        
+        # Availability from availability_df; slots without a row are unavailable
+        self.coach_availability = np.zeros((len(df), len(self.all_days), 2), dtype=bool)
+        availability = self.availability_df
+        if not availability.empty:
+            coach_index = pd.Index(self.coach_ids).get_indexer(availability['coach_id'].astype(np.int64))
+            day_index = pd.Index(self.all_days).get_indexer(availability['day'].astype(str).str.upper())
+            period_index = pd.Index(['am', 'pm']).get_indexer(availability['period'].astype(str).str.lower())
+            known = (coach_index >= 0) & (day_index >= 0) & (period_index >= 0)
+            self.coach_availability[coach_index[known], day_index[known], period_index[known]] = \
+                availability['available'].to_numpy(dtype=bool)[known]
+        
+        # Branch assignments from data
+        known_branches = set(self.all_branches)
+        if 'assigned_branch' in df.columns:
+            branch_lists = df['assigned_branch'].str.replace(',', ' ').str.upper().str.split()
+        else:
+            branch_lists = pd.Series(np.nan, index=df.index)
+        
+        raw_records = df.to_dict('records') if self.include_raw_data else None
+        
+        rows = zip(self.coach_ids.tolist(), names.tolist(), final_statuses.tolist(), positions.tolist(),
+                   residential_areas.tolist(), self.coach_qualifications.tolist(), branch_lists.tolist(),
+                   self.coach_availability.tolist())
+        for i, (coach_id, name, final_status, position, residential_area, qualified, branch_list, slots) in enumerate(rows):
             coaches[coach_id] = {
                 'id': coach_id,
                 'name': name,
                 'status': final_status,
                 'position': position,
                 'residential_area': residential_area,
-                'qualifications': qualifications,
-                'branches': branches,
-                'availability': availability,
-                'workload_limits': self.workload_limits[final_status].copy(),
-                'raw_data': dict(coach_row)
+                'qualifications': [level for level, q in zip(self.qualification_levels, qualified) if q],
+                'branches': ([branch for branch in branch_list if branch in known_branches]
+                             if isinstance(branch_list, list) else []),
+                'availability': {day: {'am': am, 'pm': pm} for day, (am, pm) in zip(self.all_days, slots)},
+                'workload_limits': self.workload_limits[final_status].copy()
             }
+            if raw_records is not None:
+                coaches[coach_id]['raw_data'] = raw_records[i]
         
         return coaches
     
@@ -389,22 +477,28 @@ class DataDrivenProcessor:
     
     def _process_requirements_from_data(self):
         """Process requirements directly from enrollment data"""
-        requirements = []
+        df = self.enrollment_df
+        if df.empty:
+            return []
         
-        for _, row in self.enrollment_df.iterrows():
-            branch = str(row['Branch']).upper()
-            level = str(row['Level Category Base'])
-            students = int(row['Count'])
-            
-            if branch in self.all_branches and level in self.all_levels and students > 0:
-                requirements.append({
-                    'branch': branch,
-                    'level': level,
-                    'students': students,
-                    'capacity': self.class_capacities.get(level, 8),
-                    'duration': self.class_durations.get(level, 90),
-                    'raw_data': dict(row)
-                })
+        branches = df['Branch'].astype(str).str.upper()
+        levels = df['Level Category Base'].astype(str)
+        students = df['Count'].astype(int)
+        keep = (branches.isin(self.all_branches) & levels.isin(self.all_levels) & (students > 0)).to_numpy()
+        raw_records = df[keep].to_dict('records') if self.include_raw_data else None
+        
+        requirements = []
+        for i, (branch, level, count) in enumerate(zip(branches[keep].tolist(), levels[keep].tolist(),
+                                                       students[keep].tolist())):
+            requirements.append({
+                'branch': branch,
+                'level': level,
+                'students': count,
+                'capacity': self.class_capacities.get(level, 8),
+                'duration': self.class_durations.get(level, 90)
+            })
+            if raw_records is not None:
+                requirements[-1]['raw_data'] = raw_records[i]
         
         return requirements
     
@@ -412,33 +506,33 @@ class DataDrivenProcessor:
         """Process popular timeslots directly from database"""
         popular_slots = set()
         
-        print("  Processing popular timeslots from data:")
-        for _, row in self.popular_df.iterrows():
-            level = str(row['level'])
-            day = str(row['day']).upper()
-            time_slot = str(row['time_slot']).strip()
-            
-            if level in self.all_levels and day in self.all_days:
-                popular_slots.add((level, day, time_slot))
+        self.log.debug("  Processing popular timeslots from data:")
+        if not self.popular_df.empty:
+            levels = self.popular_df['level'].astype(str)
+            days = self.popular_df['day'].astype(str).str.upper()
+            time_slots = self.popular_df['time_slot'].astype(str).str.strip()
+            keep = (levels.isin(self.all_levels) & days.isin(self.all_days)).to_numpy()
+            popular_slots.update(zip(levels[keep].tolist(), days[keep].tolist(), time_slots[keep].tolist()))
         
-        print(f"    Processed {len(popular_slots)} popular timeslot combinations")
+        self.log.debug("    Processed %s popular timeslot combinations", len(popular_slots))
         
         # Show distribution by level
         by_level = defaultdict(int)
         for level, day, time_slot in popular_slots:
             by_level[level] += 1
         
-        print("    Popular slots by level:")
+        self.log.debug("    Popular slots by level:")
         for level in self.level_hierarchy:
             if level in self.all_levels:
                 count = by_level[level]
-                print(f"      {level}: {count} popular slots")
+                self.log.debug("      %s: %s popular slots", level, count)
         
         return popular_slots
     
     def _generate_timeslots_from_operating_hours(self):
         """Generate all valid timeslots from operating hours"""
         timeslots = []
+        candidates_scanned = 0
         
         for level in self.all_levels:
             duration = self.class_durations[level]
@@ -454,6 +548,7 @@ class DataDrivenProcessor:
                     # Generate 30-minute intervals
                     current = start_dt
                     while current + timedelta(minutes=duration) <= end_dt:
+                        candidates_scanned += 1
                         slot_start = current.strftime('%H:%M')
                         slot_end = (current + timedelta(minutes=duration)).strftime('%H:%M')
                         
@@ -472,6 +567,7 @@ class DataDrivenProcessor:
                         if valid_slot:
                             period = 'am' if current.hour < 12 else 'pm'
                             time_slot_str = f"{slot_start}-{slot_end}"
+                            start_minute = current.hour * 60 + current.minute
                             
                             # Check if this timeslot is popular
                             is_popular = self._is_popular_timeslot(level, day, time_slot_str)
@@ -481,6 +577,8 @@ class DataDrivenProcessor:
                                 'day': day,
                                 'start_time': slot_start,
                                 'end_time': slot_end,
+                                'start_minute': start_minute,
+                                'end_minute': start_minute + duration,
                                 'duration': duration,
                                 'period': period,
                                 'is_popular': is_popular,
@@ -489,17 +587,54 @@ class DataDrivenProcessor:
                         
                         current += timedelta(minutes=30)
         
+        self.profile['generate_timeslots'] = {
+            'candidates_scanned': candidates_scanned,
+            'timeslots_added': len(timeslots)
+        }
+        
         # Statistics
         total_slots = len(timeslots)
         popular_slots = len([ts for ts in timeslots if ts['is_popular']])
-        print(f"  Generated {total_slots} total timeslots from operating hours")
+        self.log.debug("  Generated %s total timeslots from operating hours", total_slots)
         if total_slots > 0:
-            print(f"  Popular timeslots: {popular_slots} ({popular_slots/total_slots*100:.1f}%)")
+            self.log.debug("  Popular timeslots: %s (%.1f%%)", popular_slots, popular_slots/total_slots*100)
         else:
-            print("  No timeslots generated - check operating hours and level data")
+            self.log.warning("No timeslots generated - check operating hours and level data")
         
         return timeslots
     
+    @staticmethod
+    def _time_range_minutes(time_slot_str):
+        """'HH:MM-HH:MM' as (start, end) minutes after midnight; raises ValueError for an invalid range"""
+        parts = time_slot_str.split('-')
+        if len(parts) < 2:
+            raise ValueError(f"not a time range: {time_slot_str!r}")
+        start = datetime.strptime(parts[0], '%H:%M')
+        end = datetime.strptime(parts[1], '%H:%M')
+        return start.hour * 60 + start.minute, end.hour * 60 + end.minute
+    
+    def _compile_popular_intervals(self):
+        """
+        Index the popular time ranges by (level, day) for _is_popular_timeslot
+        
+        Each entry is (starts, reaches): the range starts in ascending order, and for every position
+        the latest end among the ranges up to and including it. A slot lies inside some range exactly
+        when the last range starting at or before it reaches its end, which is one binary search.
+        """
+        ranges = defaultdict(list)
+        for level, day, time_slot in self.popular_timeslots_set:
+            try:
+                ranges[(level, day)].append(self._time_range_minutes(time_slot))
+            except ValueError:
+                # Skip invalid time format
+                continue
+        
+        intervals = {}
+        for key, spans in ranges.items():
+            spans.sort()
+            intervals[key] = ([start for start, _ in spans], list(accumulate((end for _, end in spans), max)))
+        return intervals
+    
     def _is_popular_timeslot(self, level, day, time_slot_str):
         """Check if a timeslot is popular based on data"""
         # Direct match
@@ -507,79 +642,109 @@ class DataDrivenProcessor:
             return True
         
         # Check if falls within any popular time range
+        intervals = self.popular_intervals.get((level, day))
+        if intervals is None:
+            return False
         try:
-            current_start = datetime.strptime(time_slot_str.split('-')[0], '%H:%M')
-            current_end = datetime.strptime(time_slot_str.split('-')[1], '%H:%M')
-            
-            for pop_level, pop_day, pop_time_slot in self.popular_timeslots_set:
-                if pop_level == level and pop_day == day and '-' in pop_time_slot:
-                    try:
-                        pop_start = datetime.strptime(pop_time_slot.split('-')[0], '%H:%M')
-                        pop_end = datetime.strptime(pop_time_slot.split('-')[1], '%H:%M')
-                        
-                        # Check if current slot falls within popular range
-                        if pop_start <= current_start and current_end <= pop_end:
-                            return True
-                    except ValueError:
-                        # Skip invalid time format
-                        continue
+            current_start, current_end = self._time_range_minutes(time_slot_str)
         except ValueError:
             # Skip if current time slot has invalid format
-            pass
+            return False
         
-        return False
+        starts, reaches = intervals
+        i = bisect_right(starts, current_start)
+        return i > 0 and reaches[i - 1] >= current_end
     
     def _generate_feasible_assignments_from_data(self):
-        """Generate feasible assignments based on all data constraints"""
-        assignments = []
-        assignment_id = 0
-        
-        for requirement in self.requirements_data:
-            req_branch = requirement['branch']
-            req_level = requirement['level']
-            req_duration = requirement['duration']
-            
-            # Find qualified coaches from data
-            qualified_coaches = []
-            for coach_id, coach in self.coaches_data.items():
-                if (req_level in coach['qualifications'] and 
-                    req_branch in coach['branches']):
-                    qualified_coaches.append(coach_id)
+        """
+        Generate feasible assignments based on all data constraints
+        
+        The candidate pool is the join requirements x coach qualifications x coach branches x timeslots x
+        availability. Per requirement, one boolean column over all coaches selects those qualified for its
+        level at its branch, and indexing the coach x day x period availability array with the (day, period)
+        of its timeslots gives every available (coach, timeslot) pair at once.
+        
+        The pool is kept as a struct of arrays in self.feasible_columns (coach_id, requirement and timeslot
+        index, and the day, minutes, capacity and is_popular flag the scheduler scores with), and turned
+        into Assignment records in the same order: by requirement, then coach, then timeslot.
+        """
+        requirements = self.requirements_data
+        timeslots = self.timeslots_data
+        num_coaches = len(self.coach_ids)
+        
+        # Coach x branch membership, with the same row order as the coach arrays
+        branch_index = {branch: i for i, branch in enumerate(self.all_branches)}
+        coach_branches = np.zeros((num_coaches, len(self.all_branches)), dtype=bool)
+        for row, coach in enumerate(self.coaches_data.values()):
+            coach_branches[row, [branch_index[branch] for branch in coach['branches']]] = True
+        level_index = {level: i for i, level in enumerate(self.qualification_levels)}
+        
+        # Timeslot indices by (level, duration), and the availability cell each timeslot falls in
+        day_index = {day: i for i, day in enumerate(self.all_days)}
+        slots_by_kind = defaultdict(list)
+        for i, timeslot in enumerate(timeslots):
+            slots_by_kind[(timeslot['level'], timeslot['duration'])].append(i)
+        slots_by_kind = {kind: np.array(slots, dtype=np.int64) for kind, slots in slots_by_kind.items()}
+        slot_days = np.array([day_index[timeslot['day']] for timeslot in timeslots], dtype=np.int64)
+        slot_periods = np.array([0 if timeslot['period'] == 'am' else 1 for timeslot in timeslots], dtype=np.int64)
+        
+        coach_rows = []
+        requirement_rows = []
+        slot_rows = []
+        candidates_scanned = 0
+        validations = 0
+        
+        for r, requirement in enumerate(requirements):
+            slots = slots_by_kind.get((requirement['level'], requirement['duration']))
+            candidates_scanned += num_coaches + (len(slots) if slots is not None else 0)
+            if slots is None or requirement['level'] not in level_index:
+                continue
             
-            # Find matching timeslots
-            matching_timeslots = []
-            for timeslot in self.timeslots_data:
-                if (timeslot['level'] == req_level and 
-                    timeslot['duration'] == req_duration):
-                    matching_timeslots.append(timeslot)
+            # Qualified coaches from data
+            coaches = np.flatnonzero(self.coach_qualifications[:, level_index[requirement['level']]] &
+                                     coach_branches[:, branch_index[requirement['branch']]])
+            validations += len(coaches) * len(slots)
             
-            # Create assignments
-            for coach_id in qualified_coaches:
-                coach = self.coaches_data[coach_id]
-                
-                for timeslot in matching_timeslots:
-                    day = timeslot['day']
-                    period = timeslot['period']
-                    
-                    # Check coach availability from data
-                    if coach['availability'][day][period]:
-                        assignments.append({
-                            'id': assignment_id,
-                            'coach_id': coach_id,
-                            'coach_name': coach['name'],
-                            'coach_status': coach['status'],
-                            'branch': req_branch,
-                            'level': req_level,
-                            'day': day,
-                            'start_time': timeslot['start_time'],
-                            'end_time': timeslot['end_time'],
-                            'duration': timeslot['duration'],
-                            'period': period,
-                            'is_popular': timeslot['is_popular'],
-                            'capacity': requirement['capacity'],
-                            'students_available': requirement['students']
-                        })
-                        assignment_id += 1
+            # Coach availability at each matching timeslot; nonzero() keeps coach-major order
+            available = self.coach_availability[coaches[:, None], slot_days[slots], slot_periods[slots]]
+            pair_coaches, pair_slots = np.nonzero(available)
+            coach_rows.append(coaches[pair_coaches])
+            slot_rows.append(slots[pair_slots])
+            requirement_rows.append(np.full(len(pair_coaches), r, dtype=np.int64))
+        
+        def column(parts):
+            return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        
+        requirement_index = column(requirement_rows)
+        slot_index = column(slot_rows)
+        self.feasible_columns = {
+            'coach_id': self.coach_ids[column(coach_rows)],
+            'requirement': requirement_index,
+            'timeslot': slot_index,
+            'day': np.array([ts['day'] for ts in timeslots], dtype=object)[slot_index],
+            'start_minute': np.array([ts['start_minute'] for ts in timeslots], dtype=np.int32)[slot_index],
+            'end_minute': np.array([ts['end_minute'] for ts in timeslots], dtype=np.int32)[slot_index],
+            'capacity': np.array([req['capacity'] for req in requirements], dtype=np.float64)[requirement_index],
+            'is_popular': np.array([ts['is_popular'] for ts in timeslots], dtype=bool)[slot_index]
+        }
+        
+        # Records share the requirement's and timeslot's field values
+        requirement_fields = [(req['branch'], req['level'], req['capacity']) for req in requirements]
+        slot_fields = [(ts['day'], ts['start_time'], ts['end_time'], ts['start_minute'], ts['end_minute'],
+                        ts['duration'], ts['period'], ts['is_popular']) for ts in timeslots]
+        assignments = []
+        candidates = zip(self.feasible_columns['coach_id'].tolist(), requirement_index.tolist(), slot_index.tolist())
+        for assignment_id, (coach_id, r, t) in enumerate(candidates):
+            branch, level, capacity = requirement_fields[r]
+            day, start_time, end_time, start_minute, end_minute, duration, period, is_popular = slot_fields[t]
+            assignments.append(Assignment(assignment_id, coach_id, branch, level, day, start_time, end_time,
+                                          start_minute, end_minute, duration, period, is_popular, capacity))
+        
+        self.profile['generate_feasible_assignments'] = {
+            'candidates_scanned': candidates_scanned,
+            'validations': validations,
+            'assignments_added': len(assignments)
+        }
         
         return assignments
     
@@ -598,26 +763,26 @@ class DataDrivenProcessor:
         
         # Calculate statistics
         total_students = sum(enrollment_dict.values())
-        popular_assignments = [a for a in self.feasible_assignments if a['is_popular']]
+        popular_assignments = [a for a in self.feasible_assignments if a.is_popular]
         
         # Analyze coverage potential
         coverage_analysis = self._analyze_coverage_potential(enrollment_dict, popular_assignments)
         
-        print(f"\nDATA-DRIVEN ANALYSIS:")
-        print(f"  Total students from enrollment data: {total_students}")
-        print(f"  Total assignments generated: {len(self.feasible_assignments)}")
+        self.log.info("DATA-DRIVEN ANALYSIS:")
+        self.log.info("  Total students from enrollment data: %s", total_students)
+        self.log.info("  Total assignments generated: %s", len(self.feasible_assignments))
         if self.feasible_assignments:
-            print(f"  Popular assignments: {len(popular_assignments)} ({len(popular_assignments)/len(self.feasible_assignments)*100:.1f}%)")
+            self.log.info("  Popular assignments: %s (%.1f%%)", len(popular_assignments), len(popular_assignments)/len(self.feasible_assignments)*100)
         else:
-            print("  No feasible assignments generated - check coach qualifications and availability")
+            self.log.warning("No feasible assignments generated - check coach qualifications and availability")
         
         if coverage_analysis['uncoverable_requirements']:
-            print(f"  Requirements needing attention: {len(coverage_analysis['uncoverable_requirements'])}")
+            self.log.info("  Requirements needing attention: %s", len(coverage_analysis['uncoverable_requirements']))
             for item in coverage_analysis['uncoverable_requirements'][:3]:
                 req = item['requirement']
-                print(f"    {req[0]} {req[1]}: needs {item['demand']}, popular capacity {item['capacity']}")
+                self.log.debug("    %s %s: needs %s, popular capacity %s", req[0], req[1], item['demand'], item['capacity'])
         else:
-            print("  ✓ All requirements can be covered with popular timeslots")
+            self.log.info("  ✓ All requirements can be covered with popular timeslots")
         
         return {
             # Core data from database
@@ -628,6 +793,7 @@ class DataDrivenProcessor:
             'requirements_data': self.requirements_data,
             'timeslots_data': self.timeslots_data,
             'feasible_assignments': self.feasible_assignments,
+            'feasible_columns': self.feasible_columns,
             
             # Business rules from data/description
             'class_capacities': self.class_capacities,
@@ -652,7 +818,9 @@ class DataDrivenProcessor:
             'total_timeslots': len(self.timeslots_data),
             'total_feasible_assignments': len(self.feasible_assignments),
             'popular_assignments_count': len(popular_assignments),
-            'coverage_analysis': coverage_analysis
+            'coverage_analysis': coverage_analysis,
+            'source_digest': self.source_digest,
+            'profile': self.profile
         }
     
     def _analyze_coverage_potential(self, enrollment_dict, popular_assignments):
@@ -667,8 +835,8 @@ class DataDrivenProcessor:
         # Calculate capacity by requirement
         capacity_by_req = defaultdict(int)
         for assignment in popular_assignments:
-            key = (assignment['branch'], assignment['level'])
-            capacity_by_req[key] += assignment['capacity']
+            key = (assignment.branch, assignment.level)
+            capacity_by_req[key] += assignment.capacity
         
         analysis['popular_capacity'] = sum(capacity_by_req.values())
         
@@ -692,12 +860,16 @@ class DataDrivenProcessor:
         
         return analysis
 
-def load_database_driven():
+def load_database_driven(log_level=None, include_raw_data=False):
     """
     Load data using completely data-driven processor from database
     
+    Args:
+        log_level: 'quiet' (default), 'info' or 'debug' for this load
+        include_raw_data: keep the source row of every coach and requirement as their 'raw_data'
+    
     Returns:
         Complete data package with everything extracted from database
     """
-    processor = DataDrivenProcessor()
+    processor = DataDrivenProcessor(log_level, include_raw_data)
     return processor.load_and_process_data()
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+In-memory snapshot of the processed scheduling data, versioned by database writes
+
+Every commit that changes one of the tables load_database_driven() reads bumps the app's data
+version. load_data() returns the package built for the current version, so repeated Generate or
+Repair requests on unchanged data skip loading and processing entirely. With prewarm enabled, a
+background thread rebuilds the snapshot after each change, so the next request finds it ready.
+
+The same commits clear the scheduling result cache. Only writes made through this process's
+session are seen; the desktop app runs a single server process.
+"""
+import logging
+import threading
+import time
+from itertools import chain
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from application.data_processor import load_database_driven
+from application.scheduling_log import RunLogger
+
+logger = logging.getLogger(__name__)
+
+
+class DataSnapshot:
+    """
+    The last data package with the data version it was built for
+
+    One lock serialises builds, so concurrent requests after a change wait for a single load instead
+    of each running their own. A build records the version read before loading, so a write that lands
+    while it runs leaves the snapshot stale and the next request loads again.
+    """
+
+    def __init__(self, app, prewarm=False):
+        self.app = app
+        self.prewarm = prewarm
+        self.version = 0
+        # (version, package), replaced as a whole so readers never see a package with another version
+        self._snapshot = (None, None)
+        self._build_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._changed = threading.Event()
+        self._prewarm_thread = None
+
+    def get(self, log_level=None):
+        """
+        The package for the current data version, loading it if the snapshot is stale
+        
+        A reused package is returned as a shallow copy whose profile times the lookup instead of
+        repeating the timings of the load that built it.
+        """
+        log = RunLogger(logger, log_level)
+        start = time.perf_counter()
+        with self._build_lock:
+            version = self.version
+            built_version, package = self._snapshot
+            if built_version != version:
+                package = load_database_driven(log_level)
+                self._snapshot = (version, package)
+                log.info("Data snapshot built for version %s", version)
+                return package
+        
+        log.info("Data snapshot reused for version %s", version)
+        return dict(package, profile={'data_snapshot': {
+            'version': version,
+            'cached': True,
+            'seconds': round(time.perf_counter() - start, 4)
+        }})
+
+    def bump(self):
+        """Move to a new data version, dropping the snapshot (and rebuilding it in the background with prewarm)"""
+        with self._version_lock:
+            self.version += 1
+            self._snapshot = (None, None)
+            if self.prewarm and self._prewarm_thread is None:
+                self._prewarm_thread = threading.Thread(target=self._prewarm, name='data-snapshot-prewarm', daemon=True)
+                self._prewarm_thread.start()
+        if self.prewarm:
+            self._changed.set()
+
+    def _prewarm(self):
+        # Changes that arrive during a build set the event again, so bursts of commits cost one extra build
+        while True:
+            self._changed.wait()
+            self._changed.clear()
+            try:
+                with self.app.app_context():
+                    self.get()
+            except Exception:
+                logger.exception("Could not prewarm the data snapshot")
+
+
+def init_data_snapshot(app):
+    """Create the app's snapshot (None when DATA_SNAPSHOT_ENABLED is off) and track source table changes"""
+    app.extensions['data_snapshot'] = (DataSnapshot(app, app.config.get('DATA_SNAPSHOT_PREWARM', False))
+                                       if app.config.get('DATA_SNAPSHOT_ENABLED', False) else None)
+
+    if not event.contains(Session, 'after_commit', _after_source_change):
+        event.listen(Session, 'after_flush', _note_flushed_changes)
+        event.listen(Session, 'do_orm_execute', _note_bulk_changes)
+        event.listen(Session, 'after_commit', _after_source_change)
+        event.listen(Session, 'after_rollback', _forget_source_change)
+
+
+def load_data(log_level=None):
+    """The processed data package: the current snapshot when the app keeps one, otherwise a fresh load"""
+    snapshot = current_app.extensions.get('data_snapshot')
+    if snapshot is None:
+        return load_database_driven(log_level)
+    return snapshot.get(log_level)
+
+
+def _source_models():
+    """Tables load_database_driven() builds the data package from"""
+    from application.models import Branch, Level, Coach, CoachBranch, CoachOffday, CoachPreference, Enrollment, \
+                                   PopularTimeslot
+    return (Branch, Level, Coach, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot)
+
+
+def _note_flushed_changes(session, flush_context):
+    source_models = _source_models()
+    if any(isinstance(obj, source_models) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['source_tables_changed'] = True
+
+
+def _note_bulk_changes(orm_execute_state):
+    # query(...).delete() and .update() skip the flush
+    if orm_execute_state.is_delete or orm_execute_state.is_update:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, _source_models()):
+            orm_execute_state.session.info['source_tables_changed'] = True
+
+
+def _after_source_change(session):
+    if session.info.pop('source_tables_changed', False) and has_app_context():
+        snapshot = current_app.extensions.get('data_snapshot')
+        if snapshot is not None:
+            snapshot.bump()
+        cache = current_app.extensions.get('result_cache')
+        if cache is not None:
+            cache.clear()
+            logger.info("Source tables changed, scheduling result cache cleared")
+
+
+def _forget_source_change(session):
+    session.info.pop('source_tables_changed', None)
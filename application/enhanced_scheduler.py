@@ -1,8 +1,112 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from itertools import chain, count
+import heapq
+import logging
+import math
+import os
 import random
+import time
+
+from application.scheduling_log import RunLogger
+from application.schedule_validator import ScheduleValidator, WORKLOAD_RULES
+
+logger = logging.getLogger(__name__)
+
+class OccupancyGrid:
+    """
+    Array-backed occupancy state for coaches and branches
+    
+    The day is bucketed into 30-minute slots (slot = minute_of_day // 30):
+    - branch_usage[branch, day, slot]: number of classes running at a branch
+    - coach_occupancy[coach, day, slot]: whether a coach is already teaching
+    
+    Conflict and capacity checks become slice tests, and copying the grid
+    for a new iteration is a single array copy.
+    """
+    
+    SLOT_MINUTES = 30
+    SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+    
+    def __init__(self, coach_ids, branches, days):
+        self.coach_index = {coach_id: i for i, coach_id in enumerate(coach_ids)}
+        self.branch_index = {branch: i for i, branch in enumerate(branches)}
+        self.day_index = {day: i for i, day in enumerate(days)}
+        
+        self.branch_usage = np.zeros((len(self.branch_index), len(self.day_index), self.SLOTS_PER_DAY), dtype=np.int16)
+        self.coach_occupancy = np.zeros((len(self.coach_index), len(self.day_index), self.SLOTS_PER_DAY), dtype=np.bool_)
+    
+    def _slot_range(self, start_minute, end_minute):
+        """Convert a minute range to a [start, end) slot range covering it"""
+        return start_minute // self.SLOT_MINUTES, -(-end_minute // self.SLOT_MINUTES)
+    
+    def coach_is_free(self, coach_id, day, start_minute, end_minute):
+        """Check that a coach has no class overlapping the given time"""
+        start_slot, end_slot = self._slot_range(start_minute, end_minute)
+        slots = self.coach_occupancy[self.coach_index[coach_id], self.day_index[day], start_slot:end_slot]
+        # A class spans only a few slots; tolist() beats a NumPy reduction at this size
+        return not any(slots.tolist())
+    
+    def branch_has_capacity(self, branch, day, start_minute, end_minute, max_classes):
+        """Check that every slot of the given time is below the branch limit"""
+        start_slot, end_slot = self._slot_range(start_minute, end_minute)
+        slots = self.branch_usage[self.branch_index[branch], self.day_index[day], start_slot:end_slot]
+        return max(slots.tolist(), default=0) < max_classes
+    
+    def book(self, coach_id, branch, day, start_minute, end_minute):
+        """Mark a class as occupying the coach and branch for the given time"""
+        start_slot, end_slot = self._slot_range(start_minute, end_minute)
+        day_idx = self.day_index[day]
+        self.coach_occupancy[self.coach_index[coach_id], day_idx, start_slot:end_slot] = True
+        self.branch_usage[self.branch_index[branch], day_idx, start_slot:end_slot] += 1
+    
+    def release(self, coach_id, branch, day, start_minute, end_minute):
+        """Undo a previous book() for the same class"""
+        start_slot, end_slot = self._slot_range(start_minute, end_minute)
+        day_idx = self.day_index[day]
+        self.coach_occupancy[self.coach_index[coach_id], day_idx, start_slot:end_slot] = False
+        self.branch_usage[self.branch_index[branch], day_idx, start_slot:end_slot] -= 1
+    
+    def copy(self):
+        """Copy the grid; index maps are shared, arrays are copied"""
+        grid = OccupancyGrid.__new__(OccupancyGrid)
+        grid.coach_index = self.coach_index
+        grid.branch_index = self.branch_index
+        grid.day_index = self.day_index
+        grid.branch_usage = self.branch_usage.copy()
+        grid.coach_occupancy = self.coach_occupancy.copy()
+        return grid
+
+
+class CandidateIndex(dict):
+    """
+    Candidate assignments keyed by (coach, branch, level) and (coach, branch, level, day)
+    
+    Behaves as a plain dict of lists. columns() additionally slices the run-wide
+    static columns down to the candidates of one key, on first use, so scoring
+    can run over all candidates of a coach at once.
+    """
+    
+    def __init__(self, static_columns, column_rows):
+        super().__init__()
+        self.static_columns = static_columns
+        self.column_rows = column_rows
+        self._columns = {}
+    
+    def columns(self, key):
+        """Static columns for the candidates under key, in list order"""
+        columns = self._columns.get(key)
+        if columns is None:
+            rows = np.array([self.column_rows[a.id] for a in self.get(key, [])], dtype=np.intp)
+            columns = {name: column[rows] for name, column in self.static_columns.items()}
+            self._columns[key] = columns
+        return columns
+
+
+class SchedulerConfigError(ValueError):
+    """A config value the scheduler cannot use (wrong type or out of range)"""
+
 
 class EnhancedStrictConstraintScheduler:
     """
@@ -15,6 +119,7 @@ class EnhancedStrictConstraintScheduler:
     4. Multi-level combinations for complex gaps
     5. Exhaustive assignment using all available resources
     6. Maximum utilization within strict constraints
+    7. Local search (relocate / swap moves) to open room for remaining gaps
     """
     
     # ==================== EDITABLE CONFIGURATION ====================
@@ -40,6 +145,13 @@ class EnhancedStrictConstraintScheduler:
     MAX_ITERATIONS = 60            # Number of optimization iterations
     SHUFFLE_INTERVAL = 5           # Shuffle assignments every N iterations
     MAX_ASSIGNMENT_ATTEMPTS = 20   # Max attempts per requirement
+    PARALLEL_WORKERS = 1           # Worker processes for independent iterations (1 = run sequentially, capped at the CPU count)
+    DECOMPOSE_COMPONENTS = False   # Schedule groups of branches that share no coaches separately (MAX_ITERATIONS
+                                   # and PLATEAU_ITERATIONS then apply to each group, not to the whole run)
+    TIME_BUDGET_SECONDS = 0.0      # Wall-clock budget for the iteration loop (0 = no limit)
+    PLATEAU_ITERATIONS = 0         # Stop after N iterations without coverage improvement (0 = never)
+    LOCAL_SEARCH_STEPS = 200       # Local search moves per iteration after the greedy phases (0 = disabled)
+    LOG_LEVEL = 'quiet'            # 'quiet' (warnings only), 'info' (phase summaries) or 'debug' (every decision)
     
     # Scoring Weights (1-10 scale, higher = more preferred)
     WEEKEND_BIAS = 5               # Weekend preference (1-10)
@@ -58,34 +170,43 @@ class EnhancedStrictConstraintScheduler:
     _CAPACITY_MULTIPLIER = 2.0     # Default capacity multiplier value
     _PEAK_HOURS_BONUS = 8          # Priority for 10AM-3PM slots
     _GOOD_HOURS_BONUS = 6          # Priority for 9AM-5PM slots
+    _LOCAL_SEARCH_TEMPERATURE = 2.0 # Initial annealing temperature, in students
+    _MIN_COMPONENT_BUDGET_SECONDS = 0.05  # Smallest share of TIME_BUDGET_SECONDS a component is given
+    
+    # Smallest accepted value of the counts the loop divides by or iterates over (other numbers: 0)
+    _CONFIG_MINIMUMS = {'MAX_ITERATIONS': 1, 'SHUFFLE_INTERVAL': 1, 'MAX_ASSIGNMENT_ATTEMPTS': 1, 'PARALLEL_WORKERS': 1}
     
     # ==================== END EDITABLE CONFIGURATION ====================
     
-    def __init__(self, data, config:dict =None):
-        if config:
-            for key, value in config.items():
-                if hasattr(self, key.upper()):
-                    setattr(self, key.upper(), value)
+    def __init__(self, data, config:dict =None, warm_start=None):
+        self.config = dict(config) if config else {}
+        self._apply_config(self.config)
+        
+        self.log = RunLogger(logger, self.LOG_LEVEL)
         
-        print("ENHANCED STRICT CONSTRAINT SCHEDULER")
-        print("Target: Maximum student assignment with strict workload limits")
-        print(f"STRICT LIMIT: Max {self.WEEKEND_DAILY_LIMIT} classes per coach per weekend day")
-        print(f"STRICT LIMIT: Max {self.WEEKDAY_DAILY_LIMIT} classes per coach per weekday")
+        self.log.debug("ENHANCED STRICT CONSTRAINT SCHEDULER")
+        self.log.debug("Target: Maximum student assignment with strict workload limits")
+        self.log.debug("STRICT LIMIT: Max %s classes per coach per weekend day", self.WEEKEND_DAILY_LIMIT)
+        self.log.debug("STRICT LIMIT: Max %s classes per coach per weekday", self.WEEKDAY_DAILY_LIMIT)
 
         self.data = data
         self.enrollment_dict = data['enrollment_dict']
         self.coaches_data = data['coaches_data']
         self.feasible_assignments = data['feasible_assignments']
         
-        # Use only popular assignments
-        self.popular_assignments = [a for a in self.feasible_assignments if a.get('is_popular', False)]
+        # Use only popular assignments (a component scheduler gets its share of the parent's pool)
+        if 'popular_assignments' in data:
+            self.popular_assignments = list(data['popular_assignments'])
+        else:
+            self.popular_assignments = [a for a in self.feasible_assignments if a.is_popular]
         
-        if len(self.popular_assignments) == 0:
-            print("WARNING: No popular assignments found. Using all feasible assignments.")
-            self.popular_assignments = self.feasible_assignments
+        if len(self.popular_assignments) == 0 and 'popular_assignments' not in data:
+            self.log.warning("No popular assignments found. Using all feasible assignments.")
+            # A copy, since shuffling must not reorder the (possibly shared) data package
+            self.popular_assignments = list(self.feasible_assignments)
         
-        print(f"Popular assignments available: {len(self.popular_assignments)}")
-        print(f"Only using popular timeslots for scheduling")
+        self.log.debug("Popular assignments available: %s", len(self.popular_assignments))
+        self.log.debug("Only using popular timeslots for scheduling")
         
         # Load constraints and hierarchy
         self.class_capacities = data['class_capacities']
@@ -93,6 +214,15 @@ class EnhancedStrictConstraintScheduler:
         self.level_hierarchy = ['Tots', 'Jolly', 'Bubbly', 'Lively', 'Flexi', 'L1', 'L2', 'L3', 'L4', 'Advance', 'Free']
         self.weekdays = data['weekdays']
         self.weekends = data['weekends']
+        self.validator = ScheduleValidator(self.class_capacities, self.weekends,
+                                           **{key: getattr(self, key.upper()) for key in ScheduleValidator.LIMITS})
+        
+        # Empty occupancy grid, copied at the start of every iteration
+        grid_branches = sorted(set(data['all_branches']) | set(self.branch_limits) |
+                               {a.branch for a in self.feasible_assignments})
+        grid_days = ['TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+        grid_days += [day for day in self.weekdays + self.weekends if day not in grid_days]
+        self._empty_grid = OccupancyGrid(self.coaches_data.keys(), grid_branches, grid_days)
         
         # Define programs for the same_program_back_to_back penalty
         self.program_groups = {
@@ -112,6 +242,16 @@ class EnhancedStrictConstraintScheduler:
         # Define morning hours (before 12pm) for same program back to back penalty
         self.morning_hours = list(range(9, 12))
         
+        # Scoring inputs that never change during a run, one row per feasible assignment
+        self._column_rows = {a.id: i for i, a in enumerate(self.feasible_assignments)}
+        self._static_columns = self._build_static_columns(self.feasible_assignments, data.get('feasible_columns'))
+        
+        # Classes of a stored timetable that every iteration starts from (same format as repair_schedule)
+        self.warm_start_classes = list(warm_start) if warm_start else []
+        self._warm_start_matches = self._match_existing_classes(self.warm_start_classes)
+        if self.warm_start_classes:
+            self.log.info("Warm start from %s stored classes", len(self.warm_start_classes))
+        
         self.total_students_required = sum(self.enrollment_dict.values())
         
         # Categorize coaches by type
@@ -119,18 +259,19 @@ class EnhancedStrictConstraintScheduler:
         self.part_time_coaches = [c for c in self.coaches_data.values() if c['status'] == 'Part Time']
         self.branch_managers = [c for c in self.coaches_data.values() if c['status'] == 'Branch Manager']
         
-        print(f"Total students to schedule: {self.total_students_required}")
-        print(f"Coaches: {len(self.full_time_coaches)} FT, {len(self.part_time_coaches)} PT, {len(self.branch_managers)} MGR")
+        self.log.info("Total students to schedule: %s", self.total_students_required)
+        self.log.info("Coaches: %s FT, %s PT, %s MGR", len(self.full_time_coaches), len(self.part_time_coaches), len(self.branch_managers))
         
+        self._build_priority_tables()
         self._analyze_enrollment_requirements()
         
         # Calculate theoretical capacity
         self.theoretical_capacity = self._calculate_theoretical_capacity()
-        print(f"Theoretical maximum capacity (strict limits): {self.theoretical_capacity}")
+        self.log.info("Theoretical maximum capacity (strict limits): %s", self.theoretical_capacity)
         
         if self.theoretical_capacity < self.total_students_required:
-            print("WARNING: Theoretical capacity insufficient with strict workload limits")
-            print("Will maximize coverage within constraints")
+            self.log.warning("Theoretical capacity insufficient with strict workload limits")
+            self.log.warning("Will maximize coverage within constraints")
         
         # Normalize priority weights for calculations (scale of 0-10 to proportions)
         total_weight = self.SCARCITY_WEIGHT + self.COMPLEXITY_WEIGHT + self.SIZE_WEIGHT
@@ -144,106 +285,402 @@ class EnhancedStrictConstraintScheduler:
             self.complexity_weight_normalized = 0.33
             self.size_weight_normalized = 0.34
     
+    def _apply_config(self, config):
+        """
+        Override the editable configuration constants with the matching config keys
+        
+        Keys that name no constant (form fields such as csrf_token) are ignored. Numeric constants only take
+        finite numbers of the same kind, at least their _CONFIG_MINIMUMS entry (0 by default). PARALLEL_WORKERS
+        is capped at the machine's CPU count, so a request cannot start an arbitrary number of worker processes.
+        """
+        for key, value in config.items():
+            name = key.upper()
+            if name.startswith('_') or not hasattr(type(self), name):
+                continue
+            default = getattr(type(self), name)
+            if isinstance(default, bool):
+                if not isinstance(value, bool):
+                    raise SchedulerConfigError(f"{key} must be true or false, got {value!r}")
+            elif isinstance(default, (int, float)):
+                allowed = (int, float) if isinstance(default, float) else int
+                if isinstance(value, bool) or not isinstance(value, allowed):
+                    raise SchedulerConfigError(f"{key} must be {'a number' if allowed is not int else 'an integer'}, got {value!r}")
+                minimum = self._CONFIG_MINIMUMS.get(name, 0)
+                if not math.isfinite(value) or value < minimum:
+                    raise SchedulerConfigError(f"{key} must be at least {minimum}, got {value!r}")
+            setattr(self, name, value)
+        
+        cpu_count = os.cpu_count() or 1
+        if self.PARALLEL_WORKERS > cpu_count:
+            logger.warning("parallel_workers %s capped at %s CPUs", self.PARALLEL_WORKERS, cpu_count)
+            self.PARALLEL_WORKERS = cpu_count
+    
+    def _build_priority_tables(self):
+        """Count qualified coaches and popular slots per (branch, level) once per run"""
+        self.level_index = {level: i for i, level in enumerate(self.level_hierarchy)}
+        
+        self.qualified_coach_counts = defaultdict(int)
+        for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
+            for branch in set(coach['branches']):
+                for level in set(coach['qualifications']):
+                    self.qualified_coach_counts[(branch, level)] += 1
+        self.qualified_coach_counts = dict(self.qualified_coach_counts)
+        
+        self.popular_slot_counts = defaultdict(int)
+        for assignment in self.popular_assignments:
+            self.popular_slot_counts[(assignment.branch, assignment.level)] += 1
+        self.popular_slot_counts = dict(self.popular_slot_counts)
+        
+        # Requirement order depends only on the data and weights; built on first use
+        self._priority_requirements = None
+    
     def _analyze_enrollment_requirements(self):
         """Analyze enrollment requirements and identify potential bottlenecks"""
-        print("\nAnalyzing enrollment requirements:")
+        self.log.debug("Analyzing enrollment requirements:")
         
         for req_key, students in self.enrollment_dict.items():
             branch, level = req_key
             
-            qualified_coaches = len([c for c in self.full_time_coaches + self.part_time_coaches + self.branch_managers
-                                   if level in c['qualifications'] and branch in c['branches']])
+            qualified_coaches = self.qualified_coach_counts.get(req_key, 0)
+            popular_slots = self.popular_slot_counts.get(req_key, 0)
             
-            popular_slots = len([a for a in self.popular_assignments 
-                               if a['branch'] == branch and a['level'] == level])
-            
-            print(f"  {branch} {level}: {students} students, {qualified_coaches} coaches, {popular_slots} popular slots")
+            self.log.debug("  %s %s: %s students, %s coaches, %s popular slots", branch, level, students, qualified_coaches, popular_slots)
             
             if students > 0 and (qualified_coaches == 0 or popular_slots == 0):
-                print(f"    WARNING: Critical shortage for {branch} {level}")
+                self.log.warning("Critical shortage for %s %s", branch, level)
     
     def schedule_with_complete_coverage(self):
         """Main scheduling algorithm with strict constraint enforcement"""
-        print("\nStarting enhanced scheduling with strict workload enforcement...")
-        print(f"CONSTRAINT: Never exceed {self.WEEKEND_DAILY_LIMIT} weekend / {self.WEEKDAY_DAILY_LIMIT} weekday classes per coach per day")
-        print("STRATEGY: Maximize coverage within absolute limits")
-        print("NOTE: Only using popular timeslots for scheduling")
+        for progress in self.iter_schedule():
+            pass
+        return progress['result']
+    
+    def iter_schedule(self):
+        """
+        Run the scheduler as a generator of progress records
+        
+        A record is yielded after every iteration with:
+            iteration           iterations completed so far
+            component           index of the coach-branch component it belongs to (None if not decomposed)
+            coverage            this iteration's coverage percentage
+            violations          this iteration's general constraint violations
+            workload_violations this iteration's workload limit violations
+            accepted            whether it became the new best result
+            best_coverage       coverage of the best valid result so far
+            best_result         the best valid result so far (None until one is found)
+            elapsed_seconds     time since the run started
+            final               False
+        
+        When the run is decomposed, coverage, best_coverage and best_result refer to the record's
+        component, which covers only its own branches; with parallel workers there is one record
+        per finished component.
+        
+        The last record has final=True, the finished result (as returned by
+        schedule_with_complete_coverage) under 'result', and its stop_reason. Send True into the
+        generator to stop after the current iteration; the reply is then the final record.
+        """
+        self.log.debug("Starting enhanced scheduling with strict workload enforcement...")
+        self.log.debug("CONSTRAINT: Never exceed %s weekend / %s weekday classes per coach per day", self.WEEKEND_DAILY_LIMIT, self.WEEKDAY_DAILY_LIMIT)
+        self.log.debug("STRATEGY: Maximize coverage within absolute limits")
+        self.log.debug("NOTE: Only using popular timeslots for scheduling")
+        
+        # Best coverage any iteration could reach; the loop stops once it is met
+        self.coverage_upper_bound = self._calculate_coverage_upper_bound()
+        self.log.info("Coverage upper bound (max-flow): %.1f%%", self.coverage_upper_bound)
+        
+        if self.DECOMPOSE_COMPONENTS:
+            components = self._find_components()
+            if len(components) > 1:
+                yield from self._iter_components(components)
+                return
+        
+        if self.PARALLEL_WORKERS > 1:
+            yield from self._iter_parallel()
+            return
         
+        start_time = time.perf_counter()
         best_result = None
         best_coverage = 0
+        last_improvement = 0
+        stop_reason = 'max_iterations'
+        iteration_profiles = []
+        # Iterations run so far, reported even if the loop body never runs
+        iteration = 0
         
         for iteration in range(1, self.MAX_ITERATIONS + 1):
-            print(f"\nITERATION {iteration}")
-            print("-" * 40)
-            
-            state = self._initialize_enhanced_state()
-            
-            # Always use popular slots only
-            assignment_pool = self.popular_assignments
-            print(f"Using POPULAR slots only for maximum coverage")
+            self.log.info("ITERATION %s", iteration)
             
-            # Execute six-phase optimization
-            self._phase1_enhanced_systematic(state, assignment_pool)
-            self._phase2_enhanced_gap_filling(state, assignment_pool)
-            self._phase3_enhanced_merging(state)
-            self._phase4_multi_level_merging(state, assignment_pool)
-            self._phase5_exhaustive_assignment(state, assignment_pool)
-            self._phase6_maximum_utilization_strict(state, assignment_pool)
-            
-            # Validate and score result
-            result = self._build_and_validate_result(state)
-            coverage = result['statistics']['coverage_percentage']
-            violations = self._count_violations(result)
-            workload_violations = self._count_workload_violations(result)
-            
-            print(f"Result: {coverage:.1f}% coverage, {violations} violations, {workload_violations} workload violations")
+            result, coverage, violations, workload_violations = self._run_iteration()
+            iteration_profiles.append((iteration, result['statistics']['profile']))
             
             # Accept only zero-violation results
-            if violations == 0 and workload_violations == 0 and coverage > best_coverage:
+            accepted = violations == 0 and workload_violations == 0 and coverage > best_coverage
+            if accepted:
                 best_result = result
                 best_coverage = coverage
-                print(f"New best VALID result: {coverage:.1f}% (strict limits enforced)")
+                last_improvement = iteration
+                self.log.info("New best VALID result: %.1f%% (strict limits enforced)", coverage)
             elif workload_violations > 0:
-                print(f"REJECTED: {workload_violations} workload limit violations")
+                self.log.info("REJECTED: %s workload limit violations", workload_violations)
             elif violations > 0:
-                print(f"REJECTED: {violations} other constraint violations")
+                self.log.info("REJECTED: %s other constraint violations", violations)
+            
+            if (yield self._progress_record(iteration, None, coverage, violations, workload_violations, accepted,
+                                            best_coverage, best_result, start_time)):
+                self.log.info("STOP: requested by the caller")
+                stop_reason = 'stopped'
+                break
             
             # Check for perfect solution
             if coverage >= 100.0 and violations == 0 and workload_violations == 0:
-                print("100% coverage with zero violations achieved - SUCCESS")
+                self.log.info("100% coverage with zero violations achieved - SUCCESS")
+                stop_reason = 'perfect_coverage'
+                break
+            
+            if best_result and best_coverage >= self.coverage_upper_bound:
+                self.log.info("Best coverage %.1f%% meets the upper bound - no further improvement possible", best_coverage)
+                stop_reason = 'upper_bound'
+                break
+            
+            stop_reason = self._check_early_stop(start_time, iteration, last_improvement) or stop_reason
+            if stop_reason in ('time_budget', 'plateau'):
                 break
             
             # Report remaining gaps
             gaps = self._identify_gaps(result)
             if gaps:
                 unassigned_total = sum(gap for _, gap in gaps)
-                print(f"Remaining unassigned: {unassigned_total} students")
+                self.log.info("Remaining unassigned: %s students", unassigned_total)
                 if len(gaps) <= 5:
-                    print("Critical gaps:")
+                    self.log.debug("Critical gaps:")
                     for req_key, gap in gaps:
-                        print(f"  {req_key[0]} {req_key[1]}: {gap} students")
+                        self.log.debug("  %s %s: %s students", req_key[0], req_key[1], gap)
             
             # Periodic shuffling for better exploration
             if iteration % self.SHUFFLE_INTERVAL == 0:
                 self._enhanced_adaptive_shuffle()
         
+        yield self._final_record(self._finalize_result(best_result, {
+            'stop_reason': stop_reason,
+            'iterations_run': iteration,
+            'elapsed_seconds': round(time.perf_counter() - start_time, 3),
+            'coverage_upper_bound': self.coverage_upper_bound,
+            'profile': self._summarize_profile(iteration_profiles)
+        }))
+    
+    def _progress_record(self, iteration, component, coverage, violations, workload_violations, accepted,
+                         best_coverage, best_result, start_time):
+        """Progress record yielded by iter_schedule() after an iteration"""
+        return {
+            'iteration': iteration,
+            'component': component,
+            'coverage': coverage,
+            'violations': violations,
+            'workload_violations': workload_violations,
+            'accepted': accepted,
+            'best_coverage': best_coverage,
+            'best_result': best_result,
+            'elapsed_seconds': round(time.perf_counter() - start_time, 3),
+            'final': False
+        }
+    
+    def _final_record(self, result):
+        """Last record yielded by iter_schedule(), carrying the finished result"""
+        return {'final': True, 'result': result, 'stop_reason': result['statistics']['stop_reason']}
+    
+    def _check_early_stop(self, start_time, iteration, last_improvement):
+        """Return 'time_budget' or 'plateau' if the loop should stop, otherwise None"""
+        if self.TIME_BUDGET_SECONDS > 0 and time.perf_counter() - start_time >= self.TIME_BUDGET_SECONDS:
+            self.log.info("STOP: time budget of %ss reached", self.TIME_BUDGET_SECONDS)
+            return 'time_budget'
+        
+        if self.PLATEAU_ITERATIONS > 0 and iteration - last_improvement >= self.PLATEAU_ITERATIONS:
+            self.log.info("STOP: no coverage improvement in %s iterations", self.PLATEAU_ITERATIONS)
+            return 'plateau'
+        
+        return None
+    
+    def _run_iteration(self):
+        """Run the seven phases once from an empty state and validate the result"""
+        state = self._initialize_enhanced_state()
+        
+        # Always use popular slots only
+        assignment_pool = self.popular_assignments
+        self.log.debug("Using POPULAR slots only for maximum coverage")
+        
+        # Index the pool once per iteration so candidate order follows the latest shuffle
+        candidate_index = self._build_candidate_index(assignment_pool)
+        
+        # Warm start: commit the stored classes that are still valid; the phases only fill what is left
+        if self._warm_start_matches:
+            invalidated = self._profile_phase('warm_start', state, self._pin_existing_classes, self._warm_start_matches, state)
+            warm_start = {'kept_classes': len(state['selected_assignments']), 'invalidated': invalidated}
+            self._profile_phase('warm_start', state, self._phase3_enhanced_merging, state)
+        
+        # Execute seven-phase optimization
+        self._profile_phase('phase1_systematic', state, self._phase1_enhanced_systematic, state, candidate_index)
+        self._profile_phase('phase2_gap_filling', state, self._phase2_enhanced_gap_filling, state, candidate_index)
+        self._profile_phase('phase3_merging', state, self._phase3_enhanced_merging, state)
+        self._profile_phase('phase4_multi_level', state, self._phase4_multi_level_merging, state, candidate_index)
+        self._profile_phase('phase5_exhaustive', state, self._phase5_exhaustive_assignment, state, candidate_index)
+        self._profile_phase('phase6_max_utilization', state, self._phase6_maximum_utilization_strict, state, candidate_index)
+        self._profile_phase('phase7_local_search', state, self._phase7_local_search, state, candidate_index)
+        
+        # Validate and score result
+        validation_start = time.perf_counter()
+        result = self._build_and_validate_result(state)
+        if self._warm_start_matches:
+            result['statistics']['warm_start'] = warm_start
+        coverage = result['statistics']['coverage_percentage']
+        violations, workload_violations = self._count_violations(result)
+        state['profile']['validation'] = {'seconds': round(time.perf_counter() - validation_start, 4)}
+        result['statistics']['profile'] = state['profile']
+        
+        self.log.info("Result: %.1f%% coverage, %s violations, %s workload violations", coverage, violations, workload_violations)
+        
+        return result, coverage, violations, workload_violations
+    
+    def _profile_phase(self, name, state, phase, *args):
+        """Run one phase and add its wall time and work counter deltas to state['profile'][name]"""
+        counters = state['counters']
+        before = dict(counters)
+        start = time.perf_counter()
+        
+        value = phase(*args)
+        
+        entry = state['profile'].setdefault(name, dict.fromkeys(('seconds',) + tuple(counters), 0))
+        entry['seconds'] = round(entry['seconds'] + time.perf_counter() - start, 4)
+        for key, count in counters.items():
+            entry[key] += count - before[key]
+        return value
+    
+    def _summarize_profile(self, iteration_profiles):
+        """Combine (iteration, phase profile) pairs with the data processor's steps"""
+        phases = {}
+        for _, profile in iteration_profiles:
+            for name, entry in profile.items():
+                total = phases.setdefault(name, dict.fromkeys(entry, 0))
+                for key, value in entry.items():
+                    total[key] += value
+        for total in phases.values():
+            total['seconds'] = round(total['seconds'], 4)
+        
+        return {
+            'data_processor': self.data.get('profile', {}),
+            'phases': phases,
+            'iterations': [{'iteration': iteration, 'phases': profile}
+                           for iteration, profile in sorted(iteration_profiles, key=lambda p: p[0])]
+        }
+    
+    def _iter_parallel(self):
+        """Run the independent restarts across a process pool and keep the best valid result"""
+        self.log.info("Running %s iterations across %s worker processes", self.MAX_ITERATIONS, self.PARALLEL_WORKERS)
+        
+        # Draw the base seed from the caller's RNG so seeded runs stay reproducible
+        base_seed = random.randrange(2**32)
+        
+        start_time = time.perf_counter()
+        best_result = None
+        best_coverage = 0
+        best_iteration = None
+        completed = 0
+        last_improvement = 0
+        stop_reason = 'max_iterations'
+        iteration_profiles = []
+        
+        executor = ProcessPoolExecutor(max_workers=self.PARALLEL_WORKERS,
+                                       initializer=_init_iteration_worker,
+                                       initargs=(self.data, self.config, self.warm_start_classes))
+        try:
+            futures = {
+                executor.submit(_run_iteration_worker, iteration, base_seed + iteration): iteration
+                for iteration in range(1, self.MAX_ITERATIONS + 1)
+            }
+            
+            timeout = self.TIME_BUDGET_SECONDS if self.TIME_BUDGET_SECONDS > 0 else None
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    iteration = futures[future]
+                    completed += 1
+                    result, coverage, violations, workload_violations = future.result()
+                    iteration_profiles.append((iteration, result['statistics']['profile']))
+                    self.log.info("Iteration %s: %.1f%% coverage, %s violations, %s workload violations", iteration, coverage, violations, workload_violations)
+                    
+                    accepted = False
+                    if violations == 0 and workload_violations == 0:
+                        # Ties go to the lowest iteration so the outcome does not depend on completion order
+                        if coverage > best_coverage or (best_result and coverage == best_coverage and iteration < best_iteration):
+                            if coverage > best_coverage:
+                                last_improvement = completed
+                            best_result = result
+                            best_coverage = coverage
+                            best_iteration = iteration
+                            accepted = True
+                    
+                    # Records count completed iterations, which arrive out of order
+                    if (yield self._progress_record(completed, None, coverage, violations, workload_violations, accepted,
+                                                    best_coverage, best_result, start_time)):
+                        self.log.info("STOP: requested by the caller")
+                        stop_reason = 'stopped'
+                        break
+                    
+                    if violations == 0 and workload_violations == 0:
+                        if coverage >= 100.0:
+                            self.log.info("100% coverage with zero violations achieved - SUCCESS")
+                            stop_reason = 'perfect_coverage'
+                            break
+                        
+                        if best_coverage >= self.coverage_upper_bound:
+                            self.log.info("Best coverage %.1f%% meets the upper bound - no further improvement possible", best_coverage)
+                            stop_reason = 'upper_bound'
+                            break
+                    
+                    # Plateau is counted in completed iterations, which arrive out of order
+                    stop_reason = self._check_early_stop(start_time, completed, last_improvement) or stop_reason
+                    if stop_reason in ('time_budget', 'plateau'):
+                        break
+            except FuturesTimeoutError:
+                self.log.info("STOP: time budget of %ss reached", self.TIME_BUDGET_SECONDS)
+                stop_reason = 'time_budget'
+        finally:
+            # Do not wait for iterations still running once we have stopped
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if best_result:
+            self.log.info("Best VALID result from iteration %s: %.1f%%", best_iteration, best_coverage)
+        
+        yield self._final_record(self._finalize_result(best_result, {
+            'stop_reason': stop_reason,
+            'iterations_run': completed,
+            'elapsed_seconds': round(time.perf_counter() - start_time, 3),
+            'coverage_upper_bound': self.coverage_upper_bound,
+            'profile': self._summarize_profile(iteration_profiles)
+        }))
+    
+    def _finalize_result(self, best_result, run_info):
+        """Fall back to a best-effort result if needed and report the outcome"""
         # Return best valid result or fallback
         final_result = best_result if best_result else self._create_best_effort_strict_result()
         final_coverage = final_result['statistics']['coverage_percentage']
         
-        print(f"\nFINAL RESULT: {final_coverage:.1f}% coverage with strict workload limits")
+        # Record how the iteration loop ended (stop_reason, iterations_run, elapsed_seconds, coverage_upper_bound)
+        # and where the time went (profile)
+        final_result['statistics'].update(run_info)
+        self.log.info("Stopped after %s iterations: %s", run_info['iterations_run'], run_info['stop_reason'])
+        
+        self.log.info("FINAL RESULT: %.1f%% coverage with strict workload limits", final_coverage)
         
         if final_coverage >= 100.0:
-            print("SUCCESS: 100% coverage within strict workload limits")
+            self.log.info("SUCCESS: 100% coverage within strict workload limits")
         else:
             remaining = final_result['statistics']['total_students_required'] - final_result['statistics']['total_students_scheduled']
-            print(f"RESULT: {remaining} students unassigned due to strict workload constraints")
-            print("GUARANTEE: All workload limits strictly respected")
-            print("\nPossible solutions to improve coverage:")
-            print("1. Increase WEEKEND_DAILY_LIMIT (currently " + str(self.WEEKEND_DAILY_LIMIT) + ")")
-            print("2. Increase WEEKDAY_DAILY_LIMIT (currently " + str(self.WEEKDAY_DAILY_LIMIT) + ")")
-            print("3. Increase weekly limits (especially for full-time coaches)")
-            print("4. Adjust CONSECUTIVE_LIMIT to allow more classes in succession")
+            self.log.info("RESULT: %s students unassigned due to strict workload constraints", remaining)
+            self.log.info("GUARANTEE: All workload limits strictly respected")
+            self.log.info("Possible solutions to improve coverage:")
+            self.log.info("1. Increase WEEKEND_DAILY_LIMIT (currently %s)", self.WEEKEND_DAILY_LIMIT)
+            self.log.info("2. Increase WEEKDAY_DAILY_LIMIT (currently %s)", self.WEEKDAY_DAILY_LIMIT)
+            self.log.info("3. Increase weekly limits (especially for full-time coaches)")
+            self.log.info("4. Adjust CONSECUTIVE_LIMIT to allow more classes in succession")
         
         # Print detailed summary of the scheduling results
         self._print_scheduling_summary(final_result)
@@ -252,18 +689,19 @@ class EnhancedStrictConstraintScheduler:
     
     def _print_scheduling_summary(self, result):
         """Print comprehensive summary of scheduling results"""
-        print("\n" + "="*80)
-        print("SCHEDULING SUMMARY")
-        print("="*80)
+        if not self.log.isEnabledFor(logging.INFO):
+            return
+        
+        self.log.info("SCHEDULING SUMMARY")
         
         stats = result['statistics']
         schedule = result['schedule']
         
         # Overall statistics
-        print(f"Total Students Scheduled: {stats['total_students_scheduled']} of {stats['total_students_required']} ({stats['coverage_percentage']:.1f}%)")
-        print(f"Total Classes Scheduled: {stats['total_classes']}")
-        print(f"Popular Timeslots Used: {stats['popular_slots_used']} of {stats['total_slots']} classes ({stats['popular_slots_used']/max(1, stats['total_slots'])*100:.1f}%)")
-        print(f"Merged Classes: {stats['merged_classes']}")
+        self.log.info("Total Students Scheduled: %s of %s (%.1f%%)", stats['total_students_scheduled'], stats['total_students_required'], stats['coverage_percentage'])
+        self.log.info("Total Classes Scheduled: %s", stats['total_classes'])
+        self.log.info("Popular Timeslots Used: %s of %s classes (%.1f%%)", stats['popular_slots_used'], stats['total_slots'], stats['popular_slots_used']/max(1, stats['total_slots'])*100)
+        self.log.info("Merged Classes: %s", stats['merged_classes'])
         
         # Branch distribution
         branch_classes = {}
@@ -276,11 +714,11 @@ class EnhancedStrictConstraintScheduler:
             branch_classes[branch] += 1
             branch_students[branch] += entry['Students']
         
-        print("\nBranch Distribution:")
+        self.log.info("Branch Distribution:")
         for branch in sorted(branch_classes.keys()):
             class_count = branch_classes[branch]
             student_count = branch_students[branch]
-            print(f"  {branch}: {class_count} classes, {student_count} students")
+            self.log.info("  %s: %s classes, %s students", branch, class_count, student_count)
         
         # Coach utilization
         coach_usage = {}
@@ -317,18 +755,18 @@ class EnhancedStrictConstraintScheduler:
         part_time_coaches.sort(key=lambda x: x[1]['classes'], reverse=True)
         branch_managers.sort(key=lambda x: x[1]['classes'], reverse=True)
         
-        print("\nCoach Utilization:")
-        print("  Full Time Coaches:")
+        self.log.info("Coach Utilization:")
+        self.log.info("  Full Time Coaches:")
         for coach_id, data in full_time_coaches:
-            print(f"    {data['name']} (ID {coach_id}): {data['classes']} classes, {data['students']} students")
+            self.log.info("    %s (ID %s): %s classes, %s students", data['name'], coach_id, data['classes'], data['students'])
         
-        print("  Part Time Coaches:")
+        self.log.info("  Part Time Coaches:")
         for coach_id, data in part_time_coaches:
-            print(f"    {data['name']} (ID {coach_id}): {data['classes']} classes, {data['students']} students")
+            self.log.info("    %s (ID %s): %s classes, %s students", data['name'], coach_id, data['classes'], data['students'])
         
-        print("  Branch Managers:")
+        self.log.info("  Branch Managers:")
         for coach_id, data in branch_managers:
-            print(f"    {data['name']} (ID {coach_id}): {data['classes']} classes, {data['students']} students")
+            self.log.info("    %s (ID %s): %s classes, %s students", data['name'], coach_id, data['classes'], data['students'])
         
         # Level distribution
         level_distribution = {}
@@ -339,10 +777,10 @@ class EnhancedStrictConstraintScheduler:
             level_distribution[level]['classes'] += 1
             level_distribution[level]['students'] += entry['Students']
         
-        print("\nLevel Distribution:")
+        self.log.info("Level Distribution:")
         for level in self.level_hierarchy:
             if level in level_distribution:
-                print(f"  {level}: {level_distribution[level]['classes']} classes, {level_distribution[level]['students']} students")
+                self.log.info("  %s: %s classes, %s students", level, level_distribution[level]['classes'], level_distribution[level]['students'])
         
         # Day distribution
         day_distribution = {}
@@ -353,9 +791,9 @@ class EnhancedStrictConstraintScheduler:
             day_distribution[day]['classes'] += 1
             day_distribution[day]['students'] += entry['Students']
         
-        print("\nDay Distribution:")
+        self.log.info("Day Distribution:")
         for day in sorted(day_distribution.keys()):
-            print(f"  {day}: {day_distribution[day]['classes']} classes, {day_distribution[day]['students']} students")
+            self.log.info("  %s: %s classes, %s students", day, day_distribution[day]['classes'], day_distribution[day]['students'])
         
         # Calculate time distribution
         morning_classes = 0
@@ -373,23 +811,21 @@ class EnhancedStrictConstraintScheduler:
             else:
                 evening_classes += 1
         
-        print("\nTime Distribution:")
-        print(f"  Morning (before 12PM): {morning_classes} classes")
-        print(f"  Afternoon (12-5PM): {afternoon_classes} classes")
-        print(f"  Evening (after 5PM): {evening_classes} classes")
+        self.log.info("Time Distribution:")
+        self.log.info("  Morning (before 12PM): %s classes", morning_classes)
+        self.log.info("  Afternoon (12-5PM): %s classes", afternoon_classes)
+        self.log.info("  Evening (after 5PM): %s classes", evening_classes)
         
         # Check for same-program back-to-back classes on weekday mornings
         same_program_b2b = self._count_same_program_back_to_back(schedule)
         if same_program_b2b:
-            print("\nSame Program Back-to-Back Classes on Weekday Mornings:")
+            self.log.info("Same Program Back-to-Back Classes on Weekday Mornings:")
             for item in same_program_b2b[:5]:  # Show top 5
                 branch, day, program, start_times = item
-                print(f"  {branch} {day}: {program} program at {', '.join(start_times)}")
+                self.log.info("  %s %s: %s program at %s", branch, day, program, ', '.join(start_times))
             
             if len(same_program_b2b) > 5:
-                print(f"  ...and {len(same_program_b2b) - 5} more instances")
-        
-        print("="*80)
+                self.log.info("  ...and %s more instances", len(same_program_b2b) - 5)
     
     def _count_same_program_back_to_back(self, schedule):
         """Count instances of same program back-to-back classes on weekday mornings"""
@@ -453,6 +889,68 @@ class EnhancedStrictConstraintScheduler:
         average_class_capacity = sum(self.class_capacities.values()) / len(self.class_capacities)
         return int(total_capacity * average_class_capacity)
     
+    def _calculate_coverage_upper_bound(self):
+        """
+        Exact coverage bound (percentage) from a max-flow relaxation of the problem
+        
+        Network: source -> requirement (students) -> (coach, day) -> coach -> sink.
+        A (coach, day) node carries at most its daily class limit and a coach node
+        its weekly limit, each times the largest class the coach could teach. A
+        requirement connects to every (coach, day) with a candidate at its branch
+        for a merge-compatible level, since phase 3 can seat students in those classes.
+        Warm-start classes are pinned even outside popular slots, so their assignments
+        join the pool. Branch capacity and one-branch-per-day are relaxed, so the bound
+        never undercuts what an iteration can reach.
+        """
+        if self.total_students_required == 0:
+            return 100.0
+        
+        # Candidate facts per (coach, day) from the pool the phases actually use, plus pinned classes
+        pinned_assignments = [assignment for _, assignment in self._warm_start_matches if assignment is not None]
+        coach_day_levels = defaultdict(set)
+        coach_day_min_duration = {}
+        coach_day_branch_levels = defaultdict(set)
+        for assignment in chain(self.popular_assignments, pinned_assignments):
+            coach_day = (assignment.coach_id, assignment.day)
+            coach_day_levels[coach_day].add(assignment.level)
+            coach_day_branch_levels[(assignment.branch, assignment.level)].add(coach_day)
+            coach_day_min_duration[coach_day] = min(coach_day_min_duration.get(coach_day, assignment.duration),
+                                                    assignment.duration)
+        
+        capacity = defaultdict(dict)
+        coach_max_class = defaultdict(int)
+        
+        for (coach_id, day), levels in coach_day_levels.items():
+            # Multi-level classes (phase 4) take the larger capacity of the merged levels
+            max_class = max(self.class_capacities.get(class_level, 8)
+                            for class_level in self.level_hierarchy + list(levels)
+                            if any(self._check_level_compatibility(class_level, level) for level in levels))
+            coach_max_class[coach_id] = max(coach_max_class[coach_id], max_class)
+            
+            class_limit = self.WEEKEND_DAILY_LIMIT if day in self.weekends else self.WEEKDAY_DAILY_LIMIT
+            hours_limit = self.WEEKEND_DAILY_HOURS if day in self.weekends else self.WEEKDAY_DAILY_HOURS
+            daily_classes = min(class_limit, hours_limit // coach_day_min_duration[(coach_id, day)])
+            capacity[('coach_day', coach_id, day)][('coach', coach_id)] = daily_classes * max_class
+        
+        for coach_id, max_class in coach_max_class.items():
+            weekly_limit = self._get_coach_weekly_limit(self.coaches_data[coach_id])
+            capacity[('coach', coach_id)]['sink'] = weekly_limit * max_class
+        
+        for (branch, level), students in self.enrollment_dict.items():
+            if students <= 0:
+                continue
+            requirement = ('requirement', branch, level)
+            capacity['source'][requirement] = students
+            
+            for class_level in self.level_hierarchy + [level]:
+                if not self._check_level_compatibility(class_level, level):
+                    continue
+                for coach_id, day in coach_day_branch_levels.get((branch, class_level), ()):
+                    capacity[requirement][('coach_day', coach_id, day)] = students
+        
+        max_students = _max_flow(capacity, 'source', 'sink')
+        return min(100.0, max_students / self.total_students_required * 100)
+    
     def _get_coach_weekly_limit(self, coach):
         """Get weekly class limit based on coach type"""
         status = coach['status']
@@ -471,7 +969,7 @@ class EnhancedStrictConstraintScheduler:
             'coach_daily_hours': defaultdict(lambda: defaultdict(int)),
             'coach_daily_classes': defaultdict(lambda: defaultdict(int)),
             'coach_branch_daily': defaultdict(lambda: defaultdict(str)),
-            'branch_time_usage': defaultdict(lambda: defaultdict(lambda: defaultdict(int))),
+            'grid': self._empty_grid.copy(),
             'requirement_coverage': defaultdict(int),
             'coach_workload': defaultdict(int),
             'coach_levels_taught': defaultdict(set),  # Track diversity of levels taught
@@ -479,21 +977,29 @@ class EnhancedStrictConstraintScheduler:
             'critical_gaps': [],
             'resource_utilization': defaultdict(float),
             'assignment_attempts': defaultdict(int),
-            'coach_program_morning_classes': defaultdict(lambda: defaultdict(lambda: defaultdict(list)))  # Track morning program classes
+            'coach_program_morning_classes': defaultdict(lambda: defaultdict(lambda: defaultdict(list))),  # Track morning program classes
+            'open_classes': defaultdict(list),  # (branch, level) -> heap of classes with spare capacity, for phase 3
+            'class_seq': {},  # id(class record) -> commit order, while committed
+            'class_counter': count(),
+            'counters': {'candidates_scanned': 0, 'validations': 0, 'assignments_added': 0},  # Work done, for the profile
+            'profile': {}  # Per-phase wall time and counter deltas for this iteration
         }
     
-    def _phase1_enhanced_systematic(self, state, assignment_pool):
+    def _phase1_enhanced_systematic(self, state, candidate_index):
         """Phase 1: Systematic assignment by priority with strict constraint enforcement"""
-        print("Phase 1: Enhanced systematic assignment (strict workload limits)")
+        self.log.debug("Phase 1: Enhanced systematic assignment (strict workload limits)")
         
         sorted_requirements = self._get_enhanced_priority_requirements()
         
         for req_key, requirement in sorted_requirements:
             branch, level = req_key
-            students_needed = requirement['students']
+            # Less than the enrollment when a warm start already covers part of it
+            students_needed = state['unassigned_students'][req_key]
+            if students_needed <= 0:
+                continue
             max_capacity = self.class_capacities.get(level, 8)
             
-            print(f"  Processing {branch} {level}: {students_needed} students")
+            self.log.debug("  Processing %s %s: %s students", branch, level, students_needed)
             
             students_assigned = 0
             qualified_coaches = self._get_prioritized_coaches(branch, level)
@@ -501,10 +1007,10 @@ class EnhancedStrictConstraintScheduler:
             
             while students_assigned < students_needed and attempts < self.MAX_ASSIGNMENT_ATTEMPTS:
                 attempts += 1
-                assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, assignment_pool)
+                assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, candidate_index)
                 
                 if not assignment:
-                    print(f"    No valid assignment found on attempt {attempts} (strict limits)")
+                    self.log.debug("    No valid assignment found on attempt %s (strict limits)", attempts)
                     break
                 
                 remaining_students = students_needed - students_assigned
@@ -513,28 +1019,28 @@ class EnhancedStrictConstraintScheduler:
                 if self._add_validated_assignment_strict(assignment, class_size, state):
                     students_assigned += class_size
                     state['unassigned_students'][req_key] = students_needed - students_assigned
-                    print(f"    Class added: {class_size} students, Coach {assignment['coach_name']}")
+                    self.log.debug("    Class added: %s students, Coach %s", class_size, self.coaches_data[assignment.coach_id]['name'])
                 else:
-                    print(f"    Failed to add assignment (strict limits enforced)")
+                    self.log.debug("    Failed to add assignment (strict limits enforced)")
             
             if students_assigned > 0:
                 coverage_rate = (students_assigned / students_needed * 100)
-                print(f"    Coverage: {students_assigned}/{students_needed} ({coverage_rate:.1f}%)")
+                self.log.debug("    Coverage: %s/%s (%.1f%%)", students_assigned, students_needed, coverage_rate)
             else:
-                print(f"    CONSTRAINT LIMITED: No students assigned for {branch} {level}")
+                self.log.debug("    CONSTRAINT LIMITED: No students assigned for %s %s", branch, level)
                 state['critical_gaps'].append(req_key)
         
         total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
         coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 1 Complete: {coverage:.1f}% total coverage")
+        self.log.info("  Phase 1 Complete: %.1f%% total coverage", coverage)
     
-    def _phase2_enhanced_gap_filling(self, state, assignment_pool):
+    def _phase2_enhanced_gap_filling(self, state, candidate_index):
         """Phase 2: Fill remaining gaps with additional classes"""
-        print("Phase 2: Enhanced gap filling (strict workload limits)")
+        self.log.debug("Phase 2: Enhanced gap filling (strict workload limits)")
         
         gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
         if not gaps:
-            print("  No gaps to fill")
+            self.log.debug("  No gaps to fill")
             return
         
         # Sort gaps by urgency (size and scarcity)
@@ -542,7 +1048,7 @@ class EnhancedStrictConstraintScheduler:
         
         for req_key, gap_size in gaps:
             branch, level = req_key
-            print(f"  Filling gap: {branch} {level} - {gap_size} students")
+            self.log.debug("  Filling gap: %s %s - %s students", branch, level, gap_size)
             
             all_qualified = self._get_all_qualified_coaches(branch, level)
             students_filled = 0
@@ -551,7 +1057,7 @@ class EnhancedStrictConstraintScheduler:
                 if students_filled >= gap_size:
                     break
                 
-                assignment = self._find_specific_coach_assignment_strict(coach['id'], branch, level, state, assignment_pool)
+                assignment = self._find_specific_coach_assignment_strict(coach['id'], branch, level, state, candidate_index)
                 if assignment:
                     max_capacity = self.class_capacities.get(level, 8)
                     class_size = min(gap_size - students_filled, max_capacity)
@@ -559,76 +1065,58 @@ class EnhancedStrictConstraintScheduler:
                     if self._add_validated_assignment_strict(assignment, class_size, state):
                         students_filled += class_size
                         state['unassigned_students'][req_key] -= class_size
-                        print(f"    Gap filled: {class_size} students, Coach {coach['name']}")
+                        self.log.debug("    Gap filled: %s students, Coach %s", class_size, coach['name'])
             
             if students_filled == 0:
-                print(f"    CONSTRAINT LIMITED: Could not fill gap for {branch} {level}")
+                self.log.debug("    CONSTRAINT LIMITED: Could not fill gap for %s %s", branch, level)
         
         total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
         coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 2 Complete: {coverage:.1f}% total coverage")
+        self.log.info("  Phase 2 Complete: %.1f%% total coverage", coverage)
     
     def _phase3_enhanced_merging(self, state):
         """Phase 3: Merge students from different levels into existing classes"""
-        print("Phase 3: Enhanced merging")
+        self.log.debug("Phase 3: Enhanced merging")
         
         gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
         if not gaps:
-            print("  No gaps requiring merging")
+            self.log.debug("  No gaps requiring merging")
             return
         
         for req_key, gap_size in gaps:
             branch, level = req_key
-            print(f"  Merging for {branch} {level}: {gap_size} students")
-            
-            # Find compatible existing classes with available capacity
-            compatible_classes = []
-            for assignment in state['selected_assignments']:
-                if (assignment['branch'] == branch and 
-                    self._check_level_compatibility(assignment['level'], level)):
-                    
-                    current_students = assignment['actual_students']
-                    max_capacity = self.class_capacities.get(assignment['level'], 8)
-                    available_space = max_capacity - current_students
-                    
-                    if available_space > 0:
-                        compatible_classes.append((assignment, available_space))
-            
-            # Sort by available space (largest first)
-            compatible_classes.sort(key=lambda x: x[1], reverse=True)
+            self.log.debug("  Merging for %s %s: %s students", branch, level, gap_size)
             
+            # Fill compatible classes at the branch, most available space first (oldest first on ties)
             students_merged = 0
-            for assignment, available_space in compatible_classes:
-                if students_merged >= gap_size:
+            while students_merged < gap_size:
+                open_class = self._pop_open_class(branch, level, state)
+                if open_class is None:
                     break
                 
+                assignment, available_space = open_class
                 merge_size = min(gap_size - students_merged, available_space)
-                
-                if merge_size > 0:
-                    new_total = assignment['actual_students'] + merge_size
-                    max_capacity = self.class_capacities.get(assignment['level'], 8)
-                    
-                    if new_total <= max_capacity:
-                        assignment['actual_students'] += merge_size
-                        students_merged += merge_size
-                        self._update_merge_info(assignment, level)
-                        print(f"    Merged {merge_size}: {assignment['level']}+{level}")
+                assignment['actual_students'] += merge_size
+                students_merged += merge_size
+                self._update_merge_info(assignment, level)
+                self._index_open_class(assignment, state)
+                self.log.debug("    Merged %s: %s+%s", merge_size, assignment['level'], level)
             
             if students_merged > 0:
                 state['unassigned_students'][req_key] -= students_merged
-                print(f"  Merge progress: {students_merged}/{gap_size} students merged")
+                self.log.debug("  Merge progress: %s/%s students merged", students_merged, gap_size)
         
         total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
         coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 3 Complete: {coverage:.1f}% total coverage")
+        self.log.info("  Phase 3 Complete: %.1f%% total coverage", coverage)
     
-    def _phase4_multi_level_merging(self, state, assignment_pool):
+    def _phase4_multi_level_merging(self, state, candidate_index):
         """Phase 4: Create new classes combining multiple levels"""
-        print("Phase 4: Multi-level merging")
+        self.log.debug("Phase 4: Multi-level merging")
         
         gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
         if not gaps:
-            print("  No gaps requiring multi-level merging")
+            self.log.debug("  No gaps requiring multi-level merging")
             return
         
         # Group gaps by branch for efficient processing
@@ -638,43 +1126,47 @@ class EnhancedStrictConstraintScheduler:
             branch_gaps[branch].append((level, gap_size))
         
         for branch, level_gaps in branch_gaps.items():
-            print(f"  Multi-level merging for branch {branch}")
+            self.log.debug("  Multi-level merging for branch %s", branch)
             
             level_combinations = self._generate_level_combinations(level_gaps)
             
-            for levels, total_students in level_combinations:
+            for levels, _ in level_combinations:
+                # Use current gaps - an earlier combination may already have taken these students
+                total_students = sum(state['unassigned_students'].get((branch, level), 0) for level in levels)
                 if total_students < self.MIN_MERGE_SIZE:
                     continue
                 
                 qualified_coaches = self._find_multi_qualified_coaches(branch, levels)
                 
                 for coach in qualified_coaches:
-                    assignment = self._find_specific_coach_assignment_strict(coach['id'], branch, levels[0], state, assignment_pool)
+                    assignment = self._find_specific_coach_assignment_strict(coach['id'], branch, levels[0], state, candidate_index)
                     
                     if assignment:
                         max_capacity = max(self.class_capacities.get(level, 8) for level in levels)
                         class_size = min(total_students, max_capacity)
                         
                         if self._add_validated_assignment_strict(assignment, class_size, state):
-                            self._distribute_students_across_levels(levels, level_gaps, class_size, state)
-                            assignment['merged_levels'] = levels
-                            assignment['merged'] = 'Yes'
-                            assignment['merged_with'] = '+'.join(sorted(levels))
+                            self._distribute_students_across_levels(branch, levels, class_size, state)
+                            # Tag the new class, not the shared pool entry it was built from
+                            record = state['selected_assignments'][-1]
+                            record['merged_levels'] = levels
+                            record['merged'] = 'Yes'
+                            record['merged_with'] = '+'.join(sorted(levels))
                             
-                            print(f"    Multi-level class: {'+'.join(levels)} - {class_size} students")
+                            self.log.debug("    Multi-level class: %s - %s students", '+'.join(levels), class_size)
                             break
         
         total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
         coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 4 Complete: {coverage:.1f}% total coverage")
+        self.log.info("  Phase 4 Complete: %.1f%% total coverage", coverage)
     
-    def _phase5_exhaustive_assignment(self, state, assignment_pool):
+    def _phase5_exhaustive_assignment(self, state, candidate_index):
         """Phase 5: Use every available coach slot within strict limits"""
-        print("Phase 5: Exhaustive assignment (strict limits enforced)")
+        self.log.debug("Phase 5: Exhaustive assignment (strict limits enforced)")
         
         gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
         if not gaps:
-            print("  No gaps requiring exhaustive assignment")
+            self.log.debug("  No gaps requiring exhaustive assignment")
             return
         
         for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
@@ -685,15 +1177,16 @@ class EnhancedStrictConstraintScheduler:
                 max_classes = self.WEEKEND_DAILY_LIMIT if day in self.weekends else self.WEEKDAY_DAILY_LIMIT
                 
                 if current_classes < max_classes:
-                    for req_key, gap_size in gaps:
+                    for req_key, _ in gaps:
                         branch, level = req_key
+                        gap_size = state['unassigned_students'][req_key]
                         
                         if (gap_size > 0 and 
                             level in coach['qualifications'] and 
                             branch in coach['branches']):
                             
                             assignment = self._find_specific_coach_day_assignment_strict(
-                                coach_id, branch, level, day, state, assignment_pool
+                                coach_id, branch, level, day, state, candidate_index
                             )
                             
                             if assignment:
@@ -702,23 +1195,23 @@ class EnhancedStrictConstraintScheduler:
                                 
                                 if self._add_validated_assignment_strict(assignment, class_size, state):
                                     state['unassigned_students'][req_key] -= class_size
-                                    print(f"    Exhaustive class: {class_size} students, Coach {coach['name']} on {day}")
+                                    self.log.debug("    Exhaustive class: %s students, Coach %s on %s", class_size, coach['name'], day)
                                     break
         
         total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
         coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 5 Complete: {coverage:.1f}% total coverage")
+        self.log.info("  Phase 5 Complete: %.1f%% total coverage", coverage)
     
-    def _phase6_maximum_utilization_strict(self, state, assignment_pool):
+    def _phase6_maximum_utilization_strict(self, state, candidate_index):
         """Phase 6: Final optimization to maximize utilization within strict limits"""
-        print("Phase 6: Maximum utilization (strict limits)")
+        self.log.debug("Phase 6: Maximum utilization (strict limits)")
         
         gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
         if not gaps:
-            print("  No gaps - maximum coverage achieved within strict limits")
+            self.log.debug("  No gaps - maximum coverage achieved within strict limits")
             return
         
-        print(f"  Final optimization for {len(gaps)} remaining gaps")
+        self.log.debug("  Final optimization for %s remaining gaps", len(gaps))
         
         # Final push: use every remaining slot within strict limits
         for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
@@ -731,7 +1224,8 @@ class EnhancedStrictConstraintScheduler:
                 while current_classes < max_classes:
                     assignment_added = False
                     
-                    for req_key, gap_size in gaps:
+                    for req_key, _ in gaps:
+                        gap_size = state['unassigned_students'][req_key]
                         if gap_size <= 0:
                             continue
                             
@@ -741,7 +1235,7 @@ class EnhancedStrictConstraintScheduler:
                             branch in coach['branches']):
                             
                             assignment = self._find_specific_coach_day_assignment_strict(
-                                coach_id, branch, level, day, state, assignment_pool
+                                coach_id, branch, level, day, state, candidate_index
                             )
                             
                             if assignment:
@@ -752,7 +1246,7 @@ class EnhancedStrictConstraintScheduler:
                                     state['unassigned_students'][req_key] -= class_size
                                     current_classes += 1
                                     assignment_added = True
-                                    print(f"    Max utilization: {class_size} students, Coach {coach['name']} {day}")
+                                    self.log.debug("    Max utilization: %s students, Coach %s %s", class_size, coach['name'], day)
                                     break
                     
                     if not assignment_added:
@@ -760,116 +1254,492 @@ class EnhancedStrictConstraintScheduler:
         
         total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
         coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 6 Complete: {coverage:.1f}% total coverage")
+        self.log.info("  Phase 6 Complete: %.1f%% total coverage", coverage)
         
         # Final gap report
         remaining_gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
         if remaining_gaps:
             total_unassigned = sum(gap for _, gap in remaining_gaps)
-            print(f"  {total_unassigned} students remain unassigned due to strict workload limits")
+            self.log.info("  %s students remain unassigned due to strict workload limits", total_unassigned)
             for req_key, gap in remaining_gaps[:5]:
-                print(f"    CONSTRAINED: {req_key[0]} {req_key[1]} - {gap} students")
+                self.log.debug("    CONSTRAINED: %s %s - %s students", req_key[0], req_key[1], gap)
         else:
-            print("  100% ASSIGNMENT ACHIEVED within strict workload limits")
+            self.log.info("  100% ASSIGNMENT ACHIEVED within strict workload limits")
     
-    # ==================== ASSIGNMENT SCORING AND SELECTION ====================
-    
-    def _score_assignment_enhanced(self, assignment, state):
-        """Score assignment based on configured preferences (1-10 scale)"""
-        score = 0
+    def _phase7_local_search(self, state, candidate_index):
+        """Phase 7: Simulated-annealing local search to open room for remaining gaps"""
+        self.log.debug("Phase 7: Local search improvement")
         
-        # Time preferences (using internal fixed values)
-        start_hour = int(assignment['start_time'].split(':')[0])
-        if 10 <= start_hour <= 15:
-            score += self._PEAK_HOURS_BONUS
-        elif 9 <= start_hour <= 17:
-            score += self._GOOD_HOURS_BONUS
+        if self.LOCAL_SEARCH_STEPS <= 0:
+            self.log.debug("  Local search disabled")
+            return
         
-        # Day preferences (using 1-10 scale)
-        if assignment['day'] in self.weekends:
-            score += self.WEEKEND_BIAS
+        gaps = [k for k, v in state['unassigned_students'].items() if v > 0]
+        if not gaps:
+            self.log.debug("  No gaps - local search skipped")
+            return
+        
+        moves = (self._relocate_placements, self._swap_coach_placements, self._swap_timeslot_placements)
+        
+        # Moves kept since the best state; undone at the end if the search drifted below it
+        kept_moves = []
+        gain = best_gain = 0
+        
+        for step in range(self.LOCAL_SEARCH_STEPS):
+            gaps = [k for k, v in state['unassigned_students'].items() if v > 0]
+            if not gaps:
+                break
+            
+            req_key = random.choice(gaps)
+            
+            # Pick a slot the gap could use and move one of the classes blocking it
+            target = self._pick_gap_candidate(req_key, candidate_index)
+            if target is None:
+                continue
+            
+            blockers = self._find_blocking_classes(target, state)
+            record = random.choice(blockers) if blockers else None
+            
+            removed, added, dropped, filled = [], [], [], []
+            if record is not None:
+                coach = self.coaches_data[target.coach_id]
+                if (record['coach_id'] == coach['id'] and
+                        state['coach_workload'][coach['id']] >= self._get_coach_weekly_limit(coach)):
+                    # Only another coach can take load off a coach at the weekly limit
+                    placements = self._swap_coach_placements(record, state, candidate_index)
+                else:
+                    placements = random.choice(moves)(record, state, candidate_index)
+                
+                placed = self._apply_move(placements, state)
+                if placed is not None:
+                    removed, added = placed
+                elif len(record.get('merged_levels', [])) <= 1:
+                    # No valid placement - drop the class and try to re-home its students below
+                    self._release_assignment_record(record, state)
+                    state['unassigned_students'][(record['branch'], record['level'])] += record['actual_students']
+                    dropped.append(record)
+                else:
+                    continue
+            
+            for key in [req_key] + [(r['branch'], r['level']) for r in dropped]:
+                new_class = self._fill_gap_once(key, state, candidate_index)
+                if new_class is not None:
+                    filled.append(new_class)
+            
+            move = (removed, added, dropped, filled)
+            delta = sum(r['actual_students'] for r in filled) - sum(r['actual_students'] for r in dropped)
+            
+            # Metropolis rule; the extra unit charges every non-improving move for disturbing
+            # the greedy layout, and the temperature cools linearly to zero
+            temperature = self._LOCAL_SEARCH_TEMPERATURE * (1 - step / self.LOCAL_SEARCH_STEPS)
+            if delta > 0 or (temperature > 0 and random.random() < math.exp((delta - 1) / temperature)):
+                kept_moves.append(move)
+                gain += delta
+                if gain > best_gain:
+                    best_gain = gain
+                    kept_moves = []
+            else:
+                self._undo_move(move, state)
+        
+        for move in reversed(kept_moves):
+            self._undo_move(move, state)
+        
+        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
+        coverage = (total_scheduled / self.total_students_required * 100)
+        self.log.info("  Phase 7 Complete: %.1f%% total coverage (%s students gained)", coverage, best_gain)
+    
+    # ==================== COMPONENT DECOMPOSITION ====================
+    
+    def _find_components(self):
+        """
+        Connected components of the coach-branch graph, as (branches, coach_ids) pairs, largest first
+        
+        A coach is linked to every branch they have a feasible assignment at. Workload limits,
+        branch slots and merges never reach across components, so each one can be scheduled
+        on its own. Branches nobody can teach at belong to no component.
+        """
+        coach_branches = defaultdict(set)
+        branch_coaches = defaultdict(set)
+        for assignment in self.feasible_assignments:
+            coach_branches[assignment.coach_id].add(assignment.branch)
+            branch_coaches[assignment.branch].add(assignment.coach_id)
+        
+        components = []
+        seen = set()
+        for start in sorted(branch_coaches):
+            if start in seen:
+                continue
+            seen.add(start)
+            branches, coach_ids = set(), set()
+            pending = [start]
+            while pending:
+                branch = pending.pop()
+                branches.add(branch)
+                for coach_id in branch_coaches[branch] - coach_ids:
+                    coach_ids.add(coach_id)
+                    for other in coach_branches[coach_id] - seen:
+                        seen.add(other)
+                        pending.append(other)
+            components.append((branches, coach_ids))
+        
+        components.sort(key=lambda component: (-len(component[0]) - len(component[1]), min(component[0])))
+        return components
+    
+    def _component_data(self, branches, coach_ids, feasible_assignments, popular_assignments):
+        """
+        The parts of the data package a scheduler for one component needs
+        
+        The component keeps its share of this scheduler's pool, even when that share is empty
+        (a component with only warm-start classes), instead of choosing a pool of its own.
+        """
+        return {
+            'enrollment_dict': {req_key: students for req_key, students in self.enrollment_dict.items()
+                                if req_key[0] in branches},
+            'coaches_data': {coach_id: coach for coach_id, coach in self.coaches_data.items() if coach_id in coach_ids},
+            'feasible_assignments': feasible_assignments,
+            'popular_assignments': popular_assignments,
+            'class_capacities': self.class_capacities,
+            'branch_limits': {branch: limit for branch, limit in self.branch_limits.items() if branch in branches},
+            'weekdays': self.weekdays,
+            'weekends': self.weekends,
+            'all_branches': [branch for branch in self.data['all_branches'] if branch in branches]
+        }
+    
+    def _iter_components(self, components):
+        """Schedule each coach-branch component with its own scheduler and merge the results"""
+        self.log.info("Scheduling %s independent coach-branch components", len(components))
+        start_time = time.perf_counter()
+        
+        # Split the candidate pool, the popular pool and the warm start classes by component in one pass each
+        component_of = {branch: i for i, (branches, _) in enumerate(components) for branch in branches}
+        feasible = [[] for _ in components]
+        for assignment in self.feasible_assignments:
+            feasible[component_of[assignment.branch]].append(assignment)
+        popular = [[] for _ in components]
+        for assignment in self.popular_assignments:
+            popular[component_of[assignment.branch]].append(assignment)
+        pool_sizes = [len(pool) for pool in popular]
+        warm_start = [[] for _ in components]
+        outside = []
+        for pinned in self.warm_start_classes:
+            if pinned['branch'] in component_of:
+                warm_start[component_of[pinned['branch']]].append(pinned)
+            else:
+                outside.append(dict(pinned, reason='unavailable'))
+        
+        # Components without candidates have nothing to schedule
+        tasks = [i for i in range(len(components)) if pool_sizes[i] or warm_start[i]]
+        
+        component_config = dict(self.config, decompose_components=False, parallel_workers=1)
+        # Run-level warnings were already logged for the whole data set
+        component_config['log_level'] = self.log.level if self.log.level < logging.WARNING else logging.ERROR
+        
+        def task_args(i):
+            config = component_config
+            if self.TIME_BUDGET_SECONDS > 0:
+                # Share the budget by candidate count, which is what the phases spend their time on. A
+                # component budget of 0 would mean no limit, so every component gets at least a small share.
+                share = self.TIME_BUDGET_SECONDS * pool_sizes[i] / len(self.popular_assignments)
+                config = dict(component_config, time_budget_seconds=max(share, self._MIN_COMPONENT_BUDGET_SECONDS))
+            branches, coach_ids = components[i]
+            return self._component_data(branches, coach_ids, feasible[i], popular[i]), config, warm_start[i]
+        
+        results = {}
+        iterations = 0
+        stop = False
+        if self.PARALLEL_WORKERS > 1:
+            # Workers report whole components, so there is one progress record per component
+            self.log.info("Running components across %s worker processes", self.PARALLEL_WORKERS)
+            base_seed = random.randrange(2**32)
+            executor = ProcessPoolExecutor(max_workers=self.PARALLEL_WORKERS)
+            try:
+                futures = {executor.submit(_schedule_component_worker, *task_args(i), base_seed + i): i for i in tasks}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    result = results[i] = future.result()
+                    iterations += result['statistics']['iterations_run']
+                    coverage = result['statistics']['coverage_percentage']
+                    stop = yield self._progress_record(iterations, i, coverage, *self._count_violations(result), True,
+                                                       coverage, result, start_time)
+                    if stop:
+                        break
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
         else:
-            score += self.WEEKDAY_BIAS
+            for i in tasks:
+                data, config, pinned = task_args(i)
+                generator = EnhancedStrictConstraintScheduler(data, config, pinned).iter_schedule()
+                progress = next(generator)
+                while not progress['final']:
+                    iterations += 1
+                    stop = yield dict(progress, iteration=iterations, component=i,
+                                      elapsed_seconds=round(time.perf_counter() - start_time, 3))
+                    # Passing the stop request on makes the component finish with its best result
+                    progress = generator.send(stop)
+                results[i] = progress['result']
+                if stop:
+                    break
         
-        # Coach workload balance - only for full-time coaches (using 1-10 scale)
-        coach_id = assignment['coach_id']
-        coach = self.coaches_data.get(coach_id)
+        if stop:
+            self.log.info("STOP: requested by the caller")
         
-        if coach and coach['status'] == 'Full Time':
-            coach_load = state['coach_workload'][coach_id]
-            if coach_load < 5:
-                score += self.UNDERUTILIZED_COACH_BONUS
+        yield self._final_record(self._finalize_result(self._merge_component_results(components, results, outside, set(tasks) - set(results)), {
+            'stop_reason': 'stopped' if stop else self._merged_stop_reason(results),
+            'iterations_run': sum(result['statistics']['iterations_run'] for result in results.values()),
+            'elapsed_seconds': round(time.perf_counter() - start_time, 3),
+            'coverage_upper_bound': self.coverage_upper_bound,
+            'profile': self._merge_component_profiles(results)
+        }))
+    
+    def _merge_component_results(self, components, results, outside_warm_start, unfinished=()):
+        """Combine the component schedules into one result with statistics over the whole data set"""
+        result = self._result_from_schedule([entry for i in sorted(results) for entry in results[i]['schedule']])
+        
+        general, workload = self._count_violations(result)
+        if general or workload:
+            self.log.warning("Merged component schedules have %s constraint violations", general + workload)
+        
+        result['statistics']['components'] = []
+        for i, (branches, coach_ids) in enumerate(components):
+            statistics = results[i]['statistics'] if i in results else None
+            required = sum(students for (branch, _), students in self.enrollment_dict.items() if branch in branches)
+            result['statistics']['components'].append({
+                'branches': sorted(branches),
+                'coaches': len(coach_ids),
+                'total_students_required': required,
+                'total_students_scheduled': statistics['total_students_scheduled'] if statistics else 0,
+                'coverage_percentage': statistics['coverage_percentage'] if statistics else (100.0 if required == 0 else 0),
+                'stop_reason': statistics['stop_reason'] if statistics else ('stopped' if i in unfinished else 'no_candidates'),
+                'iterations_run': statistics['iterations_run'] if statistics else 0,
+                'elapsed_seconds': statistics['elapsed_seconds'] if statistics else 0
+            })
         
-        # Back-to-back (no turnaround) bonus for consecutive classes (using 1-10 scale)
-        if self._is_back_to_back_with_existing(assignment, state):
-            score += self.NO_TURNAROUND_BONUS
+        if self.warm_start_classes:
+            warm_starts = [results[i]['statistics'].get('warm_start') for i in sorted(results)]
+            result['statistics']['warm_start'] = {
+                'kept_classes': sum(w['kept_classes'] for w in warm_starts if w),
+                'invalidated': [pinned for w in warm_starts if w for pinned in w['invalidated']] + outside_warm_start
+            }
         
-        # Same program back-to-back penalty for weekday mornings
-        if self._would_create_same_program_back_to_back(assignment, state):
-            score -= self.SAME_PROGRAM_BACK_TO_BACK_PENALTY
+        return result
+    
+    def _merged_stop_reason(self, results):
+        """The components' common stop reason, or 'mixed' when they stopped for different reasons"""
+        reasons = {result['statistics']['stop_reason'] for result in results.values()}
+        return reasons.pop() if len(reasons) == 1 else 'mixed'
+    
+    def _merge_component_profiles(self, results):
+        """Add up the components' phase profiles; iterations are listed per component"""
+        phases = {}
+        iterations = []
+        for i in sorted(results):
+            profile = results[i]['statistics'].get('profile', {})
+            for name, entry in profile.get('phases', {}).items():
+                total = phases.setdefault(name, dict.fromkeys(entry, 0))
+                for key, value in entry.items():
+                    total[key] += value
+            iterations += [dict(iteration, component=i) for iteration in profile.get('iterations', [])]
+        for total in phases.values():
+            total['seconds'] = round(total['seconds'], 4)
         
-        # Diverse class bonus (using 1-10 scale)
-        if coach_id in state['coach_levels_taught'] and assignment['level'] not in state['coach_levels_taught'][coach_id]:
-            score += self.DIVERSE_CLASS_BONUS
+        return {
+            'data_processor': self.data.get('profile', {}),
+            'phases': phases,
+            'iterations': iterations
+        }
+    
+    # ==================== INCREMENTAL REPAIR ====================
+    
+    def repair_schedule(self, pinned_classes):
+        """
+        Reschedule only what an input change invalidated, keeping every other class in place
+        
+        pinned_classes are the classes of an existing timetable as dicts with coach_id, branch,
+        level, day and start_time ('HH:MM'). Classes that are no longer feasible, break a limit
+        or are no longer needed are dropped, then the open requirements are filled around the
+        classes that were kept in a single greedy pass.
+        """
+        self.log.info("Repairing timetable with %s existing classes", len(pinned_classes))
+        start_time = time.perf_counter()
         
-        # Capacity utilization (using fixed value)
-        score += assignment['capacity'] * self._CAPACITY_MULTIPLIER
+        state = self._initialize_enhanced_state()
+        candidate_index = self._build_candidate_index(self.popular_assignments)
+        
+        matched_classes = self._match_existing_classes(pinned_classes)
+        invalidated = self._profile_phase('warm_start', state, self._pin_existing_classes, matched_classes, state)
+        kept_classes = len(state['selected_assignments'])
+        self.log.info("  Kept %s classes, dropped %s", kept_classes, len(invalidated))
+        
+        # Put students of merged levels back into the kept classes before opening new ones
+        self._profile_phase('phase3_merging', state, self._phase3_enhanced_merging, state)
+        
+        affected = [req_key for req_key, _ in self._get_enhanced_priority_requirements()
+                    if state['unassigned_students'][req_key] > 0]
+        self._profile_phase('phase2_gap_filling', state, self._fill_gaps_in_order, affected, state, candidate_index)
+        self._profile_phase('phase4_multi_level', state, self._phase4_multi_level_merging, state, candidate_index)
+        self._profile_phase('phase3_merging', state, self._phase3_enhanced_merging, state)
+        
+        validation_start = time.perf_counter()
+        result = self._build_and_validate_result(state)
+        violations = self.validator.validate(result['schedule'])
+        state['profile']['validation'] = {'seconds': round(time.perf_counter() - validation_start, 4)}
+        if violations:
+            self.log.warning("Repaired timetable has %s constraint violations", len(violations))
+        result['statistics']['violations'] = violations
+        
+        result['statistics']['repair'] = {
+            'kept_classes': kept_classes,
+            'new_classes': len(state['selected_assignments']) - kept_classes,
+            'affected_requirements': len(affected),
+            'invalidated': invalidated
+        }
         
-        return score
+        return self._finalize_result(result, {
+            'stop_reason': 'repair',
+            'iterations_run': 1,
+            'elapsed_seconds': round(time.perf_counter() - start_time, 3),
+            'profile': self._summarize_profile([(1, state['profile'])])
+        })
+    
+    def _fill_gaps_in_order(self, requirements, state, candidate_index):
+        """Open classes for each requirement in turn until its gap is closed or nothing fits"""
+        for req_key in requirements:
+            for _ in range(self.MAX_ASSIGNMENT_ATTEMPTS):
+                if self._fill_gap_once(req_key, state, candidate_index) is None:
+                    break
     
-    def _is_back_to_back_with_existing(self, assignment, state):
-        """Check if assignment is back-to-back with existing assignment"""
-        coach_id = assignment['coach_id']
-        day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
+    def _match_existing_classes(self, existing_classes):
+        """Pair stored classes, in day order, with their feasible assignment (None if no longer feasible)"""
+        if not existing_classes:
+            return []
         
-        start_dt = datetime.strptime(start_time, '%H:%M')
-        end_dt = datetime.strptime(end_time, '%H:%M')
+        feasible = {(a.coach_id, a.branch, a.level, a.day, a.start_time): a
+                    for a in self.feasible_assignments}
         
-        # Check if this class starts immediately after another class ends
-        for existing in state['coach_schedules'][coach_id][day]:
-            existing_end = datetime.strptime(existing['end_time'], '%H:%M')
-            if abs((start_dt - existing_end).total_seconds()) <= 5 * 60:  # Within 5 minutes
-                return True
+        day_order = {'TUE': 0, 'WED': 1, 'THU': 2, 'FRI': 3, 'SAT': 4, 'SUN': 5}
+        existing_classes = sorted(existing_classes, key=lambda c: (day_order.get(c['day'], 6), c['start_time'], c['branch'] or ''))
         
-        # Check if this class ends immediately before another class starts
-        for existing in state['coach_schedules'][coach_id][day]:
-            existing_start = datetime.strptime(existing['start_time'], '%H:%M')
-            if abs((existing_start - end_dt).total_seconds()) <= 5 * 60:  # Within 5 minutes
-                return True
+        return [(c, feasible.get((c['coach_id'], c['branch'], c['level'], c['day'], c['start_time'])))
+                for c in existing_classes]
+    
+    def _pin_existing_classes(self, matched_classes, state):
+        """Commit the matched classes that are still valid; returns the others, each with a reason"""
+        invalidated = []
+        for pinned, assignment in matched_classes:
+            req_key = (pinned['branch'], pinned['level'])
+            
+            if assignment is None:
+                # Coach now off or no longer qualified / assigned to the branch, or the requirement is gone
+                reason = 'unavailable'
+            elif state['unassigned_students'][req_key] <= 0:
+                reason = 'surplus'
+            else:
+                class_size = min(state['unassigned_students'][req_key], self.class_capacities.get(pinned['level'], 8))
+                if self._add_validated_assignment_strict(assignment, class_size, state):
+                    state['unassigned_students'][req_key] -= class_size
+                    # Pinned classes are never moved by the local search
+                    state['selected_assignments'][-1]['pinned'] = True
+                    continue
+                reason = 'constraint'
+            
+            self.log.debug("    Dropped %s %s %s %s (coach %s): %s", pinned['branch'], pinned['level'],
+                           pinned['day'], pinned['start_time'], pinned['coach_id'], reason)
+            invalidated.append(dict(pinned, reason=reason))
         
-        return False
+        return invalidated
+    
+    # ==================== ASSIGNMENT SCORING AND SELECTION ====================
     
-    def _would_create_same_program_back_to_back(self, assignment, state):
-        """Check if this assignment would create same-program back-to-back on weekday mornings"""
-        # Only apply to weekdays and morning hours
-        day = assignment['day']
-        start_hour = int(assignment['start_time'].split(':')[0])
+    def _build_static_columns(self, assignments, feasible_columns=None):
+        """
+        Per-assignment columns: the static score (time of day, day bias, capacity) and the times used by dynamic terms
+        
+        feasible_columns is the columnar copy of the pool from load_database_driven(); it is used instead of
+        reading every record when it covers the same assignments (component schedulers get a subset without it).
+        """
+        if feasible_columns is not None and len(feasible_columns['day']) == len(assignments):
+            start_minutes = feasible_columns['start_minute'].astype(np.int32, copy=False)
+            end_minutes = feasible_columns['end_minute'].astype(np.int32, copy=False)
+            days = feasible_columns['day']
+            capacities = feasible_columns['capacity'].astype(np.float64, copy=False)
+        else:
+            start_minutes = np.array([a.start_minute for a in assignments], dtype=np.int32)
+            end_minutes = np.array([a.end_minute for a in assignments], dtype=np.int32)
+            days = np.array([a.day for a in assignments], dtype=object)
+            capacities = np.array([a.capacity for a in assignments], dtype=np.float64)
+        is_weekend = np.isin(days, list(self.weekends))
+        is_weekday = np.isin(days, list(self.weekdays))
+        start_hours = start_minutes // 60
         
-        if day not in self.weekdays or start_hour not in self.morning_hours:
-            return False
+        # Time preferences (using internal fixed values)
+        time_bonus = np.where((start_hours >= 10) & (start_hours <= 15), self._PEAK_HOURS_BONUS,
+                              np.where((start_hours >= 9) & (start_hours <= 17), self._GOOD_HOURS_BONUS, 0))
         
-        coach_id = assignment['coach_id']
-        branch = assignment['branch']
-        level = assignment['level']
-        program = self.program_groups.get(level, level)
+        # Day preferences (using 1-10 scale)
+        day_bias = np.where(is_weekend, self.WEEKEND_BIAS, self.WEEKDAY_BIAS)
+        
+        return {
+            # Capacity utilization (using fixed value)
+            'static_score': time_bonus + day_bias + capacities * self._CAPACITY_MULTIPLIER,
+            'start_minute': start_minutes,
+            'end_minute': end_minutes,
+            'start_hour': start_hours,
+            'day': days,
+            'weekday_morning': is_weekday & np.isin(start_hours, self.morning_hours)
+        }
+    
+    def _score_candidates(self, key, state, candidate_index):
+        """Score every candidate of one (coach, branch, level) key at once"""
+        coach_id, branch, level = key
+        columns = candidate_index.columns(key)
+        scores = columns['static_score'].copy()
+        state['counters']['candidates_scanned'] += len(scores)
+        if not len(scores):
+            return scores
         
-        # Check for existing same-program classes for this coach on this day and branch in the morning
-        existing_morning_classes = state['coach_program_morning_classes'][coach_id][day][branch]
+        # Coach workload balance - only for full-time coaches (using 1-10 scale)
+        coach = self.coaches_data.get(coach_id)
+        if coach and coach['status'] == 'Full Time' and state['coach_workload'][coach_id] < 5:
+            scores += self.UNDERUTILIZED_COACH_BONUS
         
-        for existing_class in existing_morning_classes:
-            existing_program = existing_class['program']
-            existing_hour = existing_class['hour']
-            
-            # If same program exists and hour is adjacent or same, would create back-to-back
-            if existing_program == program and abs(existing_hour - start_hour) <= 1:
-                return True
+        # Diverse class bonus (using 1-10 scale)
+        if coach_id in state['coach_levels_taught'] and level not in state['coach_levels_taught'][coach_id]:
+            scores += self.DIVERSE_CLASS_BONUS
+        
+        # Back-to-back (no turnaround) bonus: within 5 minutes of an existing class that day
+        back_to_back = None
+        for day, day_classes in state['coach_schedules'][coach_id].items():
+            if not day_classes:
+                continue
+            on_day = columns['day'] == day
+            for existing in day_classes:
+                near = on_day & ((np.abs(columns['start_minute'] - existing['end_minute']) <= 5) |
+                                 (np.abs(existing['start_minute'] - columns['end_minute']) <= 5))
+                back_to_back = near if back_to_back is None else back_to_back | near
+        if back_to_back is not None:
+            scores[back_to_back] += self.NO_TURNAROUND_BONUS
         
-        return False
+        # Same program back-to-back penalty for weekday mornings
+        program = self.program_groups.get(level, level)
+        same_program = None
+        for day, branch_classes in state['coach_program_morning_classes'][coach_id].items():
+            existing_hours = [c['hour'] for c in branch_classes.get(branch, ()) if c['program'] == program]
+            if not existing_hours:
+                continue
+            on_day = columns['weekday_morning'] & (columns['day'] == day)
+            for hour in existing_hours:
+                near = on_day & (np.abs(columns['start_hour'] - hour) <= 1)
+                same_program = near if same_program is None else same_program | near
+        if same_program is not None:
+            scores[same_program] -= self.SAME_PROGRAM_BACK_TO_BACK_PENALTY
+        
+        return scores
     
     def _get_enhanced_priority_requirements(self):
         """Calculate priority scores for all requirements using normalized weights"""
+        if self._priority_requirements is not None:
+            return self._priority_requirements
+        
         requirements = []
         
         for req_key, students in self.enrollment_dict.items():
@@ -888,17 +1758,13 @@ class EnhancedStrictConstraintScheduler:
             requirements.append((req_key, {'students': students}, priority_score))
         
         requirements.sort(key=lambda x: x[2], reverse=True)
-        return [(req_key, req) for req_key, req, _ in requirements]
+        self._priority_requirements = [(req_key, req) for req_key, req, _ in requirements]
+        return self._priority_requirements
     
     def _calculate_scarcity_score(self, req_key):
         """Calculate resource scarcity for prioritization (0-10 scale)"""
-        branch, level = req_key
-        
-        qualified_coaches = len([c for c in self.full_time_coaches + self.part_time_coaches + self.branch_managers
-                               if level in c['qualifications'] and branch in c['branches']])
-        
-        available_slots = len([a for a in self.popular_assignments
-                             if a['branch'] == branch and a['level'] == level])
+        qualified_coaches = self.qualified_coach_counts.get(req_key, 0)
+        available_slots = self.popular_slot_counts.get(req_key, 0)
         
         # Convert to 0-10 scale
         scarcity = min(10, (50 / max(1, qualified_coaches)) + (30 / max(1, available_slots)))
@@ -906,10 +1772,10 @@ class EnhancedStrictConstraintScheduler:
     
     def _calculate_level_complexity(self, level):
         """Calculate complexity score based on level hierarchy (0-10 scale)"""
-        if level not in self.level_hierarchy:
+        level_index = self.level_index.get(level)
+        if level_index is None:
             return 5.0  # Middle of scale
         
-        level_index = self.level_hierarchy.index(level)
         # Convert to 0-10 scale
         return (level_index / len(self.level_hierarchy)) * 10
     
@@ -917,14 +1783,13 @@ class EnhancedStrictConstraintScheduler:
     
     def _validate_strict_workload_constraints(self, assignment, state):
         """Validate all constraints with strict workload enforcement"""
-        coach_id = assignment['coach_id']
+        state['counters']['validations'] += 1
+        coach_id = assignment.coach_id
         coach = self.coaches_data[coach_id]
-        day = assignment['day']
-        period = assignment['period']
-        branch = assignment['branch']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
-        duration = assignment['duration']
+        day = assignment.day
+        period = assignment.period
+        branch = assignment.branch
+        duration = assignment.duration
         
         # Basic availability check
         if not coach['availability'].get(day, {}).get(period, False):
@@ -946,6 +1811,10 @@ class EnhancedStrictConstraintScheduler:
         if current_classes >= strict_limit:
             return False
         
+        # Weekly class limits by coach type
+        if state['coach_workload'][coach_id] >= self._get_coach_weekly_limit(coach):
+            return False
+        
         # Daily hours limits
         current_hours = state['coach_daily_hours'][coach_id][day]
         hours_limit = self.WEEKEND_DAILY_HOURS if day in self.weekends else self.WEEKDAY_DAILY_HOURS
@@ -965,41 +1834,27 @@ class EnhancedStrictConstraintScheduler:
     
     def _has_time_conflict(self, assignment, state):
         """Check for overlapping time assignments"""
-        coach_id = assignment['coach_id']
-        day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
-        
-        new_start = datetime.strptime(start_time, '%H:%M')
-        new_end = datetime.strptime(end_time, '%H:%M')
-        
-        for existing in state['coach_schedules'][coach_id][day]:
-            existing_start = datetime.strptime(existing['start_time'], '%H:%M')
-            existing_end = datetime.strptime(existing['end_time'], '%H:%M')
-            
-            if new_start < existing_end and existing_start < new_end:
-                return True
-        
-        return False
+        return not state['grid'].coach_is_free(
+            assignment.coach_id, assignment.day, assignment.start_minute, assignment.end_minute
+        )
     
     def _respects_consecutive_limits(self, assignment, state):
         """Check consecutive class limits with required breaks"""
-        coach_id = assignment['coach_id']
-        day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
+        coach_id = assignment.coach_id
+        day = assignment.day
         
-        day_assignments = state['coach_schedules'][coach_id][day].copy()
-        day_assignments.append({'start_time': start_time, 'end_time': end_time})
-        day_assignments.sort(key=lambda x: datetime.strptime(x['start_time'], '%H:%M'))
+        day_assignments = [(existing['start_minute'], existing['end_minute'])
+                           for existing in state['coach_schedules'][coach_id][day]]
+        day_assignments.append((assignment.start_minute, assignment.end_minute))
+        day_assignments.sort(key=lambda x: x[0])
         
         consecutive_count = 1
         
         for i in range(1, len(day_assignments)):
-            prev_end = datetime.strptime(day_assignments[i-1]['end_time'], '%H:%M')
-            curr_start = datetime.strptime(day_assignments[i]['start_time'], '%H:%M')
+            prev_end = day_assignments[i-1][1]
+            curr_start = day_assignments[i][0]
             
-            gap_minutes = (curr_start - prev_end).total_seconds() / 60
+            gap_minutes = curr_start - prev_end
             
             if gap_minutes < self.MIN_BREAK_MINUTES:
                 consecutive_count += 1
@@ -1012,27 +1867,12 @@ class EnhancedStrictConstraintScheduler:
     
     def _within_branch_capacity(self, assignment, state):
         """Check branch capacity constraints"""
-        branch = assignment['branch']
-        day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
-        
+        branch = assignment.branch
         max_capacity = self.branch_limits.get(branch, 4)
         
-        start_dt = datetime.strptime(start_time, '%H:%M')
-        end_dt = datetime.strptime(end_time, '%H:%M')
-        
-        current = start_dt
-        while current < end_dt:
-            slot_key = current.strftime('%H:%M')
-            current_usage = state['branch_time_usage'][branch][day][slot_key]
-            
-            if current_usage >= max_capacity:
-                return False
-            
-            current += timedelta(minutes=30)
-        
-        return True
+        return state['grid'].branch_has_capacity(
+            branch, assignment.day, assignment.start_minute, assignment.end_minute, max_capacity
+        )
     
     # ==================== LEVEL MERGING AND COMPATIBILITY ====================
     
@@ -1041,14 +1881,53 @@ class EnhancedStrictConstraintScheduler:
         if level1 == level2:
             return True
         
-        if level1 not in self.level_hierarchy or level2 not in self.level_hierarchy:
+        idx1 = self.level_index.get(level1)
+        idx2 = self.level_index.get(level2)
+        if idx1 is None or idx2 is None:
             return False
         
-        idx1 = self.level_hierarchy.index(level1)
-        idx2 = self.level_hierarchy.index(level2)
-        
         return abs(idx1 - idx2) <= self.LEVEL_MERGE_DISTANCE
     
+    def _index_open_class(self, assignment, state):
+        """Push a committed class onto its (branch, level) heap if it has spare capacity"""
+        available_space = self.class_capacities.get(assignment['level'], 8) - assignment['actual_students']
+        if available_space > 0:
+            heapq.heappush(state['open_classes'][(assignment['branch'], assignment['level'])],
+                           (-available_space, state['class_seq'][id(assignment)], assignment))
+    
+    def _pop_open_class(self, branch, level, state):
+        """
+        Take the class at a branch that a level can merge into with the most available space
+        
+        Returns (class, available space), or None. Heap entries are not updated in place: a class
+        whose size changed was pushed again, and a released one left class_seq, so outdated entries
+        are dropped when they reach the top.
+        """
+        best = None
+        for class_level in self._merge_levels(level):
+            heap = state['open_classes'].get((branch, class_level))
+            while heap:
+                state['counters']['candidates_scanned'] += 1
+                neg_space, seq, assignment = heap[0]
+                if (state['class_seq'].get(id(assignment)) == seq and
+                        self.class_capacities.get(class_level, 8) - assignment['actual_students'] == -neg_space):
+                    break
+                heapq.heappop(heap)
+            if heap and (best is None or heap[0][:2] < best[0][:2]):
+                best = (heap[0], heap)
+        
+        if best is None:
+            return None
+        (neg_space, _, assignment), heap = best
+        heapq.heappop(heap)
+        return assignment, -neg_space
+    
+    def _merge_levels(self, level):
+        """Class levels that students of a level can merge into"""
+        if level not in self.level_index:
+            return [level]
+        return [class_level for class_level in self.level_hierarchy if self._check_level_compatibility(class_level, level)]
+    
     def _update_merge_info(self, assignment, new_level):
         """Update assignment with merge information"""
         if 'merged_levels' not in assignment:
@@ -1076,23 +1955,24 @@ class EnhancedStrictConstraintScheduler:
         combinations.sort(key=lambda x: x[1], reverse=True)
         return combinations
     
-    def _distribute_students_across_levels(self, levels, level_gaps, total_class_size, state):
-        """Distribute students proportionally across merged levels"""
-        total_gap = sum(gap for level, gap in level_gaps if level in levels)
+    def _distribute_students_across_levels(self, branch, levels, total_class_size, state):
+        """Distribute students proportionally across merged levels of one branch"""
+        gaps = {level: state['unassigned_students'].get((branch, level), 0) for level in levels}
+        total_gap = sum(gaps.values())
+        if total_gap <= 0:
+            return
         
-        for level, gap in level_gaps:
-            if level in levels and total_gap > 0:
-                proportion = gap / total_gap
-                assigned = int(total_class_size * proportion)
-                req_key = None
-                
-                for key in state['unassigned_students']:
-                    if key[1] == level:
-                        req_key = key
-                        break
-                
-                if req_key and assigned > 0:
-                    state['unassigned_students'][req_key] = max(0, state['unassigned_students'][req_key] - assigned)
+        # Proportional shares, then hand the rounding remainder to levels with room left
+        allocation = {level: total_class_size * gap // total_gap for level, gap in gaps.items()}
+        remainder = total_class_size - sum(allocation.values())
+        for level in sorted(gaps, key=lambda l: gaps[l] - allocation[l], reverse=True):
+            extra = min(remainder, gaps[level] - allocation[level])
+            allocation[level] += extra
+            remainder -= extra
+        
+        for level, assigned in allocation.items():
+            if assigned > 0:
+                state['unassigned_students'][(branch, level)] -= assigned
     
     # ==================== COACH MANAGEMENT ====================
     
@@ -1130,7 +2010,18 @@ class EnhancedStrictConstraintScheduler:
     
     # ==================== ASSIGNMENT FINDING ====================
     
-    def _find_optimal_assignment_strict(self, qualified_coaches, branch, level, state, assignment_pool):
+    def _build_candidate_index(self, assignment_pool):
+        """Index assignments by (coach, branch, level) and (coach, branch, level, day)"""
+        candidate_index = CandidateIndex(self._static_columns, self._column_rows)
+        
+        for assignment in assignment_pool:
+            key = (assignment.coach_id, assignment.branch, assignment.level)
+            candidate_index.setdefault(key, []).append(assignment)
+            candidate_index.setdefault(key + (assignment.day,), []).append(assignment)
+        
+        return candidate_index
+    
+    def _find_optimal_assignment_strict(self, qualified_coaches, branch, level, state, candidate_index):
         """Find best assignment with strict constraint validation"""
         best_assignment = None
         best_score = -1
@@ -1143,87 +2034,223 @@ class EnhancedStrictConstraintScheduler:
             if state['coach_workload'][coach_id] >= weekly_limit:
                 continue
             
-            candidates = [a for a in assignment_pool
-                         if (a['coach_id'] == coach_id and 
-                             a['branch'] == branch and 
-                             a['level'] == level)]
+            key = (coach_id, branch, level)
+            candidates = candidate_index.get(key, [])
+            scores = self._score_candidates(key, state, candidate_index)
             
-            for assignment in candidates:
-                if self._validate_strict_workload_constraints(assignment, state):
-                    score = self._score_assignment_enhanced(assignment, state)
-                    if score > best_score:
-                        best_score = score
-                        best_assignment = assignment
+            # Highest score first (ties keep list order); the first valid one is this coach's best
+            for i in np.argsort(-scores, kind='stable'):
+                if scores[i] <= best_score:
+                    break
+                if self._validate_strict_workload_constraints(candidates[i], state):
+                    best_score = scores[i]
+                    best_assignment = candidates[i]
+                    break
         
         return best_assignment
     
-    def _find_specific_coach_assignment_strict(self, coach_id, branch, level, state, assignment_pool):
+    def _find_specific_coach_assignment_strict(self, coach_id, branch, level, state, candidate_index):
         """Find assignment for specific coach with constraint validation"""
-        candidates = [a for a in assignment_pool
-                     if (a['coach_id'] == coach_id and 
-                         a['branch'] == branch and 
-                         a['level'] == level)]
-        
-        candidates.sort(key=lambda a: self._score_assignment_enhanced(a, state), reverse=True)
+        key = (coach_id, branch, level)
+        candidates = candidate_index.get(key, [])
+        scores = self._score_candidates(key, state, candidate_index)
         
-        for assignment in candidates:
-            if self._validate_strict_workload_constraints(assignment, state):
-                return assignment
+        # Highest score first; a stable sort keeps list order among ties
+        for i in np.argsort(-scores, kind='stable'):
+            if self._validate_strict_workload_constraints(candidates[i], state):
+                return candidates[i]
         
         return None
     
-    def _find_specific_coach_day_assignment_strict(self, coach_id, branch, level, day, state, assignment_pool):
+    def _find_specific_coach_day_assignment_strict(self, coach_id, branch, level, day, state, candidate_index):
         """Find assignment for specific coach on specific day"""
-        candidates = [a for a in assignment_pool
-                     if (a['coach_id'] == coach_id and 
-                         a['branch'] == branch and 
-                         a['level'] == level and
-                         a['day'] == day)]
+        candidates = candidate_index.get((coach_id, branch, level, day), [])
         
-        for assignment in candidates:
+        for scanned, assignment in enumerate(candidates, 1):
             if self._validate_strict_workload_constraints(assignment, state):
+                state['counters']['candidates_scanned'] += scanned
                 return assignment
         
+        state['counters']['candidates_scanned'] += len(candidates)
         return None
     
+    # ==================== LOCAL SEARCH MOVES ====================
+    
+    def _fill_gap_once(self, req_key, state, candidate_index):
+        """Try to add one class for a requirement gap; returns the new class or None"""
+        branch, level = req_key
+        gap_size = state['unassigned_students'][req_key]
+        if gap_size <= 0:
+            return None
+        
+        qualified_coaches = self._get_all_qualified_coaches(branch, level)
+        assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, candidate_index)
+        if not assignment:
+            return None
+        
+        class_size = min(gap_size, self.class_capacities.get(level, 8))
+        if not self._add_validated_assignment_strict(assignment, class_size, state):
+            return None
+        
+        state['unassigned_students'][req_key] -= class_size
+        return state['selected_assignments'][-1]
+    
+    def _pick_gap_candidate(self, req_key, candidate_index):
+        """Pick a random candidate slot for a gap among all qualified coaches"""
+        branch, level = req_key
+        candidates = [a for coach in self._get_all_qualified_coaches(branch, level)
+                      for a in candidate_index.get((coach['id'], branch, level), [])]
+        return random.choice(candidates) if candidates else None
+    
+    def _find_blocking_classes(self, target, state):
+        """Classes that keep the target candidate from being valid"""
+        coach_id = target.coach_id
+        day = target.day
+        
+        # Time, one-branch-per-day, daily and consecutive limits all come from the coach's day
+        blockers = list(state['coach_schedules'][coach_id][day])
+        
+        if not blockers and state['coach_workload'][coach_id] >= self._get_coach_weekly_limit(self.coaches_data[coach_id]):
+            blockers = [a for classes in state['coach_schedules'][coach_id].values() for a in classes]
+        
+        # Overlapping classes at the branch only matter once it is full
+        if not self._within_branch_capacity(target, state):
+            blockers.extend(a for a in state['selected_assignments']
+                            if a['branch'] == target.branch and a['day'] == day and a['coach_id'] != coach_id
+                            and a['start_minute'] < target.end_minute and target.start_minute < a['end_minute'])
+        
+        return [a for a in blockers if not a.get('pinned')]
+    
+    def _relocate_placements(self, record, state, candidate_index):
+        """Relocate: same coach, branch and level in a different timeslot"""
+        candidates = [a for a in candidate_index.get((record['coach_id'], record['branch'], record['level']), [])
+                      if a.id != record['id']]
+        random.shuffle(candidates)
+        return [(record, candidates)]
+    
+    def _swap_coach_placements(self, record, state, candidate_index):
+        """Swap coach: hand the class to another coach qualified for all its levels, same day"""
+        levels = record.get('merged_levels', [record['level']])
+        candidates = []
+        for coach in self._find_multi_qualified_coaches(record['branch'], levels):
+            if coach['id'] != record['coach_id']:
+                candidates.extend(candidate_index.get((coach['id'], record['branch'], record['level'], record['day']), []))
+        
+        # Prefer keeping the original start time
+        random.shuffle(candidates)
+        candidates.sort(key=lambda a: a.start_minute != record['start_minute'])
+        return [(record, candidates)]
+    
+    def _swap_timeslot_placements(self, record, state, candidate_index):
+        """Swap timeslot: exchange day and start time with another class of the same coach"""
+        coach_id = record['coach_id']
+        others = [a for day_classes in state['coach_schedules'][coach_id].values()
+                  for a in day_classes if a is not record and not a.get('pinned')]
+        if not others:
+            return [(record, [])]
+        
+        other = random.choice(others)
+        return [
+            (record, self._candidates_at_slot(record, other['day'], other['start_minute'], candidate_index)),
+            (other, self._candidates_at_slot(other, record['day'], record['start_minute'], candidate_index))
+        ]
+    
+    def _candidates_at_slot(self, record, day, start_minute, candidate_index):
+        """Candidates for the record's coach, branch and level at a given day and start time"""
+        key = (record['coach_id'], record['branch'], record['level'], day)
+        return [a for a in candidate_index.get(key, []) if a.start_minute == start_minute]
+    
+    def _apply_move(self, placements, state):
+        """
+        Release classes and re-place each one at its first valid candidate
+        
+        placements is a list of (record, candidates). Validity is checked incrementally
+        against the state with the moving classes removed. Returns the (removed, added)
+        classes, or None with the state unchanged if any class cannot be placed.
+        """
+        removed = [record for record, _ in placements]
+        for record in removed:
+            self._release_assignment_record(record, state)
+        
+        added = []
+        for record, candidates in placements:
+            target = next((a for a in candidates if self._validate_strict_workload_constraints(a, state)), None)
+            if target is None:
+                self._undo_move((removed, added, [], []), state)
+                return None
+            
+            coach = self.coaches_data[target.coach_id]
+            moved = dict(record)
+            moved.update(target.to_dict(), coach_name=coach['name'], coach_status=coach['status'])
+            self._commit_assignment_record(moved, state)
+            added.append(moved)
+        
+        return removed, added
+    
+    def _undo_move(self, move, state):
+        """Reverse a local search move: (removed, added, dropped, filled) classes"""
+        removed, added, dropped, filled = move
+        for record in filled:
+            self._release_assignment_record(record, state)
+            state['unassigned_students'][(record['branch'], record['level'])] += record['actual_students']
+        for record in added:
+            self._release_assignment_record(record, state)
+        for record in removed:
+            self._commit_assignment_record(record, state)
+        for record in dropped:
+            self._commit_assignment_record(record, state)
+            state['unassigned_students'][(record['branch'], record['level'])] -= record['actual_students']
+    
     # ==================== ASSIGNMENT CREATION ====================
     
     def _add_validated_assignment_strict(self, assignment, students, state):
         """Add assignment to schedule with strict validation"""
-        max_capacity = self.class_capacities.get(assignment['level'], 8)
+        max_capacity = self.class_capacities.get(assignment.level, 8)
         if students > max_capacity:
             return False
         
         if not self._validate_strict_workload_constraints(assignment, state):
             return False
         
+        # Classes are few and carry merge state, so they are plain dicts rather than Assignment records
+        coach = self.coaches_data[assignment.coach_id]
         assignment_record = {
-            'id': assignment['id'],
-            'coach_id': assignment['coach_id'],
-            'coach_name': assignment['coach_name'],
-            'coach_status': assignment['coach_status'],
-            'branch': assignment['branch'],
-            'level': assignment['level'],
-            'day': assignment['day'],
-            'start_time': assignment['start_time'],
-            'end_time': assignment['end_time'],
-            'duration': assignment['duration'],
-            'period': assignment['period'],
-            'is_popular': assignment.get('is_popular', False),
-            'capacity': assignment['capacity'],
+            'id': assignment.id,
+            'coach_id': assignment.coach_id,
+            'coach_name': coach['name'],
+            'coach_status': coach['status'],
+            'branch': assignment.branch,
+            'level': assignment.level,
+            'day': assignment.day,
+            'start_time': assignment.start_time,
+            'end_time': assignment.end_time,
+            'start_minute': assignment.start_minute,
+            'end_minute': assignment.end_minute,
+            'duration': assignment.duration,
+            'period': assignment.period,
+            'is_popular': assignment.is_popular,
+            'capacity': assignment.capacity,
             'actual_students': students
         }
         
+        self._commit_assignment_record(assignment_record, state)
+        state['counters']['assignments_added'] += 1
+        return True
+    
+    def _commit_assignment_record(self, assignment_record, state):
+        """Append an already validated class and update state tracking"""
         state['selected_assignments'].append(assignment_record)
+        state['class_seq'][id(assignment_record)] = next(state['class_counter'])
+        self._index_open_class(assignment_record, state)
         
         # Update state tracking
-        coach_id = assignment['coach_id']
-        day = assignment['day']
-        branch = assignment['branch']
-        level = assignment['level']
+        coach_id = assignment_record['coach_id']
+        day = assignment_record['day']
+        branch = assignment_record['branch']
+        level = assignment_record['level']
         
         state['coach_schedules'][coach_id][day].append(assignment_record)
-        state['coach_daily_hours'][coach_id][day] += assignment['duration']
+        state['coach_daily_hours'][coach_id][day] += assignment_record['duration']
         state['coach_daily_classes'][coach_id][day] += 1
         state['coach_branch_daily'][coach_id][day] = branch
         state['coach_workload'][coach_id] += 1
@@ -1234,112 +2261,67 @@ class EnhancedStrictConstraintScheduler:
         state['coach_levels_taught'][coach_id].add(level)
         
         # Track morning program classes for same-program back-to-back detection
-        start_hour = int(assignment['start_time'].split(':')[0])
+        start_hour = assignment_record['start_minute'] // 60
         if day in self.weekdays and start_hour in self.morning_hours:
             program = self.program_groups.get(level, level)
             state['coach_program_morning_classes'][coach_id][day][branch].append({
                 'program': program,
                 'level': level,
                 'hour': start_hour,
-                'time': assignment['start_time']
+                'time': assignment_record['start_time']
             })
         
-        # Update branch time usage
-        start_dt = datetime.strptime(assignment['start_time'], '%H:%M')
-        end_dt = datetime.strptime(assignment['end_time'], '%H:%M')
-        
-        current = start_dt
-        while current < end_dt:
-            slot_key = current.strftime('%H:%M')
-            state['branch_time_usage'][branch][day][slot_key] += 1
-            current += timedelta(minutes=30)
+        # Update coach and branch occupancy
+        state['grid'].book(coach_id, branch, day, assignment_record['start_minute'], assignment_record['end_minute'])
+    
+    def _release_assignment_record(self, assignment_record, state):
+        """Remove a committed class and roll back the state tracking it touched"""
+        coach_id = assignment_record['coach_id']
+        day = assignment_record['day']
+        branch = assignment_record['branch']
+        level = assignment_record['level']
+        
+        # Remove by identity - two records may compare equal
+        _remove_identical(state['selected_assignments'], assignment_record)
+        del state['class_seq'][id(assignment_record)]
+        day_classes = state['coach_schedules'][coach_id][day]
+        _remove_identical(day_classes, assignment_record)
+        
+        state['coach_daily_hours'][coach_id][day] -= assignment_record['duration']
+        state['coach_daily_classes'][coach_id][day] -= 1
+        if not day_classes:
+            state['coach_branch_daily'][coach_id][day] = ''
+        state['coach_workload'][coach_id] -= 1
+        state['coach_levels_taught'][coach_id] = {a['level'] for classes in state['coach_schedules'][coach_id].values()
+                                                  for a in classes}
+        
+        morning_classes = state['coach_program_morning_classes'][coach_id][day][branch]
+        for i, entry in enumerate(morning_classes):
+            if entry['level'] == level and entry['time'] == assignment_record['start_time']:
+                del morning_classes[i]
+                break
         
-        return True
+        state['grid'].release(coach_id, branch, day, assignment_record['start_minute'], assignment_record['end_minute'])
     
     # ==================== UTILITY FUNCTIONS ====================
     
     def _enhanced_adaptive_shuffle(self):
         """Shuffle assignments for better exploration"""
-        print("  Enhanced adaptive shuffling...")
+        self.log.debug("  Enhanced adaptive shuffling...")
         random.shuffle(self.popular_assignments)
         random.shuffle(self.full_time_coaches)
         random.shuffle(self.part_time_coaches)
         random.shuffle(self.branch_managers)
     
-    def _count_workload_violations(self, result):
-        """Count workload constraint violations"""
-        violations = 0
-        
-        coach_daily_classes = defaultdict(lambda: defaultdict(int))
-        for entry in result['schedule']:
-            coach_id = entry['Coach ID']
-            day = entry['Day']
-            coach_daily_classes[coach_id][day] += 1
-        
-        for coach_id, daily_counts in coach_daily_classes.items():
-            for day, count in daily_counts.items():
-                limit = self.WEEKEND_DAILY_LIMIT if day in self.weekends else self.WEEKDAY_DAILY_LIMIT
-                
-                if count > limit:
-                    violations += 1
-                    print(f"  WORKLOAD VIOLATION: Coach {coach_id} has {count} classes on {day} (limit: {limit})")
-        
-        return violations
-    
     def _count_violations(self, result):
-        """Count general constraint violations"""
-        violations = 0
-        
-        # Check class capacities
-        for entry in result['schedule']:
-            level = entry['Gymnastics Level']
-            students = entry['Students']
-            max_capacity = self.class_capacities.get(level, 8)
-            
-            if students > max_capacity:
-                violations += 1
-        
-        # Check branch assignments (one branch per day)
-        coach_day_branches = defaultdict(lambda: defaultdict(set))
-        for entry in result['schedule']:
-            coach_id = entry['Coach ID']
-            day = entry['Day']
-            branch = entry['Branch']
-            coach_day_branches[coach_id][day].add(branch)
-        
-        for coach_id, day_branches in coach_day_branches.items():
-            for day, branches in day_branches.items():
-                if len(branches) > 1:
-                    violations += 1
-        
-        # Check consecutive limits
-        coach_day_assignments = defaultdict(lambda: defaultdict(list))
-        for entry in result['schedule']:
-            coach_id = entry['Coach ID']
-            day = entry['Day']
-            coach_day_assignments[coach_id][day].append(entry)
-        
-        for coach_id, day_assignments in coach_day_assignments.items():
-            for day, assignments in day_assignments.items():
-                if len(assignments) > 1:
-                    assignments.sort(key=lambda x: datetime.strptime(x['Start Time'], '%H:%M'))
-                    
-                    consecutive_count = 1
-                    for i in range(1, len(assignments)):
-                        prev_end = datetime.strptime(assignments[i-1]['End Time'], '%H:%M')
-                        curr_start = datetime.strptime(assignments[i]['Start Time'], '%H:%M')
-                        
-                        gap_minutes = (curr_start - prev_end).total_seconds() / 60
-                        
-                        if gap_minutes < self.MIN_BREAK_MINUTES:
-                            consecutive_count += 1
-                            if consecutive_count > self.CONSECUTIVE_LIMIT:
-                                violations += 1
-                                break
-                        else:
-                            consecutive_count = 1
-        
-        return violations
+        """(general, workload) constraint violation counts of a built result"""
+        violations = self.validator.validate(result['schedule'])
+        for violation in violations:
+            self.log.debug("  %s VIOLATION: Coach %s on %s at %s: %s", violation['rule'].upper(), violation['coach_id'],
+                           violation['day'], violation['start_time'], violation['message'])
+        
+        workload = sum(1 for violation in violations if violation['rule'] in WORKLOAD_RULES)
+        return len(violations) - workload, workload
     
     def _identify_gaps(self, result):
         """Identify unmet student requirements"""
@@ -1379,6 +2361,10 @@ class EnhancedStrictConstraintScheduler:
             }
             schedule.append(entry)
         
+        return self._result_from_schedule(schedule)
+    
+    def _result_from_schedule(self, schedule):
+        """Sort schedule entries chronologically and calculate the result statistics"""
         # Sort schedule chronologically
         day_order = {'TUE': 0, 'WED': 1, 'THU': 2, 'FRI': 3, 'SAT': 4, 'SUN': 5}
         schedule.sort(key=lambda x: (day_order.get(x['Day'], 6), x['Start Time'], x['Branch']))
@@ -1429,16 +2415,17 @@ class EnhancedStrictConstraintScheduler:
     
     def _create_best_effort_strict_result(self):
         """Create fallback result with strict constraint enforcement"""
-        print("Creating best effort result with strict workload limits...")
+        self.log.info("Creating best effort result with strict workload limits...")
         
         state = self._initialize_enhanced_state()
+        candidate_index = self._build_candidate_index(self.popular_assignments)
         
         for req_key, students in self.enrollment_dict.items():
             branch, level = req_key
             
             qualified_coaches = self._get_all_qualified_coaches(branch, level)
             if qualified_coaches:
-                assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, self.popular_assignments)
+                assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, candidate_index)
                 
                 if assignment:
                     capacity = self.class_capacities.get(level, 8)
@@ -1452,4 +2439,102 @@ class EnhancedStrictConstraintScheduler:
 def execute_enhanced_strict_constraint_scheduling(data):
     """Execute the enhanced scheduling algorithm"""
     scheduler = EnhancedStrictConstraintScheduler(data)
-    return scheduler.schedule_with_complete_coverage()
\ No newline at end of file
+    return scheduler.schedule_with_complete_coverage()
+
+
+def _remove_identical(items, target):
+    """Remove the element that is `target` (identity, not equality) from a list"""
+    for i, item in enumerate(items):
+        if item is target:
+            del items[i]
+            return
+
+
+def _max_flow(capacity, source, sink):
+    """Dinic's max flow over a dict-of-dicts capacity graph (capacity[u][v])"""
+    residual = defaultdict(dict)
+    for u, edges in capacity.items():
+        for v, cap in edges.items():
+            residual[u][v] = residual[u].get(v, 0) + cap
+            residual[v].setdefault(u, 0)
+    
+    flow = 0
+    while True:
+        # Build the level graph with a BFS from the source
+        levels = {source: 0}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, cap in residual[u].items():
+                if cap > 0 and v not in levels:
+                    levels[v] = levels[u] + 1
+                    queue.append(v)
+        
+        if sink not in levels:
+            return flow
+        
+        # Push blocking flow along level-increasing paths
+        pending = {u: list(residual[u]) for u in levels}
+        
+        def push(u, limit):
+            if u == sink:
+                return limit
+            while pending[u]:
+                v = pending[u][-1]
+                cap = residual[u][v]
+                if cap > 0 and levels.get(v) == levels[u] + 1:
+                    sent = push(v, min(limit, cap))
+                    if sent:
+                        residual[u][v] -= sent
+                        residual[v][u] += sent
+                        return sent
+                pending[u].pop()
+            return 0
+        
+        while True:
+            sent = push(source, float('inf'))
+            if not sent:
+                break
+            flow += sent
+
+
+# ==================== PARALLEL ITERATION WORKERS ====================
+
+# Per-process scheduler built once by the pool initializer
+_worker_scheduler = None
+_worker_initial_order = None
+
+def _init_iteration_worker(data, config, warm_start):
+    """Build a sequential scheduler from the pickled data package in a pool worker"""
+    global _worker_scheduler, _worker_initial_order
+    
+    worker_config = dict(config)
+    worker_config['parallel_workers'] = 1
+    # Workers have no log listener; the parent logs each iteration's result
+    worker_config['log_level'] = 'quiet'
+    _worker_scheduler = EnhancedStrictConstraintScheduler(data, worker_config, warm_start)
+    _worker_initial_order = (
+        list(_worker_scheduler.popular_assignments),
+        list(_worker_scheduler.full_time_coaches),
+        list(_worker_scheduler.part_time_coaches),
+        list(_worker_scheduler.branch_managers),
+    )
+
+def _schedule_component_worker(data, config, warm_start, seed):
+    """Schedule one coach-branch component from start to finish in a pool worker"""
+    random.seed(seed)
+    # Workers have no log listener; the parent logs the merged result
+    config = dict(config, log_level=logging.ERROR)
+    return EnhancedStrictConstraintScheduler(data, config, warm_start).schedule_with_complete_coverage()
+
+def _run_iteration_worker(iteration, seed):
+    """Run one independent restart; every restart after the first is shuffled with its own seed"""
+    scheduler = _worker_scheduler
+    (scheduler.popular_assignments, scheduler.full_time_coaches,
+     scheduler.part_time_coaches, scheduler.branch_managers) = [list(items) for items in _worker_initial_order]
+    
+    random.seed(seed)
+    if iteration > 1:
+        scheduler._enhanced_adaptive_shuffle()
+    
+    return scheduler._run_iteration()
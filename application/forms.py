@@ -162,6 +162,30 @@ class AlgorithmConfig(FlaskForm):
                                           validators=[DataRequired(), NumberRange(min=1)], 
                                           default=20,
                                           description="Maximum attempts to assign classes (higher = more persistent attempts)")
+    
+    time_budget_seconds = IntegerField("Time Budget (s)", 
+                                      validators=[Optional(), NumberRange(min=0)], 
+                                      default=0,
+                                      description="Stop and return the best result after this many seconds (0 = no limit)")
+    
+    plateau_iterations = IntegerField("Plateau Iterations", 
+                                     validators=[Optional(), NumberRange(min=0)], 
+                                     default=0,
+                                     description="Stop when coverage has not improved for this many iterations (0 = never)")
+    
+    local_search_steps = IntegerField("Local Search Steps", 
+                                     validators=[Optional(), NumberRange(min=0)], 
+                                     default=200,
+                                     description="Moves tried per iteration to rearrange classes and fill remaining gaps (0 = disabled)")
+    
+    log_level = SelectField("Log Level", 
+                            choices=[('quiet', 'Quiet'), ('info', 'Phase summaries'), ('debug', 'Every decision')], 
+                            default='quiet',
+                            description="How much the scheduler writes to the server log for this run")
+    
+    warm_start = BooleanField("Warm Start", 
+                              default=False,
+                              description="Keep the active timetable's classes and only schedule what it is missing")
 
     # Scoring Weights (1-10 scale)
     weekend_bias = IntegerField("Weekend Priority", 
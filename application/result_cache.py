@@ -0,0 +1,143 @@
+"""
+Disk cache of scheduling results, keyed by a hash of the scheduler's input
+
+cache_key() hashes the digest of the source rows the data package was built from together with
+the scheduler settings and any warm start classes, so a repeated Generate with unchanged data
+returns the stored result instead of running the scheduler again. Entries are JSON files; the least
+recently used ones are removed once the directory grows past its size limit, and the whole cache
+is cleared whenever a commit changes one of the tables the data package is built from (tracked by
+data_snapshot).
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler
+
+logger = logging.getLogger(__name__)
+
+# Bump when the result format or the scheduler's behaviour changes, so old entries stop matching
+CACHE_FORMAT = 2
+
+# Scheduler settings that shape the result: its public configuration constants except the log level.
+# Other request keys (csrf_token, use_cache, ...) never reach the key.
+RESULT_SETTINGS = tuple(name for name in vars(EnhancedStrictConstraintScheduler)
+                        if name.isupper() and not name.startswith('_') and name != 'LOG_LEVEL')
+
+
+def _canonical(value):
+    """Nested containers with dicts and sets in sorted order, so equal data always has the same repr"""
+    if isinstance(value, dict):
+        return tuple(sorted(((repr(k), _canonical(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(item) for item in value)
+    return value
+
+
+def scheduler_settings(config=None):
+    """The value of every result-shaping setting for a config: the given one, or the scheduler default"""
+    config = {key.upper(): value for key, value in (config or {}).items()}
+    return {name: config.get(name, getattr(EnhancedStrictConstraintScheduler, name)) for name in RESULT_SETTINGS}
+
+
+def cache_key(data, config=None, warm_start=None):
+    """Hex digest identifying a scheduler run: source data, scheduler settings and warm start classes"""
+    digest = hashlib.sha256(f"result-cache-v{CACHE_FORMAT}".encode())
+    # The package (candidate order included) is a function of the source rows, so their digest stands in for it
+    digest.update(data['source_digest'].encode())
+    digest.update(repr(_canonical(scheduler_settings(config))).encode())
+    digest.update(repr(_canonical(warm_start or [])).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of JSON results with least-recently-used eviction by total size
+
+    Recency is the file's modification time, which a hit refreshes. Writes go through a temporary
+    file and a rename, so concurrent requests never read a partial entry.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """The stored result for a key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, key, result):
+        """Store a result, then evict the least recently used entries beyond max_bytes"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError):
+            logger.exception("Could not store scheduling result %s", key)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict()
+
+    def _entries(self):
+        """(mtime, size, path) of every entry, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed by another request
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every entry"""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def init_result_cache(app):
+    """
+    Create the app's cache (None when RESULT_CACHE_MAX_BYTES is 0); data_snapshot clears it on source table changes
+    
+    A relative RESULT_CACHE_DIR is resolved against the app's instance folder, not the working directory.
+    """
+    directory = app.config.get('RESULT_CACHE_DIR')
+    if directory:
+        directory = os.path.join(app.instance_path, directory)
+    max_bytes = app.config.get('RESULT_CACHE_MAX_BYTES', 0)
+    app.extensions['result_cache'] = ResultCache(directory, max_bytes) if directory and max_bytes > 0 else None
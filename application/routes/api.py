@@ -8,12 +8,16 @@ from application.forms import CoachFilter, CoachDetails, DataUploadForm, BranchF
 from application.models import DayOfWeek, User, Coach, Level, Branch, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot, \
                             Timetable, TimetableEntry
 
-from application.data_processor import load_database_driven
-from application.enhanced_scheduler import EnhancedStrictConstraintScheduler, execute_enhanced_strict_constraint_scheduling
+from application.data_processor import load_database_driven, WEEKENDS
+from application.data_snapshot import load_data
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler, SchedulerConfigError, \
+                                         execute_enhanced_strict_constraint_scheduling
+from application.schedule_validator import ScheduleValidator
+from application.result_cache import cache_key
 from application.util import transform_schedule_for_timetable_js, generate_sample_timetable
 
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 from math import ceil
 
@@ -589,17 +593,34 @@ def delete_branch(branch_id):
 def generate():
     """Generate timetable data for frontend visualization using the database"""
     try:
-        print("Starting timetable generation...")
-
         config = request.get_json() or {}
-        print(config)
+        current_app.logger.debug("Starting timetable generation with config %s", config)
+        
+        # 'use_cache': False reloads the data and reschedules even when a snapshot or stored result matches
+        use_cache = config.pop('use_cache', True)
+        
+        # 'warm_start' is a timetable id, or any other true value for the active timetable
+        warm_start = config.pop('warm_start', None)
+        warm_start_classes = None
+        if warm_start:
+            if isinstance(warm_start, int) and not isinstance(warm_start, bool):
+                timetable = Timetable.query.get(warm_start)
+            else:
+                timetable = Timetable.query.filter(Timetable.active == True).first()
+            
+            if not timetable:
+                return jsonify({
+                    'success': False,
+                    'message': 'No timetable found to warm start from.'
+                }), 404
+            warm_start_classes = stored_timetable_classes(timetable)
         
-        # Step 1: Load data from database using data_processor
-        print("Loading data from database...")
-        data = load_database_driven()
+        # Step 1: Load data from database using data_processor, or take the snapshot of unchanged data
+        # 'log_level' ('quiet', 'info' or 'debug') sets verbosity for this request only
+        data = load_data(config.get('log_level')) if use_cache else load_database_driven(config.get('log_level'))
         
         if not data:
-            print("Failed to load data from database")
+            current_app.logger.error("Failed to load data from database")
             return jsonify({
                 'success': False,
                 'message': 'Failed to load data from database',
@@ -611,45 +632,177 @@ def generate():
         enrollment_count = len(data.get('enrollment_dict', {}))
         assignment_count = len(data.get('feasible_assignments', []))
         
-        print(f"Data loaded: {coaches_count} coaches, {enrollment_count} enrollments, {assignment_count} feasible assignments")
+        current_app.logger.debug("Data loaded: %s coaches, %s enrollments, %s feasible assignments",
+                                 coaches_count, enrollment_count, assignment_count)
         
         if coaches_count == 0 or enrollment_count == 0 or assignment_count == 0:
-            print("Insufficient data for scheduling")
+            current_app.logger.warning("Insufficient data for scheduling")
             return jsonify({
                 'success': False,
                 'message': 'Insufficient data for scheduling'
             }), 400
         
-        # Step 2: Run the scheduling algorithm from enhanced_scheduler
-        print("Running enhanced strict constraint scheduling...")
-        scheduler = EnhancedStrictConstraintScheduler(data, config)
-        results = scheduler.schedule_with_complete_coverage()
-        # results = execute_enhanced_strict_constraint_scheduling(data)
+        # Step 2: Run the scheduling algorithm from enhanced_scheduler, unless the same data and config
+        # were scheduled before
+        result_cache = current_app.extensions.get('result_cache') if use_cache else None
+        key = cache_key(data, config, warm_start_classes) if result_cache else None
+        results = result_cache.get(key) if key else None
+        cached = results is not None
         
-        if not results or 'schedule' not in results or not results['schedule']:
-            print("Scheduler failed to generate a timetable")
-            return jsonify({
-                'success': False,
-                'message': 'Scheduler failed to generate a timetable'
-            }), 500 
+        if cached:
+            current_app.logger.info("Returning cached result %s", key[:12])
+        else:
+            scheduler = EnhancedStrictConstraintScheduler(data, config, warm_start_classes)
+            results = scheduler.schedule_with_complete_coverage()
+            # results = execute_enhanced_strict_constraint_scheduling(data)
+            
+            if not results or 'schedule' not in results or not results['schedule']:
+                current_app.logger.error("Scheduler failed to generate a timetable")
+                return jsonify({
+                    'success': False,
+                    'message': 'Scheduler failed to generate a timetable'
+                }), 500 
+            
+            if key:
+                result_cache.put(key, results)
+        results['statistics']['cached'] = cached
         
         
         schedule_count = len(results['schedule'])
         coverage = results['statistics'].get('coverage_percentage', 0)
-        print(f"Schedule generated with {schedule_count} classes ({coverage:.1f}% coverage)")
+        current_app.logger.info("Schedule generated with %s classes (%.1f%% coverage)", schedule_count, coverage)
         
         # Step 3: Convert the schedule to the format expected by timetable.js
         processed_data = transform_schedule_for_timetable_js(results['schedule'])
         
+        # Run statistics (coverage, stop reason, ...) are sent alongside the branches.
+        # Branch abbreviations are at most 4 characters, so this key cannot collide.
+        processed_data['statistics'] = results['statistics']
+        
         return jsonify(processed_data)
         
-    except Exception as e:
-        import traceback
-        error_msg = f"Error generating timetable: {str(e)}"
-        print(f"{error_msg}")
-        traceback.print_exc()
+    except SchedulerConfigError as e:
+        current_app.logger.warning("Invalid scheduler config: %s", e)
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception:
+        current_app.logger.exception("Error generating timetable")
+        return jsonify({
+            'success': False,
+            'message': 'Something went wrong.'
+        }), 500
+
+@api_bp.route('/timetable/repair/', methods=['POST'])
+def repair_timetable():
+    """Reschedule only the classes of a stored timetable that coach or enrollment changes invalidated"""
+    config = request.get_json() or {}
+    
+    # Repair the active timetable unless a 'timetable_id' is given
+    timetable_id = config.pop('timetable_id', None)
+    if timetable_id is not None:
+        timetable = Timetable.query.get_or_404(timetable_id)
+    else:
+        timetable = Timetable.query.filter(Timetable.active == True).first()
+        if not timetable:
+            return jsonify({
+                'success': False,
+                'message': 'No active timetable found.'
+            }), 404
+    
+    try:
+        data = load_data(config.get('log_level'))
+        
+        scheduler = EnhancedStrictConstraintScheduler(data, config)
+        results = scheduler.repair_schedule(stored_timetable_classes(timetable))
+        
+        repair = results['statistics']['repair']
+        current_app.logger.info("Repaired timetable %s: kept %s classes, dropped %s, added %s",
+                                timetable.id, repair['kept_classes'], len(repair['invalidated']), repair['new_classes'])
         
-        print("Exception occurred - falling back to sample timetable")
+        processed_data = transform_schedule_for_timetable_js(results['schedule'])
+        processed_data['statistics'] = results['statistics']
+        processed_data['statistics']['repair']['timetable_id'] = timetable.id
+        
+        return jsonify(processed_data)
+    
+    except SchedulerConfigError as e:
+        current_app.logger.warning("Invalid scheduler config: %s", e)
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception:
+        current_app.logger.exception("Error repairing timetable")
+        return jsonify({
+            'success': False,
+            'message': 'Something went wrong.'
+        }), 500
+
+def stored_timetable_classes(timetable):
+    """Classes of a stored timetable in the scheduler's terms (branch abbreviation, level alias, day code)"""
+    return [{
+        'coach_id': entry.coach_id,
+        'branch': entry.branch.abbrv if entry.branch else None,
+        'level': entry.level.alias if entry.level else None,
+        'day': DayOfWeek(entry.day).name,
+        'start_time': entry.start_time.strftime('%H:%M')
+    } for entry in timetable.entries]
+
+@api_bp.route('/timetable/validate/', methods=['POST'])
+def validate_timetable():
+    """Check an edited timetable (the format sent to /timetable/save/) against the scheduler's hard rules"""
+    timetable_data = request.get_json(silent=True)
+    
+    if not timetable_data or not isinstance(timetable_data, dict):
+        return jsonify({'success': False, 'message': 'No data provided'}), 400
+    
+    coach_ids = dict(db.session.query(Coach.name, Coach.id).all())
+    schedule = []
+    try:
+        for branch, branch_data in timetable_data.items():
+            for day, coach_schedule in branch_data['schedule'].items():
+                for coach, classes in coach_schedule.items():
+                    if coach not in coach_ids:
+                        return jsonify({'success': False, 'message': f'Unknown coach: {coach}'}), 400
+                    
+                    for details in classes:
+                        start = datetime.strptime(details['start_time'], "%H%M")
+                        end = start + timedelta(minutes=30 * details['duration'])
+                        schedule.append({
+                            'Branch': branch,
+                            'Day': DayOfWeek[day[:3].upper()].name,
+                            'Start Time': start.strftime('%H:%M'),
+                            'End Time': end.strftime('%H:%M'),
+                            'Gymnastics Level': details['name'],
+                            'Coach ID': coach_ids[coach],
+                            'Coach Name': coach
+                        })
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        current_app.logger.warning("Malformed timetable sent for validation: %r", e)
+        return jsonify({'success': False, 'message': 'Malformed timetable data', 'error': repr(e)}), 400
+    
+    try:
+        # Limits can be overridden with the generate config keys as query parameters
+        limits = {key: request.args.get(key, getattr(EnhancedStrictConstraintScheduler, key.upper()), type=int)
+                  for key in ScheduleValidator.LIMITS}
+        class_capacities = {level.alias: level.max_students for level in Level.query.all()}
+        validator = ScheduleValidator(class_capacities, WEEKENDS, **limits)
+        
+        violations = validator.validate(schedule)
+        coach_names = {entry['Coach ID']: entry['Coach Name'] for entry in schedule}
+        for violation in violations:
+            violation['coach_name'] = coach_names[violation['coach_id']]
+        
+        return jsonify({
+            'success': True,
+            'valid': not violations,
+            'violations': violations
+        })
+    
+    except Exception:
+        current_app.logger.exception("Error validating timetable")
         return jsonify({
             'success': False,
             'message': 'Something went wrong.'
@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, jsonify, flash, send_file
 from flask_login import login_required
-from application.data_processor import load_database_driven
+from application.data_snapshot import load_data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -19,7 +19,7 @@ def generate_schedule():
         print("🚀 Starting complete timetable generation from database...")
         
         # Load data from database
-        data = load_database_driven()
+        data = load_data()
         
         # Execute scheduling algorithm
         from application.enhanced_scheduler import execute_enhanced_strict_constraint_scheduling
@@ -0,0 +1,107 @@
+"""
+Single-pass validation of a built timetable against the scheduler's hard rules
+"""
+
+# Rules counted as workload violations; every other rule is a general constraint violation
+WORKLOAD_RULES = frozenset({'daily_limit'})
+
+
+def _minutes(time_str):
+    """'HH:MM' as minutes after midnight"""
+    return int(time_str[:2]) * 60 + int(time_str[3:5])
+
+
+class ScheduleValidator:
+    """
+    Checks a schedule in the scheduler's result format ('Coach ID', 'Day', 'Start Time', 'End Time',
+    'Branch', 'Gymnastics Level' and optionally 'Students' per class).
+
+    Classes are sorted once by (coach, day, start) and swept in that order, so every per-coach-per-day
+    rule is decided from running totals of the current group:
+
+    - capacity:     a class has more students than its level allows
+    - overlap:      a class starts before the coach's previous class on that day has ended
+    - branch:       a coach teaches at more than one branch on a day
+    - consecutive:  more than consecutive_limit classes in a row with less than min_break_minutes between them
+    - daily_limit:  more classes on a day than the weekday / weekend limit
+
+    Each violation is a dict with the rule, the coach_id, day, start_time and branch of the class that
+    broke it, and a message. branch, consecutive and daily_limit are reported at most once per coach and
+    day, at the first class that breaks them.
+    """
+    # Scheduler settings used as limits, by config key
+    LIMITS = ('weekday_daily_limit', 'weekend_daily_limit', 'consecutive_limit', 'min_break_minutes')
+
+    def __init__(self, class_capacities, weekends, weekday_daily_limit, weekend_daily_limit,
+                 consecutive_limit, min_break_minutes):
+        self.class_capacities = class_capacities
+        self.weekends = set(weekends)
+        self.weekday_daily_limit = weekday_daily_limit
+        self.weekend_daily_limit = weekend_daily_limit
+        self.consecutive_limit = consecutive_limit
+        self.min_break_minutes = min_break_minutes
+
+    def validate(self, schedule):
+        """Return the violations in a schedule, grouped by coach and day"""
+        violations = []
+
+        def report(rule, entry, message):
+            violations.append({
+                'rule': rule,
+                'coach_id': entry['Coach ID'],
+                'day': entry['Day'],
+                'start_time': entry['Start Time'],
+                'branch': entry['Branch'],
+                'message': message
+            })
+
+        classes = sorted(
+            ((entry['Coach ID'], entry['Day'], _minutes(entry['Start Time']), _minutes(entry['End Time']), entry)
+             for entry in schedule),
+            key=lambda row: row[:3]
+        )
+
+        group = None
+        for coach_id, day, start, end, entry in classes:
+            if (coach_id, day) != group:
+                group = (coach_id, day)
+                daily_limit = self.weekend_daily_limit if day in self.weekends else self.weekday_daily_limit
+                first_branch = entry['Branch']
+                class_count = 0
+                run_length = 0
+                latest_end = None
+                previous_end = None
+                reported = set()
+
+            level = entry['Gymnastics Level']
+            students = entry.get('Students')
+            max_capacity = self.class_capacities.get(level, 8)
+            if students is not None and students > max_capacity:
+                report('capacity', entry, f"{students} students in a {level} class (capacity {max_capacity})")
+
+            if latest_end is not None and start < latest_end:
+                report('overlap', entry, f"Starts at {entry['Start Time']} before the previous class has ended")
+
+            if entry['Branch'] != first_branch and 'branch' not in reported:
+                reported.add('branch')
+                report('branch', entry, f"Teaches at {first_branch} and {entry['Branch']} on the same day")
+
+            # Overlapping classes have a negative gap, so they count as consecutive
+            if previous_end is not None and start - previous_end < self.min_break_minutes:
+                run_length += 1
+            else:
+                run_length = 1
+            if run_length > self.consecutive_limit and 'consecutive' not in reported:
+                reported.add('consecutive')
+                report('consecutive', entry, f"{run_length} classes in a row without a {self.min_break_minutes} minute break "
+                                             f"(limit {self.consecutive_limit})")
+
+            class_count += 1
+            if class_count > daily_limit and 'daily_limit' not in reported:
+                reported.add('daily_limit')
+                report('daily_limit', entry, f"More than {daily_limit} classes on {day}")
+
+            previous_end = end
+            latest_end = end if latest_end is None else max(latest_end, end)
+
+        return violations
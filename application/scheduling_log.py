@@ -0,0 +1,69 @@
+"""
+Logging for the scheduler, data processor and data snapshot
+
+They log through their module loggers (application.enhanced_scheduler,
+application.data_processor and application.data_snapshot). Each run wraps its logger in a RunLogger with its
+own threshold, so one request can ask for a debug trace while others stay
+quiet. init_logging() routes these loggers through a QueueHandler; a
+QueueListener thread does the actual writing so a run never blocks on I/O.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+
+SCHEDULING_LOGGERS = ('application.enhanced_scheduler', 'application.data_processor', 'application.data_snapshot')
+
+# Accepted names for a run's log level; anything else falls back to quiet
+LOG_LEVELS = {
+    'quiet': logging.WARNING,
+    'warning': logging.WARNING,
+    'info': logging.INFO,
+    'debug': logging.DEBUG
+}
+
+_listener = None
+
+
+def parse_log_level(value, default=logging.WARNING):
+    """Convert 'quiet' / 'info' / 'debug' (or a logging level number) to a level"""
+    if isinstance(value, bool):
+        return default
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return LOG_LEVELS.get(value.strip().lower(), default)
+    return default
+
+
+class RunLogger(logging.LoggerAdapter):
+    """Logger adapter that drops records below a per-run threshold before any formatting"""
+    
+    def __init__(self, logger, level=logging.WARNING):
+        super().__init__(logger, {})
+        self.level = parse_log_level(level)
+    
+    def isEnabledFor(self, level):
+        return level >= self.level and self.logger.isEnabledFor(level)
+
+
+def init_logging(stream=None):
+    """Send scheduling logs through a queue to a background writer (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(name)s] %(message)s'))
+    
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    
+    # The run threshold decides what is emitted, so the loggers themselves pass everything
+    for name in SCHEDULING_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False
@@ -1538,8 +1538,14 @@ document.addEventListener('DOMContentLoaded', async () => {
             // Reset branch filter to make sure all branches are shown
             branchFilter = null;
             
+            // Keep run statistics out of the branch data that is rendered and saved
+            const { statistics, ...timetableData } = result;
+            if (statistics) {
+                console.log(`Scheduler stopped (${statistics.stop_reason}) after ${statistics.iterations_run} iterations`, statistics);
+            }
+            
             // Update data and render timetable
-            data = result;
+            data = timetableData;
             renderTimetable(data);
         } catch (error) {
             console.error("Error generating timetable:", error);
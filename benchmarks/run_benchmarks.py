@@ -0,0 +1,197 @@
+"""
+End-to-end scaling benchmark for load_database_driven() and the scheduler
+
+Each case populates a fresh SQLite database with synthetic data, then times
+load_database_driven() and EnhancedStrictConstraintScheduler.schedule_with_complete_coverage()
+in a new process, so peak memory is measured per case. Results are written as JSON.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --scale small --scale medium --max-iterations 10
+    python -m benchmarks.run_benchmarks --case 12:150 --repeat 3 --output results.json
+    python -m benchmarks.run_benchmarks --scale large --cluster-size 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.synthetic_data import SCALES
+
+DEFAULT_SCALES = ['small', 'medium', 'large']
+DEFAULT_CONFIG = {'max_iterations': 5, 'log_level': 'quiet'}
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _create_app(database_path):
+    """Create the app on a given SQLite file instead of the configured database"""
+    from config import config, TestingConfig
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{database_path}'
+
+    config['benchmark'] = BenchmarkConfig
+
+    from application import create_app
+    return create_app('benchmark')
+
+
+def _populate_case(database_path, num_branches, num_coaches, seed, cluster_size):
+    """Write the synthetic dataset for one case; runs in its own process"""
+    from benchmarks.synthetic_data import populate
+
+    app = _create_app(database_path)
+    with app.app_context():
+        return populate(num_branches, num_coaches, seed, cluster_size)
+
+
+def _run_case(database_path, scheduler_config, seed):
+    """Time loading and scheduling on a populated database; runs in its own process"""
+    app = _create_app(database_path)
+
+    from application.data_processor import load_database_driven
+    from application.enhanced_scheduler import EnhancedStrictConstraintScheduler
+
+    with app.app_context():
+        baseline_rss_mb = _peak_rss_mb()
+
+        start = time.perf_counter()
+        data = load_database_driven(scheduler_config.get('log_level'))
+        load_seconds = time.perf_counter() - start
+        load_peak_rss_mb = _peak_rss_mb()
+
+        random.seed(seed)
+        start = time.perf_counter()
+        scheduler = EnhancedStrictConstraintScheduler(data, scheduler_config)
+        result = scheduler.schedule_with_complete_coverage()
+        schedule_seconds = time.perf_counter() - start
+
+    statistics = result['statistics']
+    return {
+        'load_seconds': round(load_seconds, 3),
+        'schedule_seconds': round(schedule_seconds, 3),
+        'total_seconds': round(load_seconds + schedule_seconds, 3),
+        'baseline_rss_mb': baseline_rss_mb,
+        'load_peak_rss_mb': load_peak_rss_mb,
+        'peak_rss_mb': _peak_rss_mb(),
+        'feasible_assignments': len(data['feasible_assignments']),
+        'total_students_required': statistics['total_students_required'],
+        'total_students_scheduled': statistics['total_students_scheduled'],
+        'coverage_percentage': round(statistics['coverage_percentage'], 3),
+        'total_classes': statistics['total_classes'],
+        'iterations_run': statistics.get('iterations_run'),
+        'stop_reason': statistics.get('stop_reason'),
+        'components': len(statistics.get('components', [])) or 1,
+        'profile': {key: statistics.get('profile', {}).get(key) for key in ('data_processor', 'phases')}
+    }
+
+
+def _in_new_process(function, *args):
+    """Run a function in a fresh interpreter and return its result"""
+    # Not a multiprocessing.Pool: its daemonic workers could not start the scheduler's own worker processes
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(function, *args).result()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_case(value):
+    try:
+        num_branches, num_coaches = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected BRANCHES:COACHES, got {value!r}")
+    return num_branches, num_coaches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data loading and scheduling on synthetic data")
+    parser.add_argument('--scale', action='append', choices=sorted(SCALES),
+                        help=f"named scale to run, repeatable (default: {', '.join(DEFAULT_SCALES)})")
+    parser.add_argument('--case', action='append', type=_parse_case, default=[],
+                        help="custom scale as BRANCHES:COACHES, repeatable")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per case (default: 1)")
+    parser.add_argument('--seed', type=int, default=0, help="data and scheduler seed (default: 0)")
+    parser.add_argument('--cluster-size', type=int,
+                        help="split branches into groups of this size that share no coaches (default: one connected group)")
+    parser.add_argument('--max-iterations', type=int, help="scheduler MAX_ITERATIONS (default: 5)")
+    parser.add_argument('--config', type=json.loads, default={},
+                        help="extra scheduler config as JSON, e.g. '{\"local_search_steps\": 0}'")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    cases = [(name, *SCALES[name]) for name in (args.scale or ([] if args.case else DEFAULT_SCALES))]
+    cases += [(f"{num_branches}x{num_coaches}", num_branches, num_coaches) for num_branches, num_coaches in args.case]
+
+    scheduler_config = dict(DEFAULT_CONFIG, **args.config)
+    if args.max_iterations is not None:
+        scheduler_config['max_iterations'] = args.max_iterations
+
+    output = args.output or os.path.join('benchmarks', 'results', f"{datetime.now():%Y%m%d-%H%M%S}.json")
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'cluster_size': args.cluster_size,
+        'scheduler_config': scheduler_config,
+        'results': []
+    }
+
+    print(f"{'case':<12} {'branches':>8} {'coaches':>8} {'run':>4} {'load s':>8} {'sched s':>8} {'peak MB':>8} {'coverage':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, num_branches, num_coaches in cases:
+            database_path = os.path.join(tmp_dir, f"{name}.db")
+            rows = _in_new_process(_populate_case, database_path, num_branches, num_coaches, args.seed, args.cluster_size)
+
+            for run in range(1, args.repeat + 1):
+                measurements = _in_new_process(_run_case, database_path, scheduler_config, args.seed)
+                report['results'].append({
+                    'case': name,
+                    'branches': num_branches,
+                    'coaches': num_coaches,
+                    'run': run,
+                    'rows': rows,
+                    **measurements
+                })
+                print(f"{name:<12} {num_branches:>8} {num_coaches:>8} {run:>4} {measurements['load_seconds']:>8.2f} "
+                      f"{measurements['schedule_seconds']:>8.2f} {measurements['peak_rss_mb'] or 0:>8.1f} "
+                      f"{measurements['coverage_percentage']:>8.2f}%")
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Synthetic data generator for the scheduler benchmarks
+
+Fills the Branch, Level, Coach, CoachBranch, CoachOffday, CoachPreference, Enrollment and
+PopularTimeslot tables with reproducible random data at a given scale. The shape follows the
+real data: the standard eleven levels, one or two branches per coach, a few offday half-days,
+enrollment for the nine core levels and two popular windows per level and operating day.
+"""
+import random
+
+from application import db
+from application.models import DayOfWeek, User, Branch, Level, Coach, CoachBranch, CoachOffday, CoachPreference, \
+                               Enrollment, PopularTimeslot
+
+# Named scales: (branches, coaches)
+SCALES = {
+    'small': (6, 50),
+    'medium': (30, 400),
+    'large': (150, 2000),
+}
+
+# (name, alias, max_students, duration in 30 minute slots), as created by init_db.py
+LEVELS = [
+    ("BearyTots", "Tots", 7, 2),
+    ("Jolly", "Jolly", 8, 2),
+    ("Bubbly", "Bubbly", 8, 2),
+    ("Lively", "Lively", 8, 2),
+    ("Flexi", "Flexi", 8, 2),
+    ("Level_1", "L1", 8, 3),
+    ("Level_2", "L2", 9, 3),
+    ("Level_3", "L3", 10, 3),
+    ("Level_4", "L4", 10, 3),
+    ("Advance", "Advance", 10, 2),
+    ("Free", "Free", 10, 2)
+]
+
+# Levels that get enrollment; Advance and Free classes are only ever merged into
+ENROLLED_LEVELS = ['Tots', 'Jolly', 'Bubbly', 'Lively', 'Flexi', 'L1', 'L2', 'L3', 'L4']
+
+# Hours a popular window may start at, per operating day
+POPULAR_START_HOURS = {
+    'TUE': [15, 16],
+    'WED': [10, 14, 15, 16, 17],
+    'THU': [10, 14, 15, 16, 17],
+    'FRI': [10, 14, 15, 16, 17],
+    'SAT': list(range(9, 16)),
+    'SUN': list(range(9, 16)),
+}
+
+POSITIONS = ['Admin cum coach', 'Senior Coach', 'Junior Coach', 'Part time']
+POSITION_WEIGHTS = [2, 3, 3, 4]
+
+AREAS = ['North', 'South', 'East', 'West', 'Central']
+
+
+def populate(num_branches, num_coaches, seed=0, cluster_size=None):
+    """
+    Create a synthetic dataset in the current app's database
+
+    Args:
+        num_branches: number of branches (at most 999, abbreviations are 4 characters)
+        num_coaches: number of coaches, spread over the branches
+        seed: random seed; the same arguments always give the same data
+        cluster_size: if given, branches form groups of this size and coaches only work within their
+            group, so the coach-branch graph splits into independent components
+
+    Returns:
+        Row count per table
+    """
+    rng = random.Random(seed)
+
+    branches = [Branch(name=f"Branch {i:03d}", abbrv=f"B{i:03d}", max_classes=rng.randint(3, 6))
+                for i in range(num_branches)]
+    levels = [Level(name=name, alias=alias, max_students=max_students, duration=duration)
+              for name, alias, max_students, duration in LEVELS]
+    db.session.add_all(branches + levels)
+    db.session.add(User(username='admin', password='benchmark', permissions=1))
+    db.session.flush()
+
+    coaches = []
+    managed = set()
+    for i in range(num_coaches):
+        # Coaches work at one branch, or at two neighbouring ones
+        home = i % num_branches
+        coach_branches = [branches[home]]
+        if cluster_size:
+            cluster_start = home - home % cluster_size
+            neighbour = cluster_start + (home - cluster_start + 1) % min(cluster_size, num_branches - cluster_start)
+        else:
+            neighbour = (home + 1) % num_branches
+        if neighbour != home and rng.random() < 0.4:
+            coach_branches.append(branches[neighbour])
+
+        # One manager per branch, taken from the first coach based there
+        if home not in managed:
+            managed.add(home)
+            position = 'Branch Manager'
+        else:
+            position = rng.choices(POSITIONS, POSITION_WEIGHTS)[0]
+
+        coach = Coach(
+            name=f"Coach {i:04d}",
+            residential_area=rng.choice(AREAS),
+            position=position,
+            status='Part time' if position == 'Part time' else 'Full time'
+        )
+        coach.assigned_branches = [CoachBranch(branch=branch) for branch in coach_branches]
+        coach.preferred_levels = [CoachPreference(level=level) for level in rng.sample(levels, rng.randint(2, 6))]
+        coach.offdays = [CoachOffday(day=day.value, am=am, reason='Synthetic')
+                         for day in DayOfWeek for am in (True, False) if rng.random() < 0.2]
+        coaches.append(coach)
+    db.session.add_all(coaches)
+
+    enrollments = [Enrollment(branch=branch.abbrv, level_category_base=level, count=rng.randint(3, 40))
+                   for branch in branches for level in ENROLLED_LEVELS if rng.random() < 0.8]
+    db.session.add_all(enrollments)
+
+    popular_timeslots = []
+    for name, alias, _, duration in LEVELS:
+        if alias not in ENROLLED_LEVELS:
+            continue
+        for day, start_hours in POPULAR_START_HOURS.items():
+            for _ in range(2):
+                start = rng.choice(start_hours) * 60 + rng.choice([0, 30])
+                end = start + duration * 30 + rng.choice([0, 30, 60])
+                popular_timeslots.append(PopularTimeslot(
+                    time_slot=f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}",
+                    day=day,
+                    level=alias
+                ))
+    db.session.add_all(popular_timeslots)
+
+    db.session.commit()
+
+    return {
+        'branch': len(branches),
+        'level': len(levels),
+        'coach': len(coaches),
+        'coach_branch': sum(len(c.assigned_branches) for c in coaches),
+        'coach_offday': sum(len(c.offdays) for c in coaches),
+        'coach_preference': sum(len(c.preferred_levels) for c in coaches),
+        'enrollment': len(enrollments),
+        'popular_timeslot': len(popular_timeslots)
+    }
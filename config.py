@@ -51,6 +51,14 @@ class Config:
     
     # Session settings
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
+    
+    # Scheduling result cache (0 bytes = disabled); a relative directory is inside the app's instance folder
+    RESULT_CACHE_DIR = 'result_cache'
+    RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+    
+    # In-memory snapshot of the processed scheduling data, reused until a commit changes it
+    DATA_SNAPSHOT_ENABLED = True
+    DATA_SNAPSHOT_PREWARM = False  # Rebuild in a background thread after each change
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -67,11 +75,15 @@ class ProductionConfig(Config):
     
     appdata_path = get_appdata_dir()
     SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(appdata_path, "database.db")}'
+    RESULT_CACHE_DIR = os.path.join(appdata_path, 'result_cache')
+    DATA_SNAPSHOT_PREWARM = True
 
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # In-memory database for testing
+    RESULT_CACHE_MAX_BYTES = 0  # Every run schedules
+    DATA_SNAPSHOT_ENABLED = False  # Every run loads
 
 # Configuration dictionary
 config = {
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 import threading
@@ -26,4 +27,6 @@ def main():
         sys.exit(0)
 
 if __name__ == '__main__':
+    # Required for the scheduler's process pool in the PyInstaller bundle
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,34 @@
+import pytest
+
+from application import create_app, db
+from benchmarks.synthetic_data import populate
+
+
+@pytest.fixture
+def app():
+    """App on a fresh in-memory database, with an app context pushed"""
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def populated(app):
+    """Small synthetic dataset: 4 branches, 24 coaches"""
+    populate(4, 24, seed=0)
+    db.session.commit()
+    return app
+
+
+@pytest.fixture
+def saved_timetable(populated, client):
+    """Id of a timetable generated from the synthetic data and saved through the API"""
+    timetable_data = client.post('/api/timetable/generate/', json={'max_iterations': 2}).get_json()
+    timetable_data.pop('statistics')
+    return client.post('/api/timetable/save/', json=timetable_data).get_json()['timetable_id']
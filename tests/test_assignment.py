@@ -0,0 +1,28 @@
+import pytest
+
+from application.assignment import Assignment
+
+
+@pytest.fixture
+def assignment():
+    return Assignment(7, 3, 'B001', 'L1', 'SAT', '09:00', '10:30', 540, 630, 90, 'am', True, 8)
+
+
+def test_fields_by_attribute_and_key(assignment):
+    assert assignment.day == assignment['day'] == 'SAT'
+    assert assignment.get('is_popular') is True
+    assert assignment.to_dict()['capacity'] == 8
+
+
+def test_unknown_key_raises_key_error(assignment):
+    with pytest.raises(KeyError):
+        assignment['actual_students']
+    assert assignment.get('actual_students', 0) == 0
+
+
+def test_only_fields_are_readable_by_key(assignment):
+    with pytest.raises(KeyError):
+        assignment['__class__']
+    with pytest.raises(KeyError):
+        assignment['to_dict']
+    assert assignment.get('__slots__') is None
@@ -0,0 +1,75 @@
+import pytest
+
+from application import db
+from application.data_processor import load_database_driven
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler
+from benchmarks.synthetic_data import populate
+
+
+@pytest.fixture
+def clustered(app):
+    """12 branches in groups of 3 that share no coaches"""
+    populate(12, 60, seed=0, cluster_size=3)
+    db.session.commit()
+    return load_database_driven()
+
+
+def test_components_follow_branch_clusters(clustered):
+    components = EnhancedStrictConstraintScheduler(clustered)._find_components()
+    assert len(components) == 4
+    assert sorted(len(branches) for branches, _ in components) == [3, 3, 3, 3]
+    coach_ids = [coach_ids for _, coach_ids in components]
+    assert all(not a & b for i, a in enumerate(coach_ids) for b in coach_ids[i + 1:])
+
+
+def test_decomposed_run_matches_whole_run(clustered):
+    config = {'max_iterations': 3}
+    decomposed = EnhancedStrictConstraintScheduler(clustered, dict(config, decompose_components=True)) \
+        .schedule_with_complete_coverage()
+    whole = EnhancedStrictConstraintScheduler(clustered, config).schedule_with_complete_coverage()
+    assert len(decomposed['statistics']['components']) == 4
+    assert decomposed['statistics']['coverage_percentage'] >= whole['statistics']['coverage_percentage']
+    assert decomposed['statistics']['total_students_required'] == whole['statistics']['total_students_required']
+    # Iteration limits are per component when decomposing, and for the whole run otherwise
+    assert decomposed['statistics']['iterations_run'] <= 3 * len(decomposed['statistics']['components'])
+    assert whole['statistics']['iterations_run'] <= 3
+    assert 'components' not in whole['statistics']
+
+
+def test_component_with_only_warm_start_classes(clustered, monkeypatch):
+    # One cluster loses its popular slots; a single stored class there is its only candidate
+    scheduler = EnhancedStrictConstraintScheduler(clustered)
+    branches, _ = scheduler._find_components()[-1]
+    cluster_assignments = [a for a in clustered['feasible_assignments'] if a.branch in branches]
+    for assignment in cluster_assignments:
+        assignment.is_popular = False
+    pinned = cluster_assignments[0]
+    warm_start = [{'coach_id': pinned.coach_id, 'branch': pinned.branch, 'level': pinned.level,
+                   'day': pinned.day, 'start_time': pinned.start_time}]
+    
+    budgets = []
+    apply_config = EnhancedStrictConstraintScheduler._apply_config
+    def record_budget(self, config):
+        apply_config(self, config)
+        budgets.append(self.TIME_BUDGET_SECONDS)
+    monkeypatch.setattr(EnhancedStrictConstraintScheduler, '_apply_config', record_budget)
+    
+    config = {'max_iterations': 2, 'time_budget_seconds': 30, 'decompose_components': True}
+    result = EnhancedStrictConstraintScheduler(clustered, config, warm_start).schedule_with_complete_coverage()
+    
+    # Every component scheduler ran with a positive share of the budget
+    assert len(budgets) == 5
+    assert all(0 < budget <= 30 for budget in budgets)
+    # The cluster was not scheduled from its non-popular slots
+    cluster_classes = [c for c in result['schedule'] if c['Branch'] in branches]
+    assert [(c['Coach ID'], c['Day'], c['Start Time']) for c in cluster_classes] == \
+        [(pinned.coach_id, pinned.day, pinned.start_time)]
+
+
+def test_decomposed_generator_stops_when_asked(clustered):
+    generator = EnhancedStrictConstraintScheduler(clustered, {'max_iterations': 3, 'decompose_components': True}).iter_schedule()
+    first = next(generator)
+    assert first['component'] == 0 and first['iteration'] == 1
+    final = generator.send(True)
+    assert final['final'] and final['stop_reason'] == 'stopped'
+    assert final['result']['statistics']['iterations_run'] == 1
@@ -0,0 +1,40 @@
+from application.data_processor import load_database_driven
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler, _max_flow
+
+
+def test_max_flow_small_network():
+    capacity = {
+        'source': {'a': 3, 'b': 2},
+        'a': {'b': 1, 'sink': 2},
+        'b': {'sink': 3}
+    }
+    assert _max_flow(capacity, 'source', 'sink') == 5
+
+
+def test_bound_is_not_below_achieved_coverage(populated):
+    data = load_database_driven()
+    results = EnhancedStrictConstraintScheduler(data, {'max_iterations': 3}).schedule_with_complete_coverage()
+    statistics = results['statistics']
+    assert statistics['coverage_upper_bound'] >= statistics['coverage_percentage'] - 1e-9
+
+
+def test_bound_counts_pinned_classes_outside_popular_slots(populated):
+    data = load_database_driven()
+    # One branch loses its popular slots, so only warm-start classes can cover it
+    branch = next(iter(data['enrollment_dict']))[0]
+    branch_assignments = [a for a in data['feasible_assignments'] if a.branch == branch]
+    for assignment in branch_assignments:
+        assignment.is_popular = False
+    
+    # One class per coach and day
+    warm_start = {}
+    for assignment in branch_assignments:
+        warm_start.setdefault((assignment.coach_id, assignment.day), {
+            'coach_id': assignment.coach_id, 'branch': branch, 'level': assignment.level,
+            'day': assignment.day, 'start_time': assignment.start_time
+        })
+    warm_start = list(warm_start.values())
+    
+    scheduler = EnhancedStrictConstraintScheduler(data, {'max_iterations': 2, 'local_search_steps': 0}, warm_start)
+    statistics = scheduler.schedule_with_complete_coverage()['statistics']
+    assert statistics['coverage_upper_bound'] >= statistics['coverage_percentage'] - 1e-9
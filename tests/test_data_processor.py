@@ -0,0 +1,100 @@
+import random
+from datetime import datetime
+
+from application import db
+from application.data_processor import DataDrivenProcessor, load_database_driven
+from application.models import Coach, CoachOffday
+
+
+def test_offdays_with_invalid_day_are_skipped(populated):
+    before = load_database_driven()['coaches_data']
+    
+    coach = Coach.query.order_by(Coach.id).first()
+    db.session.add_all([CoachOffday(coach_id=coach.id, day=7, am=True, reason='Bad import'),
+                        CoachOffday(coach_id=coach.id, day=-1, am=False, reason='Bad import')])
+    db.session.commit()
+    
+    after = load_database_driven()['coaches_data']
+    assert {coach_id: c['availability'] for coach_id, c in after.items()} == \
+        {coach_id: c['availability'] for coach_id, c in before.items()}
+
+
+def test_coach_availability_is_not_shared(populated):
+    coaches = list(load_database_driven()['coaches_data'].values())
+    first, second = coaches[0], coaches[1]
+    day = next(iter(first['availability']))
+    expected = second['availability'][day]['am']
+    
+    first['availability'][day]['am'] = not first['availability'][day]['am']
+    assert second['availability'][day]['am'] == expected
+    assert first['availability'][day] is not second['availability'][day]
+
+
+def _naive_is_popular(popular, level, day, time_slot):
+    """Scan every popular range, as _is_popular_timeslot did before the interval index"""
+    if (level, day, time_slot) in popular:
+        return True
+    start = datetime.strptime(time_slot.split('-')[0], '%H:%M')
+    end = datetime.strptime(time_slot.split('-')[1], '%H:%M')
+    for pop_level, pop_day, pop_slot in popular:
+        if pop_level == level and pop_day == day and '-' in pop_slot:
+            try:
+                if datetime.strptime(pop_slot.split('-')[0], '%H:%M') <= start and \
+                        end <= datetime.strptime(pop_slot.split('-')[1], '%H:%M'):
+                    return True
+            except ValueError:
+                continue
+    return False
+
+
+def test_popular_lookup_matches_range_scan():
+    rng = random.Random(0)
+    popular = {('L1', 'SAT', 'not a range'), ('L1', 'SAT', '25:00-26:00'), ('L2', 'SUN', '09:00')}
+    for _ in range(40):
+        start = rng.randrange(8 * 60, 19 * 60, 30)
+        end = start + rng.choice([60, 90, 120, 240])
+        popular.add((rng.choice(['L1', 'L2']), rng.choice(['SAT', 'SUN']),
+                     f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"))
+    processor = DataDrivenProcessor()
+    processor.popular_timeslots_set = popular
+    processor.popular_intervals = processor._compile_popular_intervals()
+    
+    for level in ('L1', 'L2', 'L3'):
+        for day in ('SAT', 'SUN'):
+            for start in range(7 * 60, 21 * 60, 30):
+                for duration in (60, 90, 120):
+                    end = start + duration
+                    slot = f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+                    assert processor._is_popular_timeslot(level, day, slot) == _naive_is_popular(popular, level, day, slot)
+
+
+def test_feasible_pool_matches_nested_scan(populated):
+    processor = DataDrivenProcessor()
+    data = processor.load_and_process_data()
+    
+    # Requirement x qualified coach x matching timeslot, kept where the coach is available
+    expected = []
+    for requirement in processor.requirements_data:
+        for coach_id, coach in processor.coaches_data.items():
+            if requirement['level'] not in coach['qualifications'] or requirement['branch'] not in coach['branches']:
+                continue
+            for timeslot in processor.timeslots_data:
+                if (timeslot['level'] == requirement['level'] and timeslot['duration'] == requirement['duration'] and
+                        coach['availability'][timeslot['day']][timeslot['period']]):
+                    expected.append((coach_id, requirement['branch'], requirement['level'], timeslot['day'],
+                                     timeslot['start_time'], timeslot['end_time'], timeslot['period'],
+                                     timeslot['is_popular'], requirement['capacity']))
+    
+    pool = data['feasible_assignments']
+    assert expected
+    assert [(a.coach_id, a.branch, a.level, a.day, a.start_time, a.end_time, a.period, a.is_popular, a.capacity)
+            for a in pool] == expected
+    assert [a.id for a in pool] == list(range(len(pool)))
+    
+    columns = data['feasible_columns']
+    assert columns['coach_id'].tolist() == [a.coach_id for a in pool]
+    assert columns['day'].tolist() == [a.day for a in pool]
+    assert columns['start_minute'].tolist() == [a.start_minute for a in pool]
+    assert columns['end_minute'].tolist() == [a.end_minute for a in pool]
+    assert columns['capacity'].tolist() == [a.capacity for a in pool]
+    assert columns['is_popular'].tolist() == [a.is_popular for a in pool]
@@ -0,0 +1,85 @@
+import logging
+
+import pytest
+
+from application import create_app, db
+from application.data_snapshot import load_data
+from application.models import Enrollment, Timetable
+from benchmarks.synthetic_data import populate
+from config import config, TestingConfig
+
+
+@pytest.fixture
+def snapshot_app():
+    """App with the data snapshot enabled, on the small synthetic dataset"""
+    class DataSnapshotConfig(TestingConfig):
+        DATA_SNAPSHOT_ENABLED = True
+    
+    config['data_snapshot_test'] = DataSnapshotConfig
+    app = create_app('data_snapshot_test')
+    with app.app_context():
+        populate(4, 24, seed=0)
+        db.session.commit()
+        yield app
+        db.session.remove()
+    del config['data_snapshot_test']
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_unchanged_data_reuses_snapshot(snapshot_app):
+    built = load_data()
+    reused = load_data()
+    assert reused['feasible_assignments'] is built['feasible_assignments']
+    assert 'load_all_from_db' in built['profile']
+    assert reused['profile']['data_snapshot']['cached'] is True
+    # The stored package keeps the profile of its load
+    assert 'data_snapshot' not in built['profile']
+    assert load_data()['profile']['data_snapshot']['cached'] is True
+
+
+def test_source_table_commit_invalidates_snapshot(snapshot_app):
+    built = load_data()
+    Enrollment.query.first().count += 1
+    db.session.commit()
+    rebuilt = load_data()
+    assert rebuilt['feasible_assignments'] is not built['feasible_assignments']
+    assert sum(rebuilt['enrollment_dict'].values()) == sum(built['enrollment_dict'].values()) + 1
+
+
+def test_bulk_update_invalidates_snapshot(snapshot_app):
+    built = load_data()
+    Enrollment.query.update({Enrollment.count: Enrollment.count + 1})
+    db.session.commit()
+    assert load_data()['feasible_assignments'] is not built['feasible_assignments']
+
+
+def test_rollback_and_other_tables_keep_snapshot(snapshot_app):
+    built = load_data()
+    Enrollment.query.first().count += 1
+    db.session.rollback()
+    db.session.add(Timetable())
+    db.session.commit()
+    assert load_data()['feasible_assignments'] is built['feasible_assignments']
+
+
+def test_request_log_level_applies_to_snapshot_hits(snapshot_app):
+    load_data()
+    records = _Records()
+    snapshot_logger = logging.getLogger('application.data_snapshot')
+    snapshot_logger.addHandler(records)
+    try:
+        load_data('quiet')
+        assert records.messages == []
+        load_data('info')
+        assert len(records.messages) == 1
+        assert records.messages[0].startswith("Data snapshot reused")
+    finally:
+        snapshot_logger.removeHandler(records)
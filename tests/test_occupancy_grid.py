@@ -0,0 +1,51 @@
+import random
+
+from application.enhanced_scheduler import OccupancyGrid
+
+COACHES = [11, 12, 13]
+BRANCHES = ['B000', 'B001']
+DAYS = ['TUE', 'SAT']
+
+
+def _random_class(rng):
+    start = rng.randrange(16, 40) * 30
+    return rng.choice(COACHES), rng.choice(BRANCHES), rng.choice(DAYS), start, start + rng.choice((60, 90))
+
+
+def test_grid_matches_interval_lists():
+    rng = random.Random(0)
+    grid = OccupancyGrid(COACHES, BRANCHES, DAYS)
+    booked = []
+    
+    for _ in range(300):
+        if booked and rng.random() < 0.3:
+            booking = booked.pop(rng.randrange(len(booked)))
+            grid.release(*booking)
+        else:
+            # Like the scheduler, only book coaches that are free
+            booking = _random_class(rng)
+            coach_id, _, day, start, end = booking
+            if not any(c == coach_id and d == day and s < end and start < e for c, _, d, s, e in booked):
+                grid.book(*booking)
+                booked.append(booking)
+        
+        coach_id, branch, day, start, end = _random_class(rng)
+        coach_busy = any(c == coach_id and d == day and s < end and start < e for c, _, d, s, e in booked)
+        assert grid.coach_is_free(coach_id, day, start, end) == (not coach_busy)
+        
+        # Most classes running at once at the branch during any 30-minute slot of the time
+        peak = max(sum(1 for _, b, d, s, e in booked if b == branch and d == day and s <= minute < e)
+                   for minute in range(start, end, 30))
+        for max_classes in (1, 2, 3):
+            assert grid.branch_has_capacity(branch, day, start, end, max_classes) == (peak < max_classes)
+
+
+def test_copy_is_independent():
+    grid = OccupancyGrid(COACHES, BRANCHES, DAYS)
+    grid.book(11, 'B000', 'TUE', 600, 690)
+    copy = grid.copy()
+    copy.release(11, 'B000', 'TUE', 600, 690)
+    copy.book(12, 'B001', 'SAT', 600, 690)
+    assert not grid.coach_is_free(11, 'TUE', 600, 690)
+    assert grid.coach_is_free(12, 'SAT', 600, 690)
+    assert copy.coach_is_free(11, 'TUE', 600, 690)
@@ -0,0 +1,32 @@
+from application import db
+from application.models import CoachOffday, Timetable
+
+
+def test_repair_without_active_timetable(populated, client):
+    response = client.post('/api/timetable/repair/', json={})
+    assert response.status_code == 404
+
+
+def test_repair_keeps_unchanged_timetable(saved_timetable, client):
+    response = client.post('/api/timetable/repair/', json={'timetable_id': saved_timetable})
+    assert response.status_code == 200
+    repair = response.get_json()['statistics']['repair']
+    assert repair['invalidated'] == []
+    assert repair['kept_classes'] == len(db.session.get(Timetable, saved_timetable).entries)
+    assert repair['timetable_id'] == saved_timetable
+
+
+def test_repair_drops_classes_of_a_coach_now_off(saved_timetable, client):
+    entries = db.session.get(Timetable, saved_timetable).entries
+    entry = entries[0]
+    for am in (True, False):
+        db.session.merge(CoachOffday(coach_id=entry.coach_id, day=entry.day, am=am, reason='Leave'))
+    db.session.commit()
+    affected = [e for e in entries if (e.coach_id, e.day) == (entry.coach_id, entry.day)]
+    
+    response = client.post('/api/timetable/repair/', json={'timetable_id': saved_timetable})
+    repair = response.get_json()['statistics']['repair']
+    assert len(repair['invalidated']) == len(affected)
+    assert {c['reason'] for c in repair['invalidated']} == {'unavailable'}
+    assert {c['coach_id'] for c in repair['invalidated']} == {entry.coach_id}
+    assert repair['kept_classes'] == len(entries) - len(affected)
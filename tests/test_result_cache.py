@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from flask import Flask
+
+from application import create_app, db
+from application.data_processor import load_database_driven
+from application.models import Enrollment
+from application.result_cache import cache_key, init_result_cache
+from benchmarks.synthetic_data import populate
+from config import config, TestingConfig
+
+
+@pytest.fixture
+def cached_client(tmp_path):
+    """Test client of an app with the result cache enabled in a temporary directory"""
+    class ResultCacheConfig(TestingConfig):
+        RESULT_CACHE_DIR = str(tmp_path / 'result_cache')
+        RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    
+    config['result_cache_test'] = ResultCacheConfig
+    app = create_app('result_cache_test')
+    with app.app_context():
+        populate(4, 24, seed=0)
+        db.session.commit()
+        yield app.test_client()
+        db.session.remove()
+    del config['result_cache_test']
+
+
+def test_key_ignores_request_only_keys_and_explicit_defaults(populated):
+    data = load_database_driven()
+    assert cache_key(data, {}) == cache_key(data, {'csrf_token': 'a1b2', 'log_level': 'debug', 'use_cache': True,
+                                                   'max_iterations': 60})
+    assert cache_key(data, {}) != cache_key(data, {'max_iterations': 10})
+    assert cache_key(data, {}) != cache_key(data, {}, [{'coach_id': 1, 'branch': 'B000', 'level': 'L1',
+                                                        'day': 'SAT', 'start_time': '09:00'}])
+
+
+def test_key_follows_source_data(populated):
+    key = cache_key(load_database_driven())
+    assert cache_key(load_database_driven()) == key
+    
+    Enrollment.query.first().count += 1
+    db.session.commit()
+    assert cache_key(load_database_driven()) != key
+
+
+def test_generate_hits_cache_across_page_loads(cached_client):
+    first = cached_client.post('/api/timetable/generate/', json={'max_iterations': 1, 'csrf_token': 'first'})
+    second = cached_client.post('/api/timetable/generate/', json={'max_iterations': 1, 'csrf_token': 'second'})
+    assert first.get_json()['statistics']['cached'] is False
+    assert second.get_json()['statistics']['cached'] is True
+    
+    Enrollment.query.first().count += 1
+    db.session.commit()
+    third = cached_client.post('/api/timetable/generate/', json={'max_iterations': 1, 'csrf_token': 'third'})
+    assert third.get_json()['statistics']['cached'] is False
+
+
+def test_relative_cache_dir_is_in_instance_folder(tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path / 'instance'))
+    app.config.update(RESULT_CACHE_DIR='result_cache', RESULT_CACHE_MAX_BYTES=1024)
+    init_result_cache(app)
+    assert app.extensions['result_cache'].directory == os.path.join(app.instance_path, 'result_cache')
+    assert os.path.isdir(app.extensions['result_cache'].directory)
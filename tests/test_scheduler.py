@@ -0,0 +1,297 @@
+import os
+import random
+from collections import Counter, defaultdict
+
+import pytest
+
+from application.data_processor import load_database_driven
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler
+from application.schedule_validator import ScheduleValidator
+
+CONFIG = {'max_iterations': 3}
+
+
+def _violations(data, schedule):
+    validator = ScheduleValidator(data['class_capacities'], data['weekends'],
+                                  EnhancedStrictConstraintScheduler.WEEKDAY_DAILY_LIMIT,
+                                  EnhancedStrictConstraintScheduler.WEEKEND_DAILY_LIMIT,
+                                  EnhancedStrictConstraintScheduler.CONSECUTIVE_LIMIT,
+                                  EnhancedStrictConstraintScheduler.MIN_BREAK_MINUTES)
+    return validator.validate(schedule)
+
+
+@pytest.fixture
+def data(populated):
+    return load_database_driven()
+
+
+@pytest.fixture
+def scheduler(data):
+    random.seed(0)
+    return EnhancedStrictConstraintScheduler(data, CONFIG)
+
+
+def test_schedule_passes_validator(data, scheduler):
+    result = scheduler.schedule_with_complete_coverage()
+    schedule = result['schedule']
+    assert schedule
+    assert _violations(data, schedule) == []
+    
+    # Every class is a feasible candidate, and no requirement gets more students than enrolled
+    feasible = {(a.coach_id, a.branch, a.level, a.day, a.start_time) for a in data['feasible_assignments']}
+    scheduled = defaultdict(int)
+    for entry in schedule:
+        assert (entry['Coach ID'], entry['Branch'], entry['Gymnastics Level'], entry['Day'], entry['Start Time']) in feasible
+        scheduled[(entry['Branch'], entry['Gymnastics Level'])] += entry['Students']
+    assert sum(scheduled.values()) == result['statistics']['total_students_scheduled']
+
+
+def test_candidate_index_matches_pool_scan(scheduler):
+    pool = scheduler.popular_assignments
+    candidate_index = scheduler._build_candidate_index(pool)
+    
+    keys = {(a.coach_id, a.branch, a.level) for a in pool} | {(a.coach_id, a.branch, a.level, a.day) for a in pool}
+    assert set(candidate_index) == keys
+    for key in keys:
+        # Same candidates in pool order, as a scan of the pool would find them
+        expected = [a for a in pool if (a.coach_id, a.branch, a.level, a.day)[:len(key)] == key]
+        assert candidate_index[key] == expected
+        assert candidate_index.columns(key)['start_minute'].tolist() == [a.start_minute for a in expected]
+
+
+def _minutes(time_str):
+    hour, minute = time_str.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+def _fill_state(scheduler, count=40):
+    """A state with up to count validated classes taken from the shuffled pool"""
+    state = scheduler._initialize_enhanced_state()
+    pool = list(scheduler.popular_assignments)
+    random.Random(1).shuffle(pool)
+    for assignment in pool[:count * 5]:
+        if len(state['selected_assignments']) >= count:
+            break
+        scheduler._add_validated_assignment_strict(assignment, 1, state)
+    return state
+
+
+def test_minute_fields_match_time_strings(data):
+    for a in data['feasible_assignments']:
+        assert a.start_minute == _minutes(a.start_time)
+        assert a.end_minute == _minutes(a.end_time)
+        assert a.end_minute > a.start_minute
+
+
+def test_time_conflicts_match_string_intervals(scheduler):
+    state = _fill_state(scheduler)
+    assert state['selected_assignments']
+    for a in scheduler.popular_assignments:
+        expected = any(_minutes(c['start_time']) < _minutes(a.end_time) and _minutes(a.start_time) < _minutes(c['end_time'])
+                       for c in state['coach_schedules'][a.coach_id][a.day])
+        assert scheduler._has_time_conflict(a, state) == expected
+
+
+def test_parallel_iterations(data, monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    results = []
+    for _ in range(2):
+        random.seed(0)
+        parallel = EnhancedStrictConstraintScheduler(data, dict(CONFIG, parallel_workers=2))
+        assert parallel.PARALLEL_WORKERS == 2
+        results.append(parallel.schedule_with_complete_coverage())
+    
+    result = results[0]
+    assert _violations(data, result['schedule']) == []
+    assert result['statistics']['iterations_run'] == CONFIG['max_iterations']
+    # Worker seeds come from the caller's RNG, so a seeded run is reproducible whatever the completion order
+    assert results[1]['schedule'] == result['schedule']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_no_iterations_returns_best_effort(data, monkeypatch, workers):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    scheduler = EnhancedStrictConstraintScheduler(data, dict(CONFIG, parallel_workers=workers))
+    # The config rejects 0, so set it directly to check the loop itself copes with an empty range
+    scheduler.MAX_ITERATIONS = 0
+    result = scheduler.schedule_with_complete_coverage()
+    
+    assert result['statistics']['iterations_run'] == 0
+    assert result['statistics']['stop_reason'] == 'max_iterations'
+    assert _violations(data, result['schedule']) == []
+
+
+def _greedy_state(scheduler):
+    state = scheduler._initialize_enhanced_state()
+    index = scheduler._build_candidate_index(scheduler.popular_assignments)
+    for phase in (scheduler._phase1_enhanced_systematic, scheduler._phase2_enhanced_gap_filling):
+        phase(state, index)
+    scheduler._phase3_enhanced_merging(state)
+    for phase in (scheduler._phase4_multi_level_merging, scheduler._phase5_exhaustive_assignment,
+                  scheduler._phase6_maximum_utilization_strict):
+        phase(state, index)
+    return state, index
+
+
+def _scheduled(state):
+    return sum(record['actual_students'] for record in state['selected_assignments'])
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_local_search_never_loses_students(data, seed):
+    random.seed(seed)
+    scheduler = EnhancedStrictConstraintScheduler(data, dict(CONFIG, local_search_steps=300))
+    state, index = _greedy_state(scheduler)
+    before = _scheduled(state)
+    
+    scheduler._phase7_local_search(state, index)
+    
+    assert _scheduled(state) >= before
+    # Moves and their undos keep the bookkeeping in step with the classes
+    assert _scheduled(state) + sum(state['unassigned_students'].values()) == sum(data['enrollment_dict'].values())
+    workload = {coach_id: count for coach_id, count in state['coach_workload'].items() if count}
+    assert workload == Counter(record['coach_id'] for record in state['selected_assignments'])
+    assert _violations(data, scheduler._build_and_validate_result(state)['schedule']) == []
+
+
+def _naive_score(scheduler, a, state):
+    """Per-candidate score from string times, as the scheduler computed it before bulk scoring"""
+    start_hour = int(a.start_time.split(':')[0])
+    score = scheduler._PEAK_HOURS_BONUS if 10 <= start_hour <= 15 else scheduler._GOOD_HOURS_BONUS if 9 <= start_hour <= 17 else 0
+    score += scheduler.WEEKEND_BIAS if a.day in scheduler.weekends else scheduler.WEEKDAY_BIAS
+    coach = scheduler.coaches_data.get(a.coach_id)
+    if coach and coach['status'] == 'Full Time' and state['coach_workload'][a.coach_id] < 5:
+        score += scheduler.UNDERUTILIZED_COACH_BONUS
+    if any(abs(_minutes(a.start_time) - _minutes(c['end_time'])) <= 5 or abs(_minutes(c['start_time']) - _minutes(a.end_time)) <= 5
+           for c in state['coach_schedules'][a.coach_id][a.day]):
+        score += scheduler.NO_TURNAROUND_BONUS
+    if a.day in scheduler.weekdays and start_hour in scheduler.morning_hours:
+        program = scheduler.program_groups.get(a.level, a.level)
+        if any(c['program'] == program and abs(c['hour'] - start_hour) <= 1
+               for c in state['coach_program_morning_classes'][a.coach_id][a.day][a.branch]):
+            score -= scheduler.SAME_PROGRAM_BACK_TO_BACK_PENALTY
+    if a.coach_id in state['coach_levels_taught'] and a.level not in state['coach_levels_taught'][a.coach_id]:
+        score += scheduler.DIVERSE_CLASS_BONUS
+    return score + a.capacity * scheduler._CAPACITY_MULTIPLIER
+
+
+def test_bulk_scores_match_per_candidate_scores(scheduler):
+    state = _fill_state(scheduler)
+    index = scheduler._build_candidate_index(scheduler.popular_assignments)
+    for key in [key for key in index if len(key) == 3]:
+        expected = [_naive_score(scheduler, a, state) for a in index[key]]
+        assert scheduler._score_candidates(key, state, index).tolist() == pytest.approx(expected)
+
+
+def test_priority_tables_match_scans(scheduler):
+    coaches = scheduler.full_time_coaches + scheduler.part_time_coaches + scheduler.branch_managers
+    levels = scheduler.level_hierarchy + ['Unknown']
+    for req_key in scheduler.enrollment_dict:
+        branch, level = req_key
+        qualified = len([c for c in coaches if level in c['qualifications'] and branch in c['branches']])
+        slots = len([a for a in scheduler.popular_assignments if a.branch == branch and a.level == level])
+        assert scheduler.qualified_coach_counts.get(req_key, 0) == qualified
+        assert scheduler.popular_slot_counts.get(req_key, 0) == slots
+    
+    for level in levels:
+        expected = scheduler.level_hierarchy.index(level) / len(scheduler.level_hierarchy) * 10 if level in scheduler.level_hierarchy else 5.0
+        assert scheduler._calculate_level_complexity(level) == expected
+        for other in levels:
+            compatible = level == other or (level in scheduler.level_hierarchy and other in scheduler.level_hierarchy and
+                                            abs(scheduler.level_hierarchy.index(level) - scheduler.level_hierarchy.index(other))
+                                            <= scheduler.LEVEL_MERGE_DISTANCE)
+            assert scheduler._check_level_compatibility(level, other) == compatible
+
+
+def test_priority_order_is_reused(scheduler):
+    requirements = scheduler._get_enhanced_priority_requirements()
+    assert scheduler._get_enhanced_priority_requirements() is requirements
+    scheduler._priority_requirements = None
+    assert scheduler._get_enhanced_priority_requirements() == requirements
+
+
+def test_perfect_coverage_messages(data, caplog):
+    small = dict(data, enrollment_dict={req_key: min(students, 4) for req_key, students in data['enrollment_dict'].items()})
+    random.seed(0)
+    with caplog.at_level('INFO', logger='application.enhanced_scheduler'):
+        result = EnhancedStrictConstraintScheduler(small, dict(CONFIG, log_level='info')).schedule_with_complete_coverage()
+    
+    assert result['statistics']['stop_reason'] == 'perfect_coverage'
+    assert "SUCCESS: 100% coverage within strict workload limits" in caplog.messages
+    assert not [message for message in caplog.messages if '%%' in message]
+
+
+def test_profile_totals_match_iterations(scheduler):
+    result = scheduler.schedule_with_complete_coverage()
+    profile = result['statistics']['profile']
+    
+    assert 'load_all_from_db' in profile['data_processor']
+    assert [entry['iteration'] for entry in profile['iterations']] == list(range(1, result['statistics']['iterations_run'] + 1))
+    for name, total in profile['phases'].items():
+        for key, value in total.items():
+            per_iteration = sum(entry['phases'][name][key] for entry in profile['iterations'])
+            assert value == pytest.approx(per_iteration, abs=1e-3)
+
+
+def test_profile_counts_committed_classes(data):
+    random.seed(0)
+    result = EnhancedStrictConstraintScheduler(data, {'max_iterations': 1, 'local_search_steps': 0}).schedule_with_complete_coverage()
+    phases = result['statistics']['profile']['phases']
+    
+    assert set(phases) == {'phase1_systematic', 'phase2_gap_filling', 'phase3_merging', 'phase4_multi_level',
+                           'phase5_exhaustive', 'phase6_max_utilization', 'phase7_local_search', 'validation'}
+    # Without local search nothing is undone, so every class added is in the schedule
+    added = sum(entry.get('assignments_added', 0) for entry in phases.values())
+    assert added == result['statistics']['total_classes']
+    assert sum(entry.get('validations', 0) for entry in phases.values()) >= added
+
+
+def test_generator_reports_each_iteration(data):
+    random.seed(0)
+    records = list(EnhancedStrictConstraintScheduler(data, CONFIG).iter_schedule())
+    random.seed(0)
+    expected = EnhancedStrictConstraintScheduler(data, CONFIG).schedule_with_complete_coverage()
+    
+    progress, final = records[:-1], records[-1]
+    assert [record['iteration'] for record in progress] == list(range(1, CONFIG['max_iterations'] + 1))
+    assert not any(record['final'] for record in progress) and final['final']
+    best = [record['best_coverage'] for record in progress]
+    assert best == sorted(best)
+    assert final['result']['schedule'] == expected['schedule']
+    assert final['result']['statistics']['coverage_percentage'] == best[-1]
+
+
+def test_generator_stops_when_asked(data):
+    generator = EnhancedStrictConstraintScheduler(data, CONFIG).iter_schedule()
+    first = next(generator)
+    final = generator.send(True)
+    
+    assert final['final'] and final['stop_reason'] == 'stopped'
+    assert final['result']['statistics']['iterations_run'] == 1
+    # The best result so far is returned, not a fresh best-effort schedule
+    assert final['result'] is first['best_result']
+
+
+def test_open_class_heap_matches_sorted_scan(scheduler):
+    state = _fill_state(scheduler, count=80)
+    # Leave outdated heap entries behind: release some classes and grow others
+    for record in state['selected_assignments'][::5]:
+        scheduler._release_assignment_record(record, state)
+    for record in state['selected_assignments'][::3]:
+        if record['actual_students'] < scheduler.class_capacities.get(record['level'], 8):
+            record['actual_students'] += 1
+            scheduler._index_open_class(record, state)
+    
+    heaps = {key: list(heap) for key, heap in state['open_classes'].items()}
+    for branch, level in scheduler.enrollment_dict:
+        # The scan phase 3 used to do: compatible classes at the branch, most space first, stable by commit order
+        spaces = [(record, scheduler.class_capacities.get(record['level'], 8) - record['actual_students'])
+                  for record in state['selected_assignments']
+                  if record['branch'] == branch and scheduler._check_level_compatibility(record['level'], level)]
+        expected = sorted([(record, space) for record, space in spaces if space > 0], key=lambda x: x[1], reverse=True)
+        
+        popped = []
+        while (open_class := scheduler._pop_open_class(branch, level, state)) is not None:
+            popped.append(open_class)
+        assert [(id(record), space) for record, space in popped] == [(id(record), space) for record, space in expected]
+        state['open_classes'] = defaultdict(list, {key: list(heap) for key, heap in heaps.items()})
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from application.data_processor import load_database_driven
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler, SchedulerConfigError
+
+
+@pytest.fixture
+def data(populated):
+    return load_database_driven()
+
+
+def test_config_overrides_constants_and_ignores_unknown_keys(data):
+    scheduler = EnhancedStrictConstraintScheduler(data, {'max_iterations': 2, 'csrf_token': 'abc',
+                                                         'time_budget_seconds': 1.5})
+    assert scheduler.MAX_ITERATIONS == 2
+    assert scheduler.TIME_BUDGET_SECONDS == 1.5
+    assert not hasattr(scheduler, 'CSRF_TOKEN')
+
+
+@pytest.mark.parametrize('config', [
+    {'max_iterations': '10'},
+    {'max_iterations': 2.5},
+    {'max_iterations': True},
+    {'weekday_daily_limit': -1},
+    {'decompose_components': 1},
+    {'parallel_workers': 0},
+    {'parallel_workers': None},
+    {'max_iterations': 0},
+    {'shuffle_interval': 0},
+    {'max_assignment_attempts': 0},
+    {'time_budget_seconds': -1},
+    {'time_budget_seconds': float('inf')},
+    {'time_budget_seconds': float('nan')},
+])
+def test_invalid_config_is_rejected(data, config):
+    with pytest.raises(SchedulerConfigError):
+        EnhancedStrictConstraintScheduler(data, config)
+
+
+def test_private_constants_cannot_be_overridden(data):
+    scheduler = EnhancedStrictConstraintScheduler(data, {'_capacity_multiplier': 100})
+    assert scheduler._CAPACITY_MULTIPLIER == EnhancedStrictConstraintScheduler._CAPACITY_MULTIPLIER
+
+
+def test_parallel_workers_capped_at_cpu_count(data):
+    scheduler = EnhancedStrictConstraintScheduler(data, {'parallel_workers': 10_000})
+    assert scheduler.PARALLEL_WORKERS == (os.cpu_count() or 1)
+
+
+def test_zero_time_budget_means_no_limit(data):
+    assert EnhancedStrictConstraintScheduler(data, {'time_budget_seconds': 0}).TIME_BUDGET_SECONDS == 0
+
+
+@pytest.mark.parametrize('config, key', [
+    ({'parallel_workers': 'many'}, 'parallel_workers'),
+    ({'shuffle_interval': 0}, 'shuffle_interval'),
+    ({'max_iterations': 0}, 'max_iterations'),
+])
+def test_generate_rejects_invalid_config(populated, client, config, key):
+    response = client.post('/api/timetable/generate/', json=config)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    assert key in response.get_json()['message']
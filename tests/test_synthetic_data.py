@@ -0,0 +1,35 @@
+from application import db
+from application.models import Branch, Coach, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot
+from benchmarks.synthetic_data import populate
+
+
+def _rows():
+    return {
+        'branch': [(b.abbrv, b.max_classes) for b in Branch.query.order_by(Branch.id)],
+        'coach': [(c.name, c.residential_area, c.position, c.status) for c in Coach.query.order_by(Coach.id)],
+        'coach_branch': sorted((r.coach_id, r.branch_id) for r in CoachBranch.query),
+        'coach_offday': sorted((r.coach_id, r.day, r.am) for r in CoachOffday.query),
+        'coach_preference': sorted((r.coach_id, r.level_id) for r in CoachPreference.query),
+        'enrollment': [(e.branch, e.level_category_base, e.count) for e in Enrollment.query.order_by(Enrollment.id)],
+        'popular_timeslot': [(p.time_slot, p.day, p.level) for p in PopularTimeslot.query.order_by(PopularTimeslot.id)],
+    }
+
+
+def test_same_seed_gives_same_rows(app):
+    counts = populate(5, 30, seed=3)
+    first = _rows()
+    assert {table: len(rows) for table, rows in first.items()} == {table: counts[table] for table in first}
+    
+    db.drop_all()
+    db.create_all()
+    populate(5, 30, seed=3)
+    assert _rows() == first
+
+
+def test_clusters_share_no_coaches(app):
+    populate(10, 60, seed=0, cluster_size=4)
+    # Branches 0-3, 4-7 and the short last group 8-9
+    for coach in Coach.query:
+        clusters = {int(assignment.branch.abbrv[1:]) // 4 for assignment in coach.assigned_branches}
+        assert len(clusters) == 1
+    assert all(branch.assigned_coaches for branch in Branch.query)
@@ -0,0 +1,50 @@
+import pytest
+
+from application.models import Coach
+
+SPACED_CLASSES = [{'name': 'L1', 'start_time': start, 'duration': 3} for start in ('0900', '1130', '1400', '1630')]
+
+
+def _timetable(coach, day, classes):
+    return {'B000': {'coaches': [coach], 'schedule': {day: {coach: classes}}}}
+
+
+def test_generated_timetable_is_valid(populated, client):
+    timetable_data = client.post('/api/timetable/generate/', json={'max_iterations': 1}).get_json()
+    timetable_data.pop('statistics')
+    response = client.post('/api/timetable/validate/', json=timetable_data)
+    assert response.status_code == 200
+    assert response.get_json()['valid'] is True
+
+
+@pytest.mark.parametrize('day, valid', [('Tuesday', False), ('Saturday', True)])
+def test_daily_limit_depends_on_weekend(populated, client, day, valid):
+    coach = Coach.query.first().name
+    response = client.post('/api/timetable/validate/', json=_timetable(coach, day, SPACED_CLASSES))
+    body = response.get_json()
+    assert body['valid'] is valid
+    assert {v['rule'] for v in body['violations']} == (set() if valid else {'daily_limit'})
+
+
+def test_unknown_coach(populated, client):
+    response = client.post('/api/timetable/validate/', json=_timetable('Nobody', 'Tuesday', SPACED_CLASSES))
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('payload', [
+    {'B000': {'coaches': []}},
+    {'B000': {'schedule': {'Funday': {'Coach 0000': SPACED_CLASSES}}}},
+    {'B000': {'schedule': {'Tuesday': {'Coach 0000': [{'name': 'L1', 'start_time': '9am', 'duration': 3}]}}}},
+    ['not', 'a', 'timetable'],
+])
+def test_malformed_timetable(populated, client, payload):
+    response = client.post('/api/timetable/validate/', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_invalid_json(populated, client):
+    response = client.post('/api/timetable/validate/', data='{', content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
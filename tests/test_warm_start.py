@@ -0,0 +1,32 @@
+from application import db
+from application.models import Timetable
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _classes(timetable_data):
+    """(branch, day, coach, level, start) of every class in the generate response format"""
+    return {(branch, day, coach, details['name'], details['start_time'])
+            for branch, branch_data in timetable_data.items() if branch != 'statistics'
+            for day, coach_schedule in branch_data['schedule'].items()
+            for coach, classes in coach_schedule.items()
+            for details in classes}
+
+
+def test_warm_start_from_unknown_timetable(populated, client):
+    response = client.post('/api/timetable/generate/', json={'warm_start': 999})
+    assert response.status_code == 404
+
+
+def test_warm_start_keeps_stored_classes(saved_timetable, client):
+    entries = db.session.get(Timetable, saved_timetable).entries
+    stored = {(e.branch.abbrv, DAY_NAMES[e.day], e.coach.name, e.level.alias, e.start_time.strftime('%H%M'))
+              for e in entries}
+    
+    response = client.post('/api/timetable/generate/', json={'warm_start': saved_timetable, 'max_iterations': 1})
+    assert response.status_code == 200
+    timetable_data = response.get_json()
+    warm_start = timetable_data['statistics']['warm_start']
+    assert warm_start['invalidated'] == []
+    assert warm_start['kept_classes'] == len(entries)
+    assert stored <= _classes(timetable_data)